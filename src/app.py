@@ -1,61 +1,108 @@
-from PyQt5.QtCore import Qt, QAbstractTableModel, QVariant, QUrl
-from PyQt5.QtGui import QColor, QDesktopServices, QPixmap
+from PyQt5.QtCore import (
+    Qt, QAbstractTableModel, QEvent, QFileSystemWatcher, QPointF, QRect, QRectF, QSize,
+    QThread, QTimer, QVariant, QUrl, pyqtSignal
+)
+from PyQt5.QtGui import QColor, QDesktopServices, QIcon, QImage, QPainter, QPen, QPixmap, QPolygonF
 from PyQt5.QtWidgets import (
-    QApplication, QTableView, QHeaderView,
-    QWidget, QVBoxLayout, QPushButton, QHBoxLayout, QLabel
+    QApplication, QWidget, QVBoxLayout, QPushButton, QHBoxLayout, QLabel,
+    QComboBox, QFileDialog, QLineEdit, QListWidget, QListWidgetItem, QProgressBar, QSlider, QSpinBox
 )
-from PIL import Image
-from random import randint, random, choice
+from seird import SEIRDSimulation
+from export import ExportCancelled, export_snapshot_gif, gif_snapshot
+from recording import Recording
+from checkpoint import load_checkpoint, save_checkpoint
+from brush import merge_masks, rect_mask, segment_mask, spray
+from series import save_series
+from instrument import format_snapshot, metrics, profile_calls
+from kernels import get_kernel
+from life import load_rle
+from thumbnails import THUMB_SIZE, ThumbnailCache, scan_gifs
+from bisect import bisect_left
+from random import randint
+from threading import Event, RLock
+import argparse
+import queue
+import numpy as np
 import sys
 import os
+import time
+
+
+# estilo dos botões do painel lateral
+BUTTON_STYLE = """
+    QPushButton {
+        font-size: 15px;
+        background-color: #d0d0d0;
+        border: 2px solid #555;
+        border-radius: 5px;
+    }
+    QPushButton:hover {
+        background-color: #c0c0c0;
+    }
+    QPushButton:checked {
+        background-color: #e08080;
+    }
+"""
+
+# altura do gráfico de séries abaixo da matriz
+SERIES_PLOT_HEIGHT = 170
+
+# modos da simulação: rótulo e motor do Jogo da Vida (None = SEIRD)
+MODES = (
+    ("SEIRD (epidemia)", None),
+    ("Vida — bits (64 por palavra)", "bitpacked"),
+    ("Vida — HashLife", "hashlife"),
+)
 
+# ferramentas de pintura: rótulo e nome em brush.py
+BRUSH_TOOLS = (
+    ("Pincel 🖌️", "brush"),
+    ("Linha 📏", "line"),
+    ("Retângulo ⬛", "rect"),
+    ("Spray 💨", "spray"),
+)
 
-# ============================================
-# Estados epidemiológicos
-# ============================================
-SUSCEPTIBLE = 0  # Suscetível
-EXPOSED = 1      # Exposto (incubação)
-INFECTED = 2     # Infectado (contagioso)
-RECOVERED = 3    # Recuperado (imune)
-DEAD = 4         # Morto (não suscetível)
-
-# Mapa de cor por estado (para exibição)
-STATE_COLORS = {
-    SUSCEPTIBLE: QColor("white"),
-    EXPOSED: QColor(255, 165, 0),   # orange
-    INFECTED: QColor(220, 20, 60),  # crimson / red
-    RECOVERED: QColor(144, 238, 144), # lightgreen
-    DEAD: QColor(105, 105, 105),    # dimgray
-}
+# maior salto por clique (2^k gerações): o clique roda na thread da interface,
+# e só o HashLife salta 2^k gerações sem custo proporcional a 2^k
+MAX_JUMP_EXPONENT = 10
+HASHLIFE_MAX_JUMP_EXPONENT = 40
+
+# vizinhanças oferecidas na lista (o campo aceita qualquer especificação)
+NEIGHBORHOOD_PRESETS = ("moore", "von-neumann", "moore:2", "moore:5", "exp:8:2", "power:16:2", "gauss:8:3")
+
+# checkpoint gravado ao fechar a janela
+AUTOSAVE_CHECKPOINT = "checkpoints/autosave.seirdckpt"
+
+# altura de cada linha da filmoteca (miniatura + nome do arquivo)
+THUMB_ROW_HEIGHT = THUMB_SIZE[1] + 24
+
+# reprodução contínua: intervalo entre quadros redesenhados (até ~30 por
+# segundo; gerações calculadas entre dois quadros não são desenhadas)
+FRAME_INTERVAL_MS = 33
 
 
 # ============================================
 # Modelo da Matriz (agora com atributos epidemiológicos)
 # ============================================
-class MatrizModel(QAbstractTableModel):
-    def __init__(self, rows=20, cols=20):
-        super().__init__()
-        self.rows = rows
-        self.cols = cols
-
-        # grid de estados
-        self.data_matrix = [[SUSCEPTIBLE for _ in range(cols)] for _ in range(rows)]
-        # grid de timers (por exemplo: dias restantes de incubação/infectividade)
-        self.timers = [[0 for _ in range(cols)] for _ in range(rows)]
-
-        # histórico (para desfazer)
-        self.history = []
+class MatrizModel(SEIRDSimulation, QAbstractTableModel):
+    def __init__(self, rows=20, cols=20, history_bytes=64 * 1024 * 1024):
+        QAbstractTableModel.__init__(self)
+        SEIRDSimulation.__init__(self, rows, cols, history_bytes=history_bytes)
+        # trava da grade: a thread de reprodução a segura durante cada passo;
+        # edições e leituras feitas pela interface durante a reprodução também
+        self.lock = RLock()
+
+    def _changed(self):
+        self.layoutChanged.emit()
 
-        # Parâmetros epidemiológicos padrão (pode ajustar)
-        self.p_infection = 0.25     # probabilidade base de infecção por contato
-        self.p_recovery = 0.05      # probabilidade (por passo) de recuperação
-        self.p_mortality = 0.01     # probabilidade (por passo) de morrer se infectado
-        self.incubation_period = 2  # passos E -> I
-        self.infectious_period = 6  # passos I -> R (se não morrer)
-        self.mobility_rate = 0.0    # probabilidade de trocar de posição com um vizinho
+    # avisa a view uma vez com o estado atual (quadro da reprodução contínua)
+    def refresh(self):
+        with self.lock:
+            self._changed()
 
-        # configuração de vizinhança: "moore" (8) por padrão
-        self.use_moore = True
+    # um traço de pincel: um único dataChanged com a janela alterada
+    def _region_changed(self, r0, c0, r1, c1):
+        self.dataChanged.emit(self.index(r0, c0), self.index(r1 - 1, c1 - 1))
 
     # métodos QAbstractTableModel
     def rowCount(self, parent=None):
@@ -69,10 +116,10 @@ class MatrizModel(QAbstractTableModel):
             return QVariant()
         r = index.row()
         c = index.column()
-        value = self.data_matrix[r][c]
+        value = int(self.data_matrix[r, c])
         if role == Qt.BackgroundRole:
             # retorna a cor baseada no estado
-            return STATE_COLORS.get(value, QColor("white"))
+            return QColor(*self.palette.get(value, (255, 255, 255)))
         if role == Qt.DisplayRole:
             # opcional: mostrar estado numérico (comentado para não poluir)
             # return str(value)
@@ -82,217 +129,452 @@ class MatrizModel(QAbstractTableModel):
     def setData(self, index, value, role=Qt.EditRole):
         if not index or not index.isValid():
             return False
-        r = index.row()
-        c = index.column()
-        self.data_matrix[r][c] = value
         # reset timer ao setar manualmente (se for E/I podemos setar timers manualmente)
-        self.timers[r][c] = 0
-        self.dataChanged.emit(index, index)
+        with self.lock:
+            self.set_cell(index.row(), index.column(), value)
+            self.dataChanged.emit(index, index)
         return True
 
     def flags(self, index):
         return Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsEditable
 
-    # contabiliza vizinhos do tipo `state_type`
-    def count_neighbors(self, r, c, state_type):
-        total = 0
-        for dr in (-1, 0, 1):
-            for dc in (-1, 0, 1):
-                if dr == 0 and dc == 0:
-                    continue
-                rr = r + dr
-                cc = c + dc
-                if 0 <= rr < self.rows and 0 <= cc < self.cols:
-                    if self.data_matrix[rr][cc] == state_type:
-                        total += 1
-        return total
-
-    # Próxima geração — agora com lógica SEIRD + probabilidade e timers
-    def next_generation(self):
-        # salva histórico (cópia profunda)
-        self.history.append(([row[:] for row in self.data_matrix], [row[:] for row in self.timers]))
-
-        new_matrix = [row[:] for row in self.data_matrix]
-        new_timers = [row[:] for row in self.timers]
-
-        for r in range(self.rows):
-            for c in range(self.cols):
-                state = self.data_matrix[r][c]
-                timer = self.timers[r][c]
-
-                # Mobilidade simples: com probabilidade, troca com um vizinho aleatório
-                if random() < self.mobility_rate:
-                    # escolhe um vizinho válido aleatório e troca
-                    neighs = []
-                    for dr in (-1, 0, 1):
-                        for dc in (-1, 0, 1):
-                            if dr == 0 and dc == 0:
-                                continue
-                            rr = r + dr
-                            cc = c + dc
-                            if 0 <= rr < self.rows and 0 <= cc < self.cols:
-                                neighs.append((rr, cc))
-                    if neighs:
-                        rr, cc = choice(neighs)
-                        # troca estados e timers
-                        new_matrix[r][c], new_matrix[rr][cc] = new_matrix[rr][cc], new_matrix[r][c]
-                        new_timers[r][c], new_timers[rr][cc] = new_timers[rr][cc], new_timers[r][c]
-                        # pular para próximo (essa célula já foi trocada)
-                        continue
-
-                if state == SUSCEPTIBLE:
-                    # conta vizinhos infectados (contato local)
-                    infected_neighbors = self.count_neighbors(r, c, INFECTED)
-                    if infected_neighbors > 0:
-                        # probabilidade combinada de não ser infectado por nenhum vizinho:
-                        # p_no = (1 - p_infection) ** infected_neighbors
-                        # p_get = 1 - p_no
-                        p_get = 1 - (1 - self.p_infection) ** infected_neighbors
-                        if random() < p_get:
-                            new_matrix[r][c] = EXPOSED
-                            new_timers[r][c] = self.incubation_period
-
-                elif state == EXPOSED:
-                    # decrementa timer de incubação
-                    if timer <= 1:
-                        # passa para infectado
-                        new_matrix[r][c] = INFECTED
-                        new_timers[r][c] = self.infectious_period
-                    else:
-                        new_timers[r][c] = timer - 1
-
-                elif state == INFECTED:
-                    # primeira: possibilidade de morrer
-                    if random() < self.p_mortality:
-                        new_matrix[r][c] = DEAD
-                        new_timers[r][c] = 0
-                    else:
-                        # possibilidade de recuperação (podemos combinar timer + prob)
-                        if timer <= 1:
-                            # recupera
-                            if random() < self.p_recovery:
-                                new_matrix[r][c] = RECOVERED
-                                new_timers[r][c] = 0
-                            else:
-                                # se não recuperar, mantem infectado com novo período (ou pode morrer próximo passo)
-                                new_timers[r][c] = self.infectious_period
-                        else:
-                            new_timers[r][c] = timer - 1
-
-                elif state in (RECOVERED, DEAD):
-                    # permanecem no mesmo estado (poderíamos modelar perda de imunidade aqui)
-                    new_timers[r][c] = 0
-
-        # aplicar atualização
-        self.data_matrix = new_matrix
-        self.timers = new_timers
-        self.layoutChanged.emit()
-
-    # Voltar geração (undo)
-    def previous_generation(self):
-        if self.history:
-            mat, tim = self.history.pop()
-            self.data_matrix = mat
-            self.timers = tim
-            self.layoutChanged.emit()
-
-    # Reseta matriz
-    def reset(self):
-        self.data_matrix = [[SUSCEPTIBLE for _ in range(self.cols)] for _ in range(self.rows)]
-        self.timers = [[0 for _ in range(self.cols)] for _ in range(self.rows)]
-        self.history = []
-        self.layoutChanged.emit()
-
-    # randomiza N infectados em posições aleatórias
-    def randomize_infected(self, n=5):
-        placed = 0
-        attempts = 0
-        while placed < n and attempts < n * 20:
-            r = randint(0, self.rows - 1)
-            c = randint(0, self.cols - 1)
-            if self.data_matrix[r][c] == SUSCEPTIBLE:
-                self.data_matrix[r][c] = INFECTED
-                self.timers[r][c] = self.infectious_period
-                placed += 1
-            attempts += 1
-        self.layoutChanged.emit()
-
-    # definir parâmetros em lote (facilita testes)
-    def set_default_params(self):
-        self.p_infection = 0.25
-        self.p_recovery = 0.05
-        self.p_mortality = 0.01
-        self.incubation_period = 2
-        self.infectious_period = 6
-        self.mobility_rate = 0.0
-        self.layoutChanged.emit()
-
 
 # ============================================
-# View da Matriz (suporta paint ao arrastar)
-# - clique agora cicla entre estados (S->E->I->R->D->S)
+# View da Matriz (canvas com imagem indexada, zoom e pan)
+# - a grade inteira é uma QImage de 8 bits (um pixel por célula) desenhada
+#   em escala; só a área alterada é redesenhada após edições
+# - clique + arrastar (botão esquerdo) pinta com a ferramenta atual (pincel
+#   com raio, linha, retângulo ou spray); o estado pintado é o seguinte ao da
+#   célula onde o traço começa (S->E->I->R->D->S; no modo Vida, morta <-> viva)
+# - durante o traço só a imagem muda (pré-visualização); ao soltar, o traço
+#   inteiro vai para o modelo de uma vez (model.paint_mask): um dataChanged
+#   com a janela alterada e uma única entrada de desfazer
+# - roda do mouse: zoom em torno do cursor; botão direito/meio: arrasta
 # ============================================
-class MatrizView(QTableView):
+class MatrizView(QWidget):
+    # grades de linhas só aparecem a partir deste tamanho de célula (px)
+    GRID_MIN_CELL = 6
+    MIN_CELL = 0.05
+    MAX_CELL = 64.0
+
     def __init__(self, model):
         super().__init__()
-        self.setModel(model)
+        self._model = model
 
         self.setMouseTracking(True)
         self.mouse_pressed = False
         self.toggle_value = None
-
-        # Remover barras de navegação
-        self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-
-        # Remover cabeçalhos
-        self.horizontalHeader().setSectionResizeMode(QHeaderView.Fixed)
-        self.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
-        self.horizontalHeader().hide()
-        self.verticalHeader().hide()
-
+        self._pan_start = None
+
+        # ferramenta de pintura (ver brush.py), raio do pincel em células e
+        # fração de células do spray
+        self.tool = "brush"
+        self.brush_radius = 0
+        self.spray_density = 0.2
+        # traço em andamento: célula inicial, última e pedaços já pintados
+        self._stroke_start = None
+        self._stroke_last = None
+        self._stroke_pieces = []
+
+        # tamanho da célula em pixels (zoom) e deslocamento da grade (pan)
+        self.cell_size = 10.0
+        self.offset_x = 0.0
+        self.offset_y = 0.0
+
+        # paleta da imagem: a do modo atual do modelo (SEIRD ou Vida)
+        self._palette = None
+        self._color_table = None
+        self._buffer = None
+        self._image = None
+        self._refresh_image()
+
+        model.dataChanged.connect(self._on_data_changed)
+        model.layoutChanged.connect(self._on_layout_changed)
+
+    def model(self):
+        return self._model
+
+    # copia a grade de estados (ou um trecho dela) para a imagem indexada
+    def _refresh_image(self, r0=0, c0=0, r1=None, c1=None):
+        model = self._model
+        if self._palette is not model.palette:
+            self._palette = model.palette
+            self._color_table = [QColor(*self._palette[s]).rgb() for s in sorted(self._palette)]
+            self._color_table += [QColor("white").rgb()] * (256 - len(self._color_table))
+            if self._image is not None:
+                self._image.setColorTable(self._color_table)
+        if self._image is None or self._image.width() != model.cols or self._image.height() != model.rows:
+            self._image = QImage(model.cols, model.rows, QImage.Format_Indexed8)
+            self._image.setColorTable(self._color_table)
+            # a memória é da QImage; o array é só uma janela sobre ela
+            # (linhas alinhadas em 4 bytes: bytesPerLine >= cols)
+            bits = self._image.bits()
+            bits.setsize(self._image.byteCount())
+            self._buffer = np.frombuffer(bits, dtype=np.uint8).reshape(model.rows, self._image.bytesPerLine())
+            r0, c0, r1, c1 = 0, 0, None, None
+        r1 = model.rows if r1 is None else r1
+        c1 = model.cols if c1 is None else c1
+        with metrics.phase("image", cells=(r1 - r0) * (c1 - c0)):
+            self._buffer[r0:r1, c0:c1] = model.data_matrix[r0:r1, c0:c1]
+
+    def _on_layout_changed(self):
+        self._refresh_image()
+        self.update()
+
+    def _on_data_changed(self, top_left, bottom_right, roles=None):
+        r0, c0 = top_left.row(), top_left.column()
+        r1, c1 = bottom_right.row() + 1, bottom_right.column() + 1
+        self._refresh_image(r0, c0, r1, c1)
+        self.update(self._cells_to_rect(r0, c0, r1, c1))
+
+    # retângulo (em pixels do widget) que cobre as células [r0, r1) x [c0, c1)
+    def _cells_to_rect(self, r0, c0, r1, c1):
+        x0 = int(self.offset_x + c0 * self.cell_size)
+        y0 = int(self.offset_y + r0 * self.cell_size)
+        x1 = int(self.offset_x + c1 * self.cell_size) + 2
+        y1 = int(self.offset_y + r1 * self.cell_size) + 2
+        return QRect(x0, y0, x1 - x0, y1 - y0)
+
+    # célula sob um ponto do widget, ou None fora da grade
+    def cell_at(self, pos):
+        c = int((pos.x() - self.offset_x) // self.cell_size)
+        r = int((pos.y() - self.offset_y) // self.cell_size)
+        if 0 <= r < self._model.rows and 0 <= c < self._model.cols:
+            return r, c
+        return None
+
+    # ajusta o zoom para a grade caber em width_px x height_px
     def adjust_cell_sizes(self, width_px, height_px):
-        cols = self.model().columnCount()
-        rows = self.model().rowCount()
-
-        cell_size = min(width_px // cols, height_px // rows)
-        total_width = cell_size * cols
-        total_height = cell_size * rows
-
-        self.setFixedSize(total_width, total_height)
+        cols = self._model.columnCount()
+        rows = self._model.rowCount()
+
+        self.cell_size = max(min(width_px / cols, height_px / rows), self.MIN_CELL)
+        if self.cell_size >= 1:
+            self.cell_size = float(int(self.cell_size))
+        self.offset_x = 0.0
+        self.offset_y = 0.0
+
+        self.setFixedSize(width_px, height_px)
+        self.update()
+
+    def paintEvent(self, event):
+        with metrics.phase("repaint"):
+            self._paint(event)
+
+    def _paint(self, event):
+        painter = QPainter(self)
+        dirty = event.rect()
+        painter.fillRect(dirty, QColor(90, 90, 90))
+
+        # só o trecho visível e sujo da grade é desenhado
+        size = self.cell_size
+        c0 = max(int((dirty.left() - self.offset_x) // size), 0)
+        r0 = max(int((dirty.top() - self.offset_y) // size), 0)
+        c1 = min(int((dirty.right() + 1 - self.offset_x) // size) + 1, self._model.cols)
+        r1 = min(int((dirty.bottom() + 1 - self.offset_y) // size) + 1, self._model.rows)
+        if c0 >= c1 or r0 >= r1:
+            return
+        target = QRectF(self.offset_x + c0 * size, self.offset_y + r0 * size, (c1 - c0) * size, (r1 - r0) * size)
+        painter.drawImage(target, self._image, QRectF(c0, r0, c1 - c0, r1 - r0))
+
+        if size >= self.GRID_MIN_CELL:
+            painter.setPen(QColor(208, 208, 208))
+            for c in range(c0, c1 + 1):
+                x = int(self.offset_x + c * size)
+                painter.drawLine(x, int(target.top()), x, int(target.bottom()))
+            for r in range(r0, r1 + 1):
+                y = int(self.offset_y + r * size)
+                painter.drawLine(int(target.left()), y, int(target.right()), y)
+
+        # linha e retângulo: a pré-visualização é desenhada por cima
+        if self.tool in ("line", "rect") and self._stroke_start is not None:
+            self._paint_shape_preview(painter)
+
+    def _paint_shape_preview(self, painter):
+        color = QColor(*self._model.palette.get(self.toggle_value, (255, 255, 255)))
+        color.setAlpha(170)
+        size = self.cell_size
+        (ra, ca), (rb, cb) = self._stroke_start, self._stroke_last
+        if self.tool == "rect":
+            r0, r1 = min(ra, rb), max(ra, rb) + 1
+            c0, c1 = min(ca, cb), max(ca, cb) + 1
+            painter.fillRect(QRectF(self.offset_x + c0 * size, self.offset_y + r0 * size,
+                                    (c1 - c0) * size, (r1 - r0) * size), color)
+            return
+        pen = QPen(color, (2 * self.brush_radius + 1) * size)
+        pen.setCapStyle(Qt.RoundCap)
+        painter.setPen(pen)
+        painter.drawLine(QPointF(self.offset_x + (ca + 0.5) * size, self.offset_y + (ra + 0.5) * size),
+                         QPointF(self.offset_x + (cb + 0.5) * size, self.offset_y + (rb + 0.5) * size))
+
+    # zoom em torno do cursor
+    def wheelEvent(self, event):
+        factor = 1.25 if event.angleDelta().y() > 0 else 0.8
+        new_size = min(max(self.cell_size * factor, self.MIN_CELL), self.MAX_CELL)
+        pos = event.pos()
+        self.offset_x = pos.x() - (pos.x() - self.offset_x) * new_size / self.cell_size
+        self.offset_y = pos.y() - (pos.y() - self.offset_y) * new_size / self.cell_size
+        self.cell_size = new_size
+        self.update()
+
+    # estende o traço até a célula sob o cursor
+    def _paint_at(self, pos):
+        cell = self.cell_at(pos)
+        if cell is None:
+            return
+        model = self._model
+        if self.toggle_value is None:
+            current = int(model.data_matrix[cell])
+            # cicla para o próximo estado (útil para montar cenários)
+            self.toggle_value = (current + 1) % len(model.palette)
+            self._stroke_start = self._stroke_last = cell
+        elif cell == self._stroke_last:
+            return
+        if self.tool in ("line", "rect"):
+            self._stroke_last = cell
+            self.update()
+            return
 
-        for c in range(cols):
-            self.setColumnWidth(c, cell_size)
-        for r in range(rows):
-            self.setRowHeight(r, cell_size)
+        piece = segment_mask(self._stroke_last, cell, self.brush_radius, model.data_matrix.shape)
+        if self.tool == "spray":
+            piece = spray(piece, self.spray_density, model.rng)
+        self._stroke_last = cell
+        if piece is None:
+            return
+        self._stroke_pieces.append(piece)
+        # pré-visualização direto na imagem; o modelo só muda ao soltar
+        r0, c0, mask = piece
+        h, w = mask.shape
+        self._buffer[r0:r0 + h, c0:c0 + w][mask] = self.toggle_value
+        self.update(self._cells_to_rect(r0, c0, r0 + h, c0 + w))
+
+    # aplica o traço inteiro no modelo (uma operação, um aviso, um desfazer)
+    def _finish_stroke(self):
+        if self._stroke_start is not None:
+            shape = self._model.data_matrix.shape
+            if self.tool == "line":
+                piece = segment_mask(self._stroke_start, self._stroke_last, self.brush_radius, shape)
+            elif self.tool == "rect":
+                piece = rect_mask(self._stroke_start, self._stroke_last, shape)
+            else:
+                piece = merge_masks(self._stroke_pieces)
+            if piece is not None:
+                with self._model.lock:
+                    self._model.paint_mask(*piece, self.toggle_value)
+            if self.tool in ("line", "rect"):
+                self.update()
+        self.toggle_value = None
+        self._stroke_start = None
+        self._stroke_last = None
+        self._stroke_pieces = []
 
     # Eventos do mouse para clicar + arrastar
     def mousePressEvent(self, event):
         if event.buttons() & Qt.LeftButton:
             self.mouse_pressed = True
-
-            index = self.indexAt(event.pos())
-            if index.isValid():
-                r = index.row()
-                c = index.column()
-                current = self.model().data_matrix[r][c]
-                # cicla para o próximo estado (útil para montar cenários)
-                next_state = (current + 1) % (len(STATE_COLORS))
-                self.toggle_value = next_state
-                self.model().setData(index, self.toggle_value)
+            self._paint_at(event.pos())
+        elif event.buttons() & (Qt.RightButton | Qt.MiddleButton):
+            self._pan_start = (event.pos(), self.offset_x, self.offset_y)
 
     def mouseMoveEvent(self, event):
         if self.mouse_pressed:
-            index = self.indexAt(event.pos())
-            if index.isValid():
-                r = index.row()
-                c = index.column()
-                if self.model().data_matrix[r][c] != self.toggle_value:
-                    self.model().setData(index, self.toggle_value)
+            self._paint_at(event.pos())
+        elif self._pan_start is not None:
+            start, x, y = self._pan_start
+            self.offset_x = x + event.pos().x() - start.x()
+            self.offset_y = y + event.pos().y() - start.y()
+            self.update()
 
     def mouseReleaseEvent(self, event):
+        if self.mouse_pressed:
+            self._finish_stroke()
         self.mouse_pressed = False
-        self.toggle_value = None
+        self._pan_start = None
+
+
+# ============================================
+# Gráfico das séries S/E/I/R/D (lê model.series, sem recontar a grade)
+# ============================================
+# QPolygonF preenchido direto pela memória (pares de float64 x, y), sem
+# criar um QPointF por ponto
+def _polygon(xs, ys):
+    polygon = QPolygonF(len(xs))
+    buffer = polygon.data()
+    buffer.setsize(len(xs) * 2 * np.dtype(np.float64).itemsize)
+    points = np.frombuffer(buffer, dtype=np.float64).reshape(len(xs), 2)
+    points[:, 0] = xs
+    points[:, 1] = ys
+    return polygon
+
+
+class SeriesPlot(QWidget):
+    MARGIN = 6
+
+    def __init__(self, model):
+        super().__init__()
+        self._model = model
+        self.setMinimumHeight(120)
+        model.layoutChanged.connect(self.update)
+        model.dataChanged.connect(self.update)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor(250, 250, 250))
+        # `array` sem cópia; o tamanho é lido uma vez (a thread de
+        # reprodução pode acrescentar linhas durante o desenho)
+        series = self._model.series.array
+        total = self._model.rows * self._model.cols
+        m = self.MARGIN
+        w = self.width() - 2 * m
+        h = self.height() - 2 * m - 16
+        if total == 0 or w <= 0 or h <= 0:
+            return
+
+        # no máximo um ponto por pixel de largura: escolhe as linhas antes
+        # de converter (a série pode ter milhões de gerações)
+        if len(series) > w:
+            rows = np.linspace(0, len(series) - 1, w).astype(np.intp)
+            points = series[rows].astype(np.float64)
+        else:
+            points = series.astype(np.float64)
+        span = max(series[-1][0] - series[0][0], 1)
+        xs = m + (points[:, 0] - series[0][0]) * (w / span)
+        painter.setRenderHint(QPainter.Antialiasing)
+        model = self._model
+        for state, rgb in model.palette.items():
+            color = QColor(*rgb)
+            ys = m + h - points[:, 1 + state] * (h / total)
+            outline = color.darker(130) if color.lightness() > 200 else color
+            painter.setPen(QPen(outline, 2))
+            painter.drawPolyline(_polygon(xs, ys))
+
+        generation, *counts, new_inf, new_dead = series[-1].tolist()
+        text = f"Geração {generation}   " + "   ".join(
+            f"{name} {counts[state]}" for state, name in model.state_names.items()
+        )
+        if model.life_rule is not None:
+            text += f"   (+{new_inf} nascimentos, +{new_dead} mortes)"
+        else:
+            text += f"   (+{new_inf} infecções, +{new_dead} mortes)"
+        painter.setPen(Qt.black)
+        painter.drawText(QRect(m, self.height() - m - 16, w, 16), Qt.AlignLeft | Qt.AlignVCenter, text)
+
+
+# ============================================
+# Reprodução contínua em segundo plano
+# ============================================
+# Avança o modelo numa thread própria, sem sinais por geração: cada passo é
+# feito com `model.lock` e sem avisar a view; a janela redesenha num timer
+# (FRAME_INTERVAL_MS), então a tela não limita a velocidade do motor e
+# gerações intermediárias são descartadas. `rate` é o alvo em gerações por
+# segundo (0 = sem limite) e pode mudar durante a reprodução; com
+# `generations` a thread para sozinha depois de tantas gerações (avanço rápido).
+class SimulationPlayer(QThread):
+    failed = pyqtSignal(str)
+
+    def __init__(self, model, rate=0, generations=None):
+        super().__init__()
+        self.model = model
+        self.rate = rate
+        self.generations = generations
+        self.done = 0
+        self.elapsed = 0.0
+        self._stop = Event()
+
+    # pede a parada e espera o passo em andamento terminar
+    def stop(self):
+        self._stop.set()
+        self.wait()
+
+    def run(self):
+        start = deadline = time.perf_counter()
+        try:
+            while not self._stop.is_set() and (self.generations is None or self.done < self.generations):
+                with self.model.lock:
+                    self.model.next_generation(notify=False)
+                self.done += 1
+                if self.rate > 0:
+                    deadline += 1 / self.rate
+                    delay = deadline - time.perf_counter()
+                    if delay > 0:
+                        self._stop.wait(delay)
+                    elif delay < -1:
+                        # atrasado demais (passos lentos): não compensa em rajada
+                        deadline = time.perf_counter()
+        except Exception as exc:
+            self.failed.emit(str(exc))
+        finally:
+            self.elapsed = time.perf_counter() - start
+
+
+# ============================================
+# Exportação de GIF em segundo plano
+# ============================================
+class GifExportWorker(QThread):
+    progress = pyqtSignal(int, int)
+    # caminho do GIF, ou "" se cancelado
+    done = pyqtSignal(str)
+    failed = pyqtSignal(str)
+
+    # `snapshot`: cópia do modelo (export.gif_snapshot) tirada na interface
+    def __init__(self, snapshot, path, gen_count, scale):
+        super().__init__()
+        self.snapshot = snapshot
+        self.path = path
+        self.gen_count = gen_count
+        self.scale = scale
+        self.cancel_event = Event()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        try:
+            export_snapshot_gif(
+                self.snapshot, self.path, self.gen_count, scale=self.scale,
+                progress=self.progress.emit, cancel=self.cancel_event,
+            )
+        except ExportCancelled:
+            self.done.emit("")
+        except Exception as exc:
+            self.failed.emit(str(exc))
+        else:
+            self.done.emit(self.path)
+
+
+# ============================================
+# Miniaturas da filmoteca em segundo plano
+# ============================================
+# Gera/lê as miniaturas do cache (thumbnails.py) fora da thread da interface.
+# QImage pode ser criada em qualquer thread; o QPixmap é feito na interface.
+class ThumbnailLoader(QThread):
+    # caminho do GIF e a miniatura (QImage nula se o GIF não pôde ser lido)
+    loaded = pyqtSignal(str, QImage)
+
+    def __init__(self, cache):
+        super().__init__()
+        self.cache = cache
+        self._queue = queue.Queue()
+
+    # `entry` = (caminho, mtime_ns, tamanho), como em thumbnails.scan_gifs
+    def request(self, entry):
+        self._queue.put(entry)
+
+    def stop(self):
+        self._queue.put(None)
+        self.wait()
+
+    def run(self):
+        while True:
+            entry = self._queue.get()
+            if entry is None:
+                return
+            with metrics.phase("thumbnail"):
+                try:
+                    image = QImage(self.cache.get(*entry))
+                except (OSError, EOFError, ValueError):
+                    image = QImage()
+            self.loaded.emit(entry[0], image)
 
 
 # ============================================
@@ -312,7 +594,12 @@ class MainWindow(QWidget):
         # Matriz
         self.model = MatrizModel(rows=40, cols=60)  # default maior para ver padrões espaciais
         self.view = MatrizView(self.model)
-        main_layout.addWidget(self.view)
+        self.series_plot = SeriesPlot(self.model)
+        self.series_plot.setFixedHeight(SERIES_PLOT_HEIGHT)
+        grid_area = QVBoxLayout()
+        grid_area.addWidget(self.view)
+        grid_area.addWidget(self.series_plot)
+        main_layout.addLayout(grid_area)
 
         # ===============================================
         # PAINEL DE BOTÕES (vertical, lado direito)
@@ -322,48 +609,187 @@ class MainWindow(QWidget):
         # Botões
         btn_next = QPushButton("Próxima Geração ⏭️")
         btn_prev = QPushButton("Voltar Geração ⏮️")
-        btn_25 = QPushButton("GIF 25 Gerações 📷")
-        btn_100 = QPushButton("GIF 100 Gerações 🎥 ")
+        self.btn_play = QPushButton("Reproduzir ▶️")
+        self.btn_play.setCheckable(True)
+        self.btn_gif = QPushButton("Exportar GIF 🎥")
+        self.btn_cancel_gif = QPushButton("Cancelar Exportação ✖")
         btn_reset = QPushButton("Resetar Matriz 🧼")
         btn_filmoteca = QPushButton("Filmoteca 💾 ")
         btn_random_inf = QPushButton("Randomizar Infectados 🔥")
         btn_default_params = QPushButton("Parâmetros Padrão ⚙️")
 
+        # gravação em disco e navegação por gravações
+        self.btn_record = QPushButton("Gravar ⏺")
+        self.btn_record.setCheckable(True)
+        btn_open_recording = QPushButton("Abrir Gravação 📂")
+        btn_export_series = QPushButton("Exportar Séries 📈")
+        # checkpoints: estado completo (grade, parâmetros, gerador, histórico)
+        btn_save_checkpoint = QPushButton("Salvar Checkpoint 📌")
+        btn_load_checkpoint = QPushButton("Abrir Checkpoint 📥")
+
         # BOTÕES ESTILO RETANGULAR & GRANDES
-        for btn in (btn_next, btn_prev, btn_25, btn_100, btn_reset, btn_filmoteca, btn_random_inf, btn_default_params):
+        for btn in (btn_next, btn_prev, self.btn_play, self.btn_gif, self.btn_cancel_gif, btn_reset, btn_filmoteca, btn_random_inf, btn_default_params):
             btn.setFixedSize(220, 52)
-            btn.setStyleSheet("""
-                QPushButton {
-                    font-size: 15px;
-                    background-color: #d0d0d0;
-                    border: 2px solid #555;
-                    border-radius: 5px;
-                }
-                QPushButton:hover {
-                    background-color: #c0c0c0;
-                }
-            """)
+            btn.setStyleSheet(BUTTON_STYLE)
+        # botões secundários, mais baixos
+        for btn in (self.btn_record, btn_open_recording, btn_export_series, btn_save_checkpoint, btn_load_checkpoint):
+            btn.setFixedSize(220, 36)
+            btn.setStyleSheet(BUTTON_STYLE)
 
         # Conectar sinais
         btn_next.clicked.connect(self.handle_next_gen)
         btn_prev.clicked.connect(self.handle_prev_gen)
-        btn_25.clicked.connect(self.handle_25_gens_gif)
-        btn_100.clicked.connect(self.handle_100_gens_gif)
+        self.btn_play.toggled.connect(self.handle_toggle_play)
+        self.btn_gif.clicked.connect(self.handle_export_gif)
+        self.btn_cancel_gif.clicked.connect(self.handle_cancel_gif)
         btn_reset.clicked.connect(self.handle_reset_matrix)
         btn_filmoteca.clicked.connect(self.handle_open_gif_folder)
         btn_random_inf.clicked.connect(self.handle_randomize_infected)
         btn_default_params.clicked.connect(self.handle_set_default_params)
+        self.btn_record.toggled.connect(self.handle_toggle_recording)
+        btn_open_recording.clicked.connect(self.handle_open_recording)
+        btn_export_series.clicked.connect(self.handle_export_series)
+        btn_save_checkpoint.clicked.connect(lambda: self.handle_save_checkpoint())
+        btn_load_checkpoint.clicked.connect(lambda: self.handle_load_checkpoint())
+
+        # modo: SEIRD ou Jogo da Vida (regra B/S, motor e salto por passo)
+        self.combo_mode = QComboBox()
+        for label, engine in MODES:
+            self.combo_mode.addItem(label, engine)
+        self.combo_mode.setFixedSize(220, 28)
+        self.edit_rule = QLineEdit("B3/S23")
+        self.edit_rule.setToolTip("Regra B/S (ex.: B3/S23, B36/S23) ou nome (conway, highlife, seeds)")
+        self.edit_rule.setFixedSize(108, 28)
+        self.spin_jump = QSpinBox()
+        self.spin_jump.setRange(0, MAX_JUMP_EXPONENT)
+        self.spin_jump.setPrefix("passo 2^")
+        self.spin_jump.setToolTip("Gerações por clique em Próxima Geração (2^k; grande no HashLife)")
+        self.spin_jump.setFixedSize(108, 28)
+        btn_open_pattern = QPushButton("Abrir Padrão RLE 🧩")
+        btn_open_pattern.setFixedSize(220, 36)
+        btn_open_pattern.setStyleSheet(BUTTON_STYLE)
+        self.combo_mode.currentIndexChanged.connect(self.handle_mode_changed)
+        self.edit_rule.editingFinished.connect(self.handle_mode_changed)
+        self.spin_jump.valueChanged.connect(self.handle_mode_changed)
+        btn_open_pattern.clicked.connect(self.handle_open_pattern)
+
+        side_panel.addWidget(self.combo_mode)
+        life_row = QHBoxLayout()
+        life_row.addWidget(self.edit_rule)
+        life_row.addWidget(self.spin_jump)
+        side_panel.addLayout(life_row)
+        side_panel.addWidget(btn_open_pattern)
+
+        # pintura: ferramenta, raio do pincel/linha e densidade do spray
+        self.combo_tool = QComboBox()
+        for label, tool in BRUSH_TOOLS:
+            self.combo_tool.addItem(label, tool)
+        self.combo_tool.setFixedSize(220, 28)
+        self.spin_radius = QSpinBox()
+        self.spin_radius.setRange(0, 500)
+        self.spin_radius.setPrefix("raio ")
+        self.spin_radius.setToolTip("Raio do pincel, da linha e do spray, em células")
+        self.spin_radius.setFixedSize(108, 28)
+        self.spin_density = QSpinBox()
+        self.spin_density.setRange(1, 100)
+        self.spin_density.setValue(int(self.view.spray_density * 100))
+        self.spin_density.setPrefix("spray ")
+        self.spin_density.setSuffix("%")
+        self.spin_density.setFixedSize(108, 28)
+        self.combo_tool.currentIndexChanged.connect(self.handle_brush_changed)
+        self.spin_radius.valueChanged.connect(self.handle_brush_changed)
+        self.spin_density.valueChanged.connect(self.handle_brush_changed)
+        side_panel.addWidget(self.combo_tool)
+        brush_row = QHBoxLayout()
+        brush_row.addWidget(self.spin_radius)
+        brush_row.addWidget(self.spin_density)
+        side_panel.addLayout(brush_row)
+
+        # reprodução contínua: velocidade alvo e avanço rápido de N gerações
+        self.player = None
+        self.spin_rate = QSpinBox()
+        self.spin_rate.setRange(0, 100000)
+        self.spin_rate.setValue(20)
+        self.spin_rate.setSuffix(" ger/s")
+        self.spin_rate.setSpecialValueText("máx. ger/s")
+        self.spin_rate.setToolTip("Gerações por segundo na reprodução (0 = sem limite)")
+        self.spin_rate.setFixedSize(220, 28)
+        self.spin_rate.valueChanged.connect(self.handle_rate_changed)
+        self.spin_fast_forward = QSpinBox()
+        self.spin_fast_forward.setRange(1, 10000000)
+        self.spin_fast_forward.setValue(1000)
+        self.spin_fast_forward.setPrefix("+")
+        self.spin_fast_forward.setFixedSize(108, 28)
+        self.btn_fast_forward = QPushButton("Avançar ⏩")
+        self.btn_fast_forward.setToolTip("Avança N gerações sem redesenhar até o fim")
+        self.btn_fast_forward.setFixedSize(108, 28)
+        self.btn_fast_forward.clicked.connect(self.handle_fast_forward)
+        self.play_label = QLabel("")
+        self.play_label.setFixedWidth(220)
+        self.play_label.setAlignment(Qt.AlignCenter)
+        # redesenho da reprodução: no máximo um quadro por intervalo
+        self.frame_timer = QTimer(self)
+        self.frame_timer.setInterval(FRAME_INTERVAL_MS)
+        self.frame_timer.timeout.connect(self._on_frame)
 
         # Adicionar botões ao painel lateral (ordem visual)
         side_panel.addWidget(btn_next)
         side_panel.addWidget(btn_prev)
+        side_panel.addWidget(self.btn_play)
+        side_panel.addWidget(self.spin_rate)
+        fast_forward_row = QHBoxLayout()
+        fast_forward_row.addWidget(self.spin_fast_forward)
+        fast_forward_row.addWidget(self.btn_fast_forward)
+        side_panel.addLayout(fast_forward_row)
+        side_panel.addWidget(self.play_label)
         side_panel.addWidget(btn_random_inf)
         side_panel.addWidget(btn_default_params)
-        side_panel.addWidget(btn_25)
-        side_panel.addWidget(btn_100)
+        # vizinhança do contágio: presets ou qualquer especificação de kernels.py
+        self.combo_neighborhood = QComboBox()
+        self.combo_neighborhood.setEditable(True)
+        self.combo_neighborhood.addItems(NEIGHBORHOOD_PRESETS)
+        self.combo_neighborhood.setToolTip("Vizinhança do contágio (ex.: moore:2, von-neumann, exp:8:2, power:16:2)")
+        self.combo_neighborhood.setFixedSize(220, 28)
+        self.combo_neighborhood.lineEdit().editingFinished.connect(self.handle_neighborhood_changed)
+        self.combo_neighborhood.activated.connect(self.handle_neighborhood_changed)
+        side_panel.addWidget(self.combo_neighborhood)
+        # exportação: número de gerações, progresso e cancelamento
+        self.spin_gif_gens = QSpinBox()
+        self.spin_gif_gens.setRange(1, 1000000)
+        self.spin_gif_gens.setValue(100)
+        self.spin_gif_gens.setSuffix(" gerações")
+        self.spin_gif_gens.setFixedSize(220, 32)
+        self.gif_progress = QProgressBar()
+        self.gif_progress.setFixedSize(220, 24)
+        self.gif_progress.setValue(0)
+        self.btn_cancel_gif.setEnabled(False)
+        self.gif_worker = None
+
+        side_panel.addWidget(self.spin_gif_gens)
+        side_panel.addWidget(self.btn_gif)
+        side_panel.addWidget(self.gif_progress)
+        side_panel.addWidget(self.btn_cancel_gif)
         side_panel.addWidget(btn_filmoteca)
         side_panel.addWidget(btn_reset)
 
+        # gravação: botão liga/desliga, abrir gravação e barra de navegação
+        self.recording = None
+        self.recording_slider = QSlider(Qt.Horizontal)
+        self.recording_slider.setFixedWidth(220)
+        self.recording_slider.setEnabled(False)
+        self.recording_slider.valueChanged.connect(self.handle_scrub_recording)
+        self.recording_label = QLabel("Sem gravação aberta")
+        self.recording_label.setFixedWidth(220)
+        self.recording_label.setAlignment(Qt.AlignCenter)
+
+        side_panel.addWidget(self.btn_record)
+        side_panel.addWidget(btn_open_recording)
+        side_panel.addWidget(self.recording_slider)
+        side_panel.addWidget(self.recording_label)
+        side_panel.addWidget(btn_export_series)
+        side_panel.addWidget(btn_save_checkpoint)
+        side_panel.addWidget(btn_load_checkpoint)
+
         # ============================
         # ÁREA DE MINIATURAS (FILMOTECA)
         # ============================
@@ -378,28 +804,44 @@ class MainWindow(QWidget):
 
         side_panel.addWidget(lbl_title)
 
-        self.thumb_container = QVBoxLayout()
-        self.thumb_labels = []
-        self.thumb_paths = []  # caminhos correspondentes
-
-        for _ in range(4):
-            lbl = QLabel()
-            lbl.setFixedSize(220, 120)
-            lbl.setStyleSheet("background-color: #eeeeee; border: 1px solid #444;")
-            lbl.setAlignment(Qt.AlignCenter)
-            self.thumb_labels.append(lbl)
-            self.thumb_container.addWidget(lbl)
-
-        side_panel.addLayout(self.thumb_container)
-
-        # empurra os botões para cima
-        side_panel.addStretch()
+        # lista rolável com todos os GIFs (mais recentes primeiro); as
+        # miniaturas só são pedidas para as linhas visíveis
+        self.thumb_list = QListWidget()
+        self.thumb_list.setFixedWidth(220)
+        self.thumb_list.setIconSize(QSize(*THUMB_SIZE))
+        self.thumb_list.setUniformItemSizes(True)
+        self.thumb_list.setVerticalScrollMode(QListWidget.ScrollPerPixel)
+        self.thumb_list.setStyleSheet("background-color: #eeeeee; border: 1px solid #444;")
+        self.thumb_list.itemClicked.connect(self.handle_open_thumbnail)
+        self.thumb_list.verticalScrollBar().valueChanged.connect(self._request_visible_thumbnails)
+        self.thumb_items = {}      # caminho -> item da lista
+        self.thumb_mtimes = []     # -mtime de cada linha (para inserir em ordem)
+        self.thumb_requested = set()
+        self.exporting_path = None
+
+        self.thumb_cache = ThumbnailCache()
+        self.thumb_loader = ThumbnailLoader(self.thumb_cache)
+        self.thumb_loader.loaded.connect(self._on_thumbnail_loaded)
+        self.thumb_loader.start()
+
+        # só a pasta é observada (um único watch, mesmo com milhares de GIFs):
+        # a cada aviso as entradas são comparadas com a lista e só as novas,
+        # removidas ou regravadas mudam (avisos em rajada são agrupados pelo timer)
+        self.gif_watcher = QFileSystemWatcher([os.path.abspath("gifs")])
+        self.thumb_sync_timer = QTimer(self)
+        self.thumb_sync_timer.setSingleShot(True)
+        self.thumb_sync_timer.setInterval(200)
+        self.thumb_sync_timer.timeout.connect(self.sync_thumbnails)
+        self.gif_watcher.directoryChanged.connect(self.thumb_sync_timer.start)
+
+        # a lista ocupa o espaço restante do painel
+        side_panel.addWidget(self.thumb_list, 1)
 
         # adiciona o painel lateral ao layout principal
         main_layout.addLayout(side_panel)
 
         # Carregar miniaturas existentes ao iniciar
-        self.update_thumbnails()
+        self.load_thumbnails()
 
         # ============================
         # FULLSCREEN SEM BORDA (mantive como estava)
@@ -414,53 +856,107 @@ class MainWindow(QWidget):
 
         # a matriz ocupa tudo menos a largura do painel lateral
         matriz_width = screen_w - 240   # 220 px dos botões + margem
-        matriz_height = screen_h
+        matriz_height = screen_h - SERIES_PLOT_HEIGHT - 20
 
         self.view.adjust_cell_sizes(matriz_width, matriz_height)
 
+        # ============================
+        # PAINEL DE DESEMPENHO (F3) E PERFIL (F9)
+        # ============================
+        self.metrics_overlay = QLabel(self.view)
+        self.metrics_overlay.setStyleSheet(
+            "background-color: rgba(0, 0, 0, 170); color: white; font-family: monospace; padding: 6px;"
+        )
+        self.metrics_overlay.move(8, 8)
+        self.metrics_overlay.hide()
+        self.metrics_timer = QTimer(self)
+        self.metrics_timer.setInterval(500)
+        self.metrics_timer.timeout.connect(self.update_metrics_overlay)
+
     # --------------------------------------------------
-    # Atualiza as miniaturas (4 mais recentes)
+    # Filmoteca: lista de GIFs com miniaturas em cache
     # --------------------------------------------------
-    def update_thumbnails(self):
-        folder = "gifs"
-        # se pasta não existe, limpa miniaturas
-        if not os.path.exists(folder):
-            for lbl in self.thumb_labels:
-                lbl.clear()
-                lbl.setText("Sem GIF")
-            self.thumb_paths = []
+    def load_thumbnails(self):
+        with metrics.phase("thumb_scan"):
+            entries = scan_gifs("gifs")
+        self.thumb_cache.prune(entries)
+        self.thumb_list.clear()
+        self.thumb_items = {}
+        self.thumb_mtimes = []
+        self.thumb_requested = set()
+        for entry in entries:
+            self._insert_thumbnail(entry)
+        QTimer.singleShot(0, self._request_visible_thumbnails)
+
+    def _insert_thumbnail(self, entry):
+        path, mtime_ns, _ = entry
+        item = QListWidgetItem(os.path.basename(path))
+        item.setData(Qt.UserRole, entry)
+        item.setToolTip(path)
+        item.setSizeHint(QSize(THUMB_SIZE[0], THUMB_ROW_HEIGHT))
+        row = bisect_left(self.thumb_mtimes, -mtime_ns)
+        self.thumb_mtimes.insert(row, -mtime_ns)
+        self.thumb_list.insertItem(row, item)
+        self.thumb_items[path] = item
+
+    def _remove_thumbnail(self, path):
+        item = self.thumb_items.pop(path)
+        row = self.thumb_list.row(item)
+        del self.thumb_mtimes[row]
+        self.thumb_list.takeItem(row)
+        self.thumb_requested.discard(path)
+
+    # Compara (caminho, mtime, tamanho) das entradas da pasta com a lista:
+    # só os GIFs novos entram, os removidos saem e os regravados com o mesmo
+    # nome são refeitos (a chave do cache muda, então a miniatura é gerada de novo).
+    def sync_thumbnails(self):
+        with metrics.phase("thumb_sync"):
+            self._sync_thumbnails()
+
+    def _sync_thumbnails(self):
+        current = {entry[0]: entry for entry in scan_gifs("gifs")}
+        for path, item in list(self.thumb_items.items()):
+            entry = current.get(path)
+            if entry is None:
+                self._remove_thumbnail(path)
+            elif entry != item.data(Qt.UserRole):
+                self._remove_thumbnail(path)
+                self._insert_thumbnail(entry)
+        for path, entry in current.items():
+            # o GIF em exportação só entra quando estiver completo
+            if path not in self.thumb_items and path != self.exporting_path:
+                self._insert_thumbnail(entry)
+        self._request_visible_thumbnails()
+
+    # pede ao carregador as miniaturas das linhas visíveis (e algumas a mais)
+    def _request_visible_thumbnails(self):
+        count = self.thumb_list.count()
+        if count == 0:
             return
+        # itens de altura fixa: as linhas visíveis saem direto da rolagem
+        row_height = THUMB_ROW_HEIGHT + self.thumb_list.spacing()
+        top = self.thumb_list.verticalScrollBar().value()
+        first = top // row_height
+        last = (top + self.thumb_list.viewport().height()) // row_height
+        for row in range(first, min(last + 4, count - 1) + 1):
+            entry = self.thumb_list.item(row).data(Qt.UserRole)
+            if entry[0] not in self.thumb_requested:
+                self.thumb_requested.add(entry[0])
+                self.thumb_loader.request(entry)
+
+    def _on_thumbnail_loaded(self, path, image):
+        item = self.thumb_items.get(path)
+        if item is None or image.isNull():
+            return
+        item.setIcon(QIcon(QPixmap.fromImage(image)))
 
-        files = sorted(
-            [f for f in os.listdir(folder) if f.lower().endswith(".gif")],
-            key=lambda x: os.path.getmtime(os.path.join(folder, x)),
-            reverse=True
-        )
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._request_visible_thumbnails()
 
-        last4 = files[:4]
-        self.thumb_paths = []
-
-        for i, lbl in enumerate(self.thumb_labels):
-            if i < len(last4):
-                gif_path = os.path.abspath(os.path.join(folder, last4[i]))
-                self.thumb_paths.append(gif_path)
-
-                # Carrega com QPixmap (mostra primeira frame estática)
-                pix = QPixmap(gif_path)
-                if not pix.isNull():
-                    pix = pix.scaled(
-                        lbl.width(), lbl.height(),
-                        Qt.KeepAspectRatio, Qt.SmoothTransformation
-                    )
-                    lbl.setPixmap(pix)
-                else:
-                    lbl.clear()
-                    lbl.setText(last4[i])
-                # Conectar clique: abrir arquivo
-                lbl.mousePressEvent = lambda ev, p=gif_path: QDesktopServices.openUrl(QUrl.fromLocalFile(p))
-            else:
-                lbl.clear()
-                lbl.setText("Sem GIF")
+    def handle_open_thumbnail(self, item):
+        path = item.data(Qt.UserRole)[0]
+        QDesktopServices.openUrl(QUrl.fromLocalFile(path))
 
     # --------------------------------------------------
     # Abrir pasta gifs/
@@ -471,94 +967,451 @@ class MainWindow(QWidget):
             os.makedirs(folder)
         QDesktopServices.openUrl(QUrl.fromLocalFile(folder))
 
+    # --------------------------------------------------
+    # Gravação em disco (recordings/*.seirdrec)
+    # --------------------------------------------------
+    def handle_toggle_recording(self, checked):
+        if checked:
+            if not os.path.exists("recordings"):
+                os.makedirs("recordings")
+            path = f"recordings/{randint(1000000,9999999)}.seirdrec"
+            with self.model.lock:
+                self.model.start_recording(path)
+            self.btn_record.setText("Parar Gravação ⏹")
+            print(f"Gravando em {path}")
+        else:
+            path = self.model.recorder.path if self.model.recorder is not None else None
+            with self.model.lock:
+                self.model.stop_recording()
+            self.btn_record.setText("Gravar ⏺")
+            if path:
+                print(f"Gravação salva em {path}")
+
+    def handle_open_recording(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Abrir gravação", "recordings", "Gravações SEIRD (*.seirdrec)")
+        if not path:
+            return
+        try:
+            recording = Recording(path)
+        except (OSError, ValueError) as exc:
+            self.recording_label.setText(f"Erro: {exc}")
+            return
+        if recording.shape != (self.model.rows, self.model.cols) or len(recording) == 0:
+            self.recording_label.setText("Gravação incompatível com a grade")
+            return
+        self.recording = recording
+        self.recording_slider.setEnabled(True)
+        self.recording_slider.setRange(0, len(recording) - 1)
+        self.recording_slider.setValue(0)
+        self.handle_scrub_recording(0)
+
+    # pula direto para a geração escolhida da gravação aberta
+    def handle_scrub_recording(self, generation):
+        if self.recording is None:
+            return
+        self.stop_playing()
+        states, timers = self.recording.frame(generation)
+        self.model.set_grid(states, timers)
+        s, e, i, r, d = (int(n) for n in self.recording.counts[generation])
+        self.recording_label.setText(f"Geração {generation}: S{s} E{e} I{i} R{r} D{d}")
+
+    # --------------------------------------------------
+    # Exporta as séries por geração (CSV ou Parquet)
+    # --------------------------------------------------
+    def handle_export_series(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Exportar séries", "series.csv", "CSV (*.csv);;Parquet (*.parquet)"
+        )
+        if not path:
+            return
+        try:
+            save_series(path, self.model.series)
+        except (OSError, RuntimeError) as exc:
+            print(f"Falha ao exportar séries: {exc}")
+            return
+        print(f"Séries salvas em {path}")
+
+    # --------------------------------------------------
+    # Checkpoints (checkpoints/*.seirdckpt)
+    # --------------------------------------------------
+    def handle_save_checkpoint(self, path=None):
+        if path is None:
+            if not os.path.exists("checkpoints"):
+                os.makedirs("checkpoints")
+            path, _ = QFileDialog.getSaveFileName(
+                self, "Salvar checkpoint", time.strftime("checkpoints/%Y%m%d_%H%M%S.seirdckpt"),
+                "Checkpoints SEIRD (*.seirdckpt)",
+            )
+            if not path:
+                return
+        try:
+            with self.model.lock, metrics.phase("checkpoint_save", cells=self.model.data_matrix.size):
+                size = save_checkpoint(self.model, path)
+        except OSError as exc:
+            print(f"Falha ao salvar checkpoint: {exc}")
+            return
+        print(f"Checkpoint salvo em {path} ({size / 1e6:.1f} MB)")
+
+    def handle_load_checkpoint(self, path=None):
+        if path is None:
+            path, _ = QFileDialog.getOpenFileName(
+                self, "Abrir checkpoint", "checkpoints", "Checkpoints SEIRD (*.seirdckpt)"
+            )
+            if not path:
+                return
+        # a grade pode mudar de tamanho: gravações em andamento ou abertas
+        # deixam de valer
+        self.stop_playing()
+        self.btn_record.setChecked(False)
+        self.recording = None
+        self.recording_slider.setEnabled(False)
+        self.recording_label.setText("Sem gravação aberta")
+        try:
+            with metrics.phase("checkpoint_load"):
+                load_checkpoint(path, self.model)
+        except (OSError, ValueError, KeyError) as exc:
+            print(f"Falha ao abrir checkpoint {path}: {exc}")
+            return
+        self._sync_mode_controls()
+        self.combo_neighborhood.setEditText(self.model.neighborhood)
+        self.view.adjust_cell_sizes(self.view.width(), self.view.height())
+        print(f"Checkpoint {path} aberto (geração {self.model.generation})")
+
     # --------------------------------------------------
     # Reseta toda a matriz para susceptível
     # --------------------------------------------------
     def handle_reset_matrix(self):
+        self.stop_playing()
         self.model.reset()
 
     # --------------------------------------------------
     # Randomizar infectados (coloca N infectados aleatórios)
     # --------------------------------------------------
     def handle_randomize_infected(self):
+        self.stop_playing()
+        if self.model.life_rule is not None:
+            self.model.randomize_life()
+            return
         # por padrão colocamos 10 infectados
         self.model.randomize_infected(10)
 
+    # --------------------------------------------------
+    # Modo SEIRD / Jogo da Vida
+    # --------------------------------------------------
+    def handle_mode_changed(self):
+        self.stop_playing()
+        engine = self.combo_mode.currentData()
+        self._limit_jump(engine)
+        rule = self.edit_rule.text() if engine is not None else None
+        try:
+            self.model.set_life_mode(rule, engine or "bitpacked", 2 ** self.spin_jump.value())
+        except ValueError as exc:
+            print(f"Modo inválido: {exc}")
+            self._sync_mode_controls()
+
+    # volta os controles de modo para o estado atual do modelo
+    def _sync_mode_controls(self):
+        model = self.model
+        engine = model.life_engine if model.life_rule is not None else None
+        for widget in (self.combo_mode, self.edit_rule):
+            widget.blockSignals(True)
+        self.combo_mode.setCurrentIndex(self.combo_mode.findData(engine))
+        if model.life_rule is not None:
+            self.edit_rule.setText(model.life_rule.notation)
+        for widget in (self.combo_mode, self.edit_rule):
+            widget.blockSignals(False)
+        self._limit_jump(engine)
+        if model.life_rule is not None:
+            # um salto acima do limite (ex.: de um checkpoint) é reduzido
+            self.spin_jump.blockSignals(True)
+            self.spin_jump.setValue(model.life_jump.bit_length() - 1)
+            self.spin_jump.blockSignals(False)
+            model.life_jump = 2 ** self.spin_jump.value()
+
+    # limite do salto por clique conforme o motor (sem disparar handle_mode_changed)
+    def _limit_jump(self, engine):
+        self.spin_jump.blockSignals(True)
+        self.spin_jump.setMaximum(HASHLIFE_MAX_JUMP_EXPONENT if engine == "hashlife" else MAX_JUMP_EXPONENT)
+        self.spin_jump.blockSignals(False)
+
+    def handle_brush_changed(self):
+        self.view.tool = self.combo_tool.currentData()
+        self.view.brush_radius = self.spin_radius.value()
+        self.view.spray_density = self.spin_density.value() / 100
+
+    # carrega um padrão RLE no centro da grade (cortado se não couber)
+    def handle_open_pattern(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Abrir padrão", "", "Padrões RLE (*.rle);;Todos (*)")
+        if not path:
+            return
+        try:
+            cells, rule = load_rle(path)
+        except (OSError, ValueError, KeyError) as exc:
+            print(f"Falha ao ler {path}: {exc}")
+            return
+        if rule is not None:
+            self.edit_rule.setText(rule.notation)
+        if self.combo_mode.currentData() is None:
+            self.combo_mode.setCurrentIndex(1)
+        self.handle_mode_changed()
+        rows, cols = self.model.rows, self.model.cols
+        h, w = min(cells.shape[0], rows), min(cells.shape[1], cols)
+        grid = np.zeros((rows, cols), dtype=np.uint8)
+        r0, c0 = (rows - h) // 2, (cols - w) // 2
+        grid[r0:r0 + h, c0:c0 + w] = cells[:h, :w]
+        self.model.set_grid(grid, np.zeros_like(grid))
+
     # --------------------------------------------------
     # Setar parâmetros padrão
     # --------------------------------------------------
     def handle_set_default_params(self):
-        self.model.set_default_params()
+        with self.model.lock:
+            self.model.set_default_params()
+        self.combo_neighborhood.setEditText(self.model.neighborhood)
+
+    # troca a vizinhança do contágio (o núcleo é montado uma vez por especificação)
+    def handle_neighborhood_changed(self):
+        spec = self.combo_neighborhood.currentText().strip()
+        try:
+            get_kernel(spec)
+        except (OSError, ValueError) as exc:
+            print(f"Vizinhança inválida: {exc}")
+            self.combo_neighborhood.setEditText(self.model.neighborhood)
+            return
+        with self.model.lock:
+            self.model.neighborhood = spec
 
     # --------------------------------------------------
-    # Gera GIF N gerações (gen_count)
-    # - agora com cores para cada estado
+    # Gera GIF N gerações (gen_count) em segundo plano
+    # - cada quadro é gravado no disco assim que fica pronto
     # --------------------------------------------------
-    def _generate_gif(self, gen_count, scale=4):
-        frames = []
-        temp_matrix = [row[:] for row in self.model.data_matrix]  # backup
-        temp_timers = [row[:] for row in self.model.timers]
-        temp_history = self.model.history[:]
-
-        img_width = self.model.cols * scale
-        img_height = self.model.rows * scale
-
-        for i in range(gen_count):
-            img = Image.new("RGB", (img_width, img_height), color=(255, 255, 255))
-            pixels = img.load()
-            for r in range(self.model.rows):
-                for c in range(self.model.cols):
-                    state = self.model.data_matrix[r][c]
-                    color_q = STATE_COLORS.get(state, QColor("white"))
-                    # extrai RGB de QColor
-                    col = (color_q.red(), color_q.green(), color_q.blue())
-                    if state != SUSCEPTIBLE:  # desenha apenas não-susceptíveis para preservar branco
-                        for dr in range(scale):
-                            for dc in range(scale):
-                                pixels[c*scale+dc, r*scale+dr] = col
-            frames.append(img.copy())
-            self.model.next_generation()
-
-        gif_path = f"gifs/{randint(1000000,9999999)}_{gen_count}gens_seird.gif"
+    def _generate_gif(self, gen_count, scale=3):
+        if self.gif_worker is not None:
+            return
+        # a exportação parte de uma cópia do estado atual, tirada aqui sob a
+        # trava: a reprodução e a pintura podem continuar durante a exportação
+        with self.model.lock:
+            snapshot = gif_snapshot(self.model)
+        kind = "seird" if self.model.life_rule is None else "vida"
+        gif_path = f"gifs/{randint(1000000,9999999)}_{gen_count}gens_{kind}.gif"
         # garante pasta
         if not os.path.exists("gifs"):
             os.makedirs("gifs")
-        frames[0].save(
-            gif_path,
-            save_all=True,
-            append_images=frames[1:],
-            duration=120,
-            loop=0,
-        )
-        print(f"GIF salvo como {gif_path}")
-
-        # restaurar estado
-        self.model.data_matrix = temp_matrix
-        self.model.timers = temp_timers
-        self.model.history = temp_history
-        self.model.layoutChanged.emit()
-
-        # atualizar miniaturas
-        self.update_thumbnails()
-
-    def handle_25_gens_gif(self):
-        self._generate_gif(25, scale=4)
 
-    def handle_100_gens_gif(self):
-        self._generate_gif(100, scale=3)
+        self.exporting_path = os.path.abspath(gif_path)
+        self.gif_progress.setRange(0, gen_count)
+        self.gif_progress.setValue(0)
+        self.btn_gif.setEnabled(False)
+        self.btn_cancel_gif.setEnabled(True)
+
+        self.gif_worker = GifExportWorker(snapshot, gif_path, gen_count, scale)
+        self.gif_worker.progress.connect(self._on_gif_progress)
+        self.gif_worker.done.connect(self._on_gif_done)
+        self.gif_worker.failed.connect(self._on_gif_failed)
+        self.gif_worker.finished.connect(self._on_gif_worker_finished)
+        self.gif_worker.start()
+
+    def _on_gif_progress(self, done, total):
+        self.gif_progress.setValue(done)
+
+    def _on_gif_done(self, gif_path):
+        self.exporting_path = None
+        if gif_path:
+            print(f"GIF salvo como {gif_path}")
+            # atualizar miniaturas
+            self.sync_thumbnails()
+        else:
+            print("Exportação cancelada")
+            self.gif_progress.setValue(0)
+
+    def _on_gif_failed(self, message):
+        self.exporting_path = None
+        print(f"Falha ao exportar GIF: {message}")
+        self.gif_progress.setValue(0)
+
+    def _on_gif_worker_finished(self):
+        self.gif_worker = None
+        self.btn_gif.setEnabled(True)
+        self.btn_cancel_gif.setEnabled(False)
+
+    def handle_export_gif(self):
+        self._generate_gif(self.spin_gif_gens.value())
+
+    def handle_cancel_gif(self):
+        if self.gif_worker is not None:
+            self.gif_worker.cancel()
+
+    # um GIF regravado no lugar (sem criar/renomear) não avisa a pasta: ao
+    # voltar para a janela a filmoteca é conferida de novo
+    def changeEvent(self, event):
+        if event.type() == QEvent.ActivationChange and self.isActiveWindow():
+            self.thumb_sync_timer.start()
+        super().changeEvent(event)
+
+    # não deixa a thread de exportação órfã ao fechar a janela
+    # ao fechar, o estado atual vai para checkpoints/autosave.seirdckpt
+    # (retomar com `python app.py --checkpoint checkpoints/autosave.seirdckpt`)
+    def closeEvent(self, event):
+        self.stop_playing()
+        if self.gif_worker is not None:
+            self.gif_worker.cancel()
+            self.gif_worker.wait()
+        self.model.stop_recording()
+        if not os.path.exists("checkpoints"):
+            os.makedirs("checkpoints")
+        self.handle_save_checkpoint(AUTOSAVE_CHECKPOINT)
+        self.thumb_loader.stop()
+        super().closeEvent(event)
+
+    # F3 liga/desliga o painel de desempenho; F9 roda o cProfile sobre as
+    # próximas N gerações (N = gerações do GIF) e salva em profiles/;
+    # Ctrl+S / Ctrl+O salvam e abrem checkpoints
+    def keyPressEvent(self, event):
+        ctrl = event.modifiers() & Qt.ControlModifier
+        if event.key() == Qt.Key_F3:
+            self.toggle_metrics_overlay()
+        elif event.key() == Qt.Key_F9:
+            self.handle_profile_generations(self.spin_gif_gens.value())
+        elif ctrl and event.key() == Qt.Key_S:
+            self.handle_save_checkpoint()
+        elif ctrl and event.key() == Qt.Key_O:
+            self.handle_load_checkpoint()
+        else:
+            super().keyPressEvent(event)
+
+    def toggle_metrics_overlay(self):
+        if self.metrics_overlay.isVisible():
+            self.metrics_timer.stop()
+            self.metrics_overlay.hide()
+        else:
+            self.update_metrics_overlay()
+            self.metrics_overlay.show()
+            self.metrics_overlay.raise_()
+            self.metrics_timer.start()
+
+    def update_metrics_overlay(self):
+        text = format_snapshot(metrics.snapshot()) or "sem medidas ainda"
+        self.metrics_overlay.setText(text)
+        self.metrics_overlay.adjustSize()
+
+    def handle_profile_generations(self, generations):
+        self.stop_playing()
+        if not os.path.exists("profiles"):
+            os.makedirs("profiles")
+        path = time.strftime("profiles/perfil_%Y%m%d_%H%M%S.prof")
+        summary = profile_calls(self.model.next_generation, generations, path)
+        print(summary)
+        print(f"Perfil de {generations} gerações salvo em {path}")
 
     def handle_next_gen(self):
+        self.stop_playing()
         self.model.next_generation()
 
     def handle_prev_gen(self):
+        self.stop_playing()
         self.model.previous_generation()
 
+    # --------------------------------------------------
+    # Reprodução contínua e avanço rápido (SimulationPlayer)
+    # --------------------------------------------------
+    def handle_toggle_play(self, checked):
+        if checked:
+            self._start_player(self.spin_rate.value())
+        else:
+            self.stop_playing()
+
+    def handle_rate_changed(self, rate):
+        if self.player is not None and self.player.generations is None:
+            self.player.rate = rate
+
+    # avança N gerações na velocidade máxima; a tela só é redesenhada no fim
+    # (o botão vira "Parar" enquanto isso)
+    def handle_fast_forward(self):
+        fast_forwarding = self.player is not None and self.player.generations is not None
+        self.stop_playing()
+        if not fast_forwarding:
+            self._start_player(0, self.spin_fast_forward.value())
+
+    def _start_player(self, rate, generations=None):
+        self.stop_playing()
+        self.player = SimulationPlayer(self.model, rate, generations)
+        self.player.failed.connect(self._on_player_failed)
+        self.player.finished.connect(self._on_player_finished)
+        self._frame_done = 0
+        self._frame_time = time.perf_counter()
+        self._set_play_controls(playing=generations is None, fast_forwarding=generations is not None)
+        self.player.start()
+        self.frame_timer.start()
+
+    # para a reprodução (se houver) e redesenha o estado final
+    def stop_playing(self):
+        if self.player is None:
+            return
+        self.player.stop()
+        self._finish_playing()
+
+    def _on_player_finished(self):
+        # o aviso pode chegar depois de stop_playing ou de outra reprodução
+        if self.sender() is self.player:
+            self._finish_playing()
+
+    def _on_player_failed(self, message):
+        print(f"Falha na reprodução: {message}")
+
+    def _finish_playing(self):
+        player = self.player
+        self.player = None
+        self.frame_timer.stop()
+        self._set_play_controls(playing=False, fast_forwarding=False)
+        self.model.refresh()
+        rate = player.done / player.elapsed if player.elapsed > 0 else 0.0
+        self.play_label.setText(
+            f"Geração {self.model.generation}: +{player.done} em {player.elapsed:.2f}s ({rate:.0f} ger/s)"
+        )
+
+    def _set_play_controls(self, playing, fast_forwarding):
+        self.btn_play.blockSignals(True)
+        self.btn_play.setChecked(playing)
+        self.btn_play.blockSignals(False)
+        self.btn_play.setText("Pausar ⏸️" if playing else "Reproduzir ▶️")
+        self.btn_fast_forward.setText("Parar ⏹" if fast_forwarding else "Avançar ⏩")
+
+    # um quadro da reprodução: redesenha só se houve geração nova desde o
+    # último (as do meio são descartadas); no avanço rápido, só o progresso
+    def _on_frame(self):
+        player = self.player
+        if player is None:
+            return
+        done = player.done
+        now = time.perf_counter()
+        rate = (done - self._frame_done) / max(now - self._frame_time, 1e-9)
+        if player.generations is None:
+            if done != self._frame_done:
+                if done - self._frame_done > 1:
+                    metrics.count("frame_skips", done - self._frame_done - 1)
+                with metrics.phase("frame"):
+                    self.model.refresh()
+            self.play_label.setText(f"Geração {self.model.generation} ({rate:.0f} ger/s)")
+        else:
+            self.play_label.setText(f"Avançando {done}/{player.generations} ({rate:.0f} ger/s)")
+        self._frame_done = done
+        self._frame_time = now
+
 
 # ============================================
 # Executar o aplicativo
 # ============================================
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
+    parser = argparse.ArgumentParser(description="ConwayStudio — interface gráfica")
+    parser.add_argument("--metrics-log", default=None, help="grava cada medida de desempenho neste arquivo (JSON lines)")
+    parser.add_argument("--checkpoint", default=None, help="abre este checkpoint .seirdckpt ao iniciar")
+    args, qt_args = parser.parse_known_args()
+    if args.metrics_log:
+        metrics.log_to(args.metrics_log)
+
+    app = QApplication(sys.argv[:1] + qt_args)
     win = MainWindow()
+    if args.checkpoint:
+        win.handle_load_checkpoint(args.checkpoint)
     win.show()
     sys.exit(app.exec())
@@ -0,0 +1,202 @@
+from cellrng import CellRNG
+from export import encode_frame, gif_header, render_frame
+from history import GenerationHistory
+from seird import ENGINE_VERSION, INFECTED, SEIRDSimulation, advance, count_neighbors_array
+import json
+import numpy as np
+import platform
+import time
+import tracemalloc
+
+
+# ============================================
+# Benchmarks (sem interface gráfica)
+# ============================================
+# Cada resultado é um dict com os parâmetros do caso (name, rows, cols, ...),
+# a métrica medida (`metric`, `value`) e se valores maiores são melhores.
+# Os resultados são salvos em JSON e podem ser comparados com uma execução
+# anterior (`compare_results`).
+
+DEFAULT_SIZES = (100, 500, 1000)
+DEFAULT_DENSITIES = (0.001, 0.01, 0.1)
+# vizinhanças comparadas no custo da pressão de infecção (raio crescente)
+DEFAULT_NEIGHBORHOODS = ("moore", "moore:5", "moore:20", "exp:8:2", "power:32:2")
+# campos que identificam um caso na comparação entre execuções
+CASE_FIELDS = ("name", "rows", "cols", "density", "scale", "steps")
+
+
+# simulação com uma fração `density` de infectados em posições aleatórias
+def make_simulation(rows, cols, density, seed=0):
+    sim = SEIRDSimulation(rows, cols, seed=seed)
+    n = max(1, int(round(rows * cols * density)))
+    cells = sim.rng.choice(rows * cols, size=n, replace=False)
+    sim.data_matrix.ravel()[cells] = INFECTED
+    sim.set_grid(sim.data_matrix, sim.timers)
+    return sim
+
+
+def _result(name, metric, value, higher_is_better=True, **case):
+    return {"name": name, **case, "metric": metric, "value": float(value), "higher_is_better": higher_is_better}
+
+
+# células por segundo do passo (motor puro, modo denso e automático),
+# de next_generation (histórico + contadores) e da contagem de vizinhos
+def bench_step(rows, cols, density, generations, seed=0):
+    results = []
+    cells = rows * cols * generations
+    case = {"rows": rows, "cols": cols, "density": density}
+
+    for mode in ("dense", "auto"):
+        sim = make_simulation(rows, cols, density, seed)
+        states, timers, active = sim.data_matrix.copy(), sim.timers.copy(), None
+        rng = CellRNG(seed)
+        start = time.perf_counter()
+        for g in range(generations):
+            states, timers, active, _ = advance(states, timers, sim, rng, g, active, mode)
+        elapsed = time.perf_counter() - start
+        results.append(_result(f"step_{mode}", "cells_per_s", cells / elapsed, **case))
+
+    sim = make_simulation(rows, cols, density, seed)
+    start = time.perf_counter()
+    for _ in range(generations):
+        sim.next_generation()
+    elapsed = time.perf_counter() - start
+    results.append(_result("next_generation", "cells_per_s", cells / elapsed, **case))
+
+    start = time.perf_counter()
+    for _ in range(generations):
+        count_neighbors_array(sim.data_matrix, INFECTED)
+    elapsed = time.perf_counter() - start
+    results.append(_result("count_neighbors", "cells_per_s", cells / elapsed, **case))
+    return results
+
+
+# células por segundo da pressão de infecção para cada vizinhança: com a FFT
+# o custo dos núcleos grandes não cresce com o raio
+def bench_kernels(rows, cols, density, generations, neighborhoods=DEFAULT_NEIGHBORHOODS, seed=0):
+    sim = make_simulation(rows, cols, density, seed)
+    results = []
+    for spec in neighborhoods:
+        count_neighbors_array(sim.data_matrix, INFECTED, spec)
+        start = time.perf_counter()
+        for _ in range(generations):
+            count_neighbors_array(sim.data_matrix, INFECTED, spec)
+        elapsed = time.perf_counter() - start
+        results.append(_result(f"pressure_{spec}", "cells_per_s", rows * cols * generations / elapsed,
+                               rows=rows, cols=cols, density=density))
+    return results
+
+
+# quadros por segundo do desenho (render_frame) e da codificação GIF,
+# sobre gerações reais de uma simulação
+def bench_frames(rows, cols, density, frames, scale, seed=0):
+    sim = make_simulation(rows, cols, density, seed)
+    grids = []
+    for _ in range(frames):
+        sim.next_generation()
+        grids.append(sim.data_matrix.copy())
+
+    start = time.perf_counter()
+    images = [render_frame(states, scale) for states in grids]
+    render_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    size = len(gif_header(images[0], 120))
+    for img in images:
+        size += len(encode_frame(img, 120))
+    encode_elapsed = time.perf_counter() - start
+
+    case = {"rows": rows, "cols": cols, "density": density, "scale": scale}
+    return [
+        _result("render", "frames_per_s", frames / render_elapsed, **case),
+        _result("encode", "frames_per_s", frames / encode_elapsed, **case),
+        _result("encode", "bytes_per_frame", size / frames, higher_is_better=False, **case),
+    ]
+
+
+# memória do histórico depois de `steps` gerações: pico durante os pushes
+# e o que fica retido (medido com tracemalloc e pelo próprio histórico)
+def bench_history(rows, cols, density, steps, seed=0):
+    sim = make_simulation(rows, cols, density, seed)
+    states, timers, active = sim.data_matrix.copy(), sim.timers.copy(), None
+    rng = CellRNG(seed)
+    changed = None
+
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    history = GenerationHistory(max_bytes=1 << 40)
+    start = time.perf_counter()
+    for g in range(steps):
+        history.push(states, timers, changed)
+        states, timers, active, changed = advance(states, timers, sim, rng, g, active)
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    case = {"rows": rows, "cols": cols, "density": density, "steps": steps}
+    return [
+        _result("history", "peak_bytes", peak - base, higher_is_better=False, **case),
+        _result("history", "retained_bytes", current - base, higher_is_better=False, **case),
+        _result("history", "stored_bytes", history.nbytes, higher_is_better=False, **case),
+        _result("history", "steps_per_s", steps / elapsed, **case),
+    ]
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, densities=DEFAULT_DENSITIES, generations=20,
+                   frames=20, scale=2, history_steps=100, seed=0, progress=None):
+    results = []
+    for size in sizes:
+        for density in densities:
+            if progress:
+                progress(f"passo {size}x{size}, densidade {density}")
+            results.extend(bench_step(size, size, density, generations, seed))
+        if progress:
+            progress(f"vizinhanças, quadros e histórico {size}x{size}")
+        results.extend(bench_kernels(size, size, densities[-1], generations, seed=seed))
+        results.extend(bench_frames(size, size, densities[-1], frames, scale, seed))
+        results.extend(bench_history(size, size, densities[-1], history_steps, seed))
+    return {
+        "engine_version": ENGINE_VERSION,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+
+
+def save_results(path, report):
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def _case_key(result):
+    return tuple(result.get(field) for field in CASE_FIELDS) + (result["metric"],)
+
+
+# casos que pioraram mais que `threshold` (fração) em relação a `baseline`:
+# lista de (resultado atual, valor anterior, variação relativa)
+def compare_results(report, baseline, threshold=0.2):
+    previous = {_case_key(r): r["value"] for r in baseline["results"]}
+    regressions = []
+    for result in report["results"]:
+        old = previous.get(_case_key(result))
+        if not old:
+            continue
+        change = (result["value"] - old) / old
+        worse = -change if result["higher_is_better"] else change
+        if worse > threshold:
+            regressions.append((result, old, change))
+    return regressions
+
+
+def format_result(result):
+    case = " ".join(
+        f"{field}={result[field]}" for field in CASE_FIELDS[1:] if result.get(field) is not None
+    )
+    return f"{result['name']:<16} {case:<42} {result['metric']:<16} {result['value']:,.1f}"
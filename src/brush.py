@@ -0,0 +1,75 @@
+import numpy as np
+
+
+# ============================================
+# Ferramentas de pintura (sem dependência de Qt)
+# ============================================
+# Cada ferramenta vira uma máscara booleana sobre uma janela da grade:
+# (r0, c0, máscara), já cortada nas bordas. O traço inteiro é aplicado de uma
+# vez por SEIRDSimulation.paint_mask. Pontos são (linha, coluna) de células.
+#   "brush"  traço livre: células a até `radius` (+ meia célula) do caminho
+#   "line"   segmento entre o clique e a soltura, com a mesma espessura
+#   "rect"   retângulo cheio entre o clique e a soltura
+#   "spray"  como o pincel, mas só uma fração `density` das células
+TOOLS = ("brush", "line", "rect", "spray")
+
+
+# janela [r0, r1) x [c0, c1) cortada na grade, ou None se ficar vazia
+def _clip(r0, c0, r1, c1, shape):
+    r0, c0 = max(r0, 0), max(c0, 0)
+    r1, c1 = min(r1, shape[0]), min(c1, shape[1])
+    if r0 >= r1 or c0 >= c1:
+        return None
+    return r0, c0, r1, c1
+
+
+# células a distância <= radius + 0.5 do segmento a-b (raio 0: linha de 1
+# célula; a == b: um disco). O traço livre é a união dos segmentos entre as
+# posições sucessivas do mouse.
+def segment_mask(a, b, radius, shape):
+    window = _clip(min(a[0], b[0]) - radius, min(a[1], b[1]) - radius,
+                   max(a[0], b[0]) + radius + 1, max(a[1], b[1]) + radius + 1, shape)
+    if window is None:
+        return None
+    r0, c0, r1, c1 = window
+    pr = np.arange(r0, r1, dtype=np.float64)[:, None] - a[0]
+    pc = np.arange(c0, c1, dtype=np.float64)[None, :] - a[1]
+    dr, dc = b[0] - a[0], b[1] - a[1]
+    length2 = dr * dr + dc * dc
+    if length2:
+        t = np.clip((pr * dr + pc * dc) / length2, 0.0, 1.0)
+        pr = pr - t * dr
+        pc = pc - t * dc
+    return r0, c0, pr * pr + pc * pc <= (radius + 0.5) ** 2
+
+
+def rect_mask(a, b, shape):
+    window = _clip(min(a[0], b[0]), min(a[1], b[1]), max(a[0], b[0]) + 1, max(a[1], b[1]) + 1, shape)
+    if window is None:
+        return None
+    r0, c0, r1, c1 = window
+    return r0, c0, np.ones((r1 - r0, c1 - c0), dtype=bool)
+
+
+# só uma fração `density` das células marcadas (sorteio de `rng`)
+def spray(piece, density, rng):
+    if piece is None:
+        return None
+    r0, c0, mask = piece
+    return r0, c0, mask & (rng.random(mask.shape) < density)
+
+
+# une máscaras (r0, c0, máscara) numa só, na janela que cobre todas
+def merge_masks(pieces):
+    if not pieces:
+        return None
+    if len(pieces) == 1:
+        return pieces[0]
+    r0 = min(p[0] for p in pieces)
+    c0 = min(p[1] for p in pieces)
+    r1 = max(p[0] + p[2].shape[0] for p in pieces)
+    c1 = max(p[1] + p[2].shape[1] for p in pieces)
+    mask = np.zeros((r1 - r0, c1 - c0), dtype=bool)
+    for pr, pc, piece in pieces:
+        mask[pr - r0:pr - r0 + piece.shape[0], pc - c0:pc - c0 + piece.shape[1]] |= piece
+    return r0, c0, mask
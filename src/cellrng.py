@@ -0,0 +1,93 @@
+import numpy as np
+
+
+# ============================================
+# Gerador aleatório por contador (o mesmo sorteio em qualquer motor)
+# ============================================
+# Cada sorteio é uma função pura de (chave, geração, propósito, célula): a
+# chave sai da semente, e (geração, propósito) viram uma base de 64 bits que
+# é somada ao índice linear da célula (multiplicado pela razão áurea) e
+# embaralhada pelo finalizador do SplitMix64. Não há estado que avance: o
+# sorteio de uma célula não depende de quantas outras foram sorteadas antes
+# nem em que ordem, então o passo denso, o esparso e as faixas em vários
+# processos produzem a mesma trajetória para a mesma semente. Os 32 bits
+# altos de cada resultado são comparados com os limiares uint32 do motor.
+
+# propósitos dos sorteios de uma geração
+DRAW_CONTACT = 0    # S -> E (suscetíveis) e I -> D (infectados)
+DRAW_RECOVERY = 1   # I -> R ao fim do período
+DRAW_SWAP = 2       # troca de lugar (âncoras do emparelhamento)
+DRAW_PAIRING = 3    # direção e paridade do emparelhamento da geração
+N_PURPOSES = 4
+
+# sorteio que nunca fica abaixo de um limiar (células sem sorteio)
+NEVER = np.uint32(0xFFFFFFFF)
+
+_MASK64 = (1 << 64) - 1
+_GOLDEN = 0x9E3779B97F4A7C15
+_M1 = 0xBF58476D1CE4E5B9
+_M2 = 0x94D049BB133111EB
+
+
+def _mix64(z):
+    z = (z ^ (z >> 30)) * _M1 & _MASK64
+    z = (z ^ (z >> 27)) * _M2 & _MASK64
+    return z ^ (z >> 31)
+
+
+# mesmo finalizador sobre um array uint64 (no lugar, com um temporário)
+def _mix64_array(z):
+    t = np.right_shift(z, np.uint64(30))
+    z ^= t
+    z *= np.uint64(_M1)
+    np.right_shift(z, np.uint64(27), out=t)
+    z ^= t
+    z *= np.uint64(_M2)
+    np.right_shift(z, np.uint64(31), out=t)
+    z ^= t
+    np.right_shift(z, np.uint64(32), out=t)
+    return t.astype(np.uint32)
+
+
+class CellRNG:
+    # `seed`: None (entropia do sistema), inteiro, SeedSequence ou outro CellRNG
+    def __init__(self, seed=None):
+        if isinstance(seed, CellRNG):
+            self.key = seed.key
+        else:
+            if not isinstance(seed, np.random.SeedSequence):
+                seed = np.random.SeedSequence(seed)
+            self.key = int(seed.generate_state(1, np.uint64)[0])
+
+    @classmethod
+    def from_key(cls, key):
+        rng = cls.__new__(cls)
+        rng.key = int(key) & _MASK64
+        return rng
+
+    def __repr__(self):
+        return f"CellRNG(key={self.key:#018x})"
+
+    def _base(self, generation, purpose):
+        return _mix64(self.key ^ _mix64((int(generation) * N_PURPOSES + purpose) & _MASK64))
+
+    # sorteios uint32 das células de índices lineares `cells`
+    def cells(self, generation, purpose, cells):
+        z = np.array(cells, dtype=np.uint64)
+        z *= np.uint64(_GOLDEN)
+        z += np.uint64(self._base(generation, purpose))
+        return _mix64_array(z)
+
+    # grade de sorteios do formato de `mask`: sorteia só onde `mask` é
+    # verdadeira e devolve NEVER no resto. `row0` é a linha da grade inteira
+    # em que `mask` começa (faixas de um motor multiprocesso).
+    def masked(self, generation, purpose, mask, row0=0):
+        out = np.full(mask.shape, NEVER, dtype=np.uint32)
+        cells = np.flatnonzero(mask)
+        out.reshape(-1)[cells] = self.cells(generation, purpose, cells + row0 * mask.shape[1])
+        return out
+
+    # inteiro uniforme em [0, n) da geração (um sorteio só)
+    def integer(self, generation, purpose, n):
+        u = int(self.cells(generation, purpose, [0])[0])
+        return u * n >> 32
@@ -0,0 +1,207 @@
+from cellrng import CellRNG
+from life import LifeRule, make_life_engine
+from seird import DEFAULT_PARAMS, ENGINE_VERSION, SEIRDSimulation, check_param
+from series import SeriesBuffer
+import json
+import numpy as np
+
+
+# ============================================
+# Checkpoints: estado completo da simulação em um arquivo binário
+# ============================================
+# Arquivo `.seirdckpt`:
+#   assinatura, versão e tamanho dos metadados (16 bytes)
+#   metadados em JSON: grade, geração, parâmetros, modo Vida, estado do
+#   gerador aleatório e chave do gerador por contador, contagens e a tabela de seções (deslocamento, bytes)
+#   seções binárias alinhadas em ALIGN bytes:
+#     "states"  estados empacotados em 4 bits (2 células por byte)
+#     "timers"  1 byte por célula
+#     "series"  int64 (gerações x 8), `sim.series.array`
+#     "history" payloads comprimidos do histórico, na ordem (opcional)
+#     "plane"   int64 (células x 2), as vivas do plano infinito do HashLife
+#               relativas ao canto da janela (só no modo Vida com HashLife)
+# Os arrays são gravados direto do buffer (sem tobytes/pickle) e lidos de uma
+# só vez num bytearray; cada seção é copiada para fora dele, para que o
+# buffer (com o histórico) possa ser liberado.
+
+MAGIC = b"SEIRDCKP"
+VERSION = 1
+ALIGN = 64
+EXTENSION = ".seirdckpt"
+
+
+def _aligned(n):
+    return (n + ALIGN - 1) // ALIGN * ALIGN
+
+
+# 2 estados (0..15) por byte: célula par no nibble baixo, ímpar no alto
+def pack_nibbles(states):
+    flat = states.reshape(-1)
+    if flat.size % 2:
+        flat = np.append(flat, np.uint8(0))
+    return flat[0::2] | (flat[1::2] << 4)
+
+
+def unpack_nibbles(packed, shape):
+    n = shape[0] * shape[1]
+    out = np.empty(packed.size * 2, dtype=np.uint8)
+    out[0::2] = packed & 15
+    out[1::2] = packed >> 4
+    return out[:n].reshape(shape)
+
+
+# Grava o estado de `sim` em `path` e devolve o tamanho do arquivo.
+# Com include_history=False o desfazer não é salvo (arquivo bem menor).
+# No modo Vida com HashLife o plano inteiro é salvo (as células fora da janela
+# continuam a trajetória ao retomar).
+def save_checkpoint(sim, path, include_history=True):
+    series = np.ascontiguousarray(sim.series.array)
+    sections = [
+        ("states", pack_nibbles(sim.data_matrix)),
+        ("timers", np.ascontiguousarray(sim.timers, dtype=np.uint8).reshape(-1)),
+        ("series", series),
+    ]
+    # sem motor criado, a janela ainda é o plano inteiro
+    if sim.life_rule is not None and sim._life is not None and sim.life_engine == "hashlife":
+        sections.append(("plane", sim._life.live_cells()))
+    history = None
+    if include_history:
+        entries = sim.history.entries()
+        history = {
+            "max_bytes": sim.history.max_bytes,
+            "keyframe_interval": sim.history.keyframe_interval,
+            "entries": [[kind, len(payload), list(shape), edit] for kind, payload, shape, edit in entries],
+        }
+        sections.append(("history", [payload for _, payload, _, _ in entries]))
+
+    table = {}
+    offset = 0
+    for name, data in sections:
+        nbytes = sum(len(p) for p in data) if isinstance(data, list) else data.nbytes
+        table[name] = [offset, nbytes]
+        offset = _aligned(offset + nbytes)
+
+    meta = {
+        "engine_version": ENGINE_VERSION,
+        "rows": sim.rows,
+        "cols": sim.cols,
+        "generation": sim.generation,
+        "params": sim.params(),
+        "update_mode": sim.update_mode,
+        "life": None if sim.life_rule is None else {
+            "rule": sim.life_rule.notation, "engine": sim.life_engine, "jump": sim.life_jump,
+        },
+        "rng": sim.rng.bit_generator.state,
+        "cell_rng": sim.cell_rng.key,
+        "counts": [int(n) for n in sim.counts],
+        "series_columns": int(series.shape[1]),
+        "history": history,
+        "sections": table,
+    }
+    raw_meta = json.dumps(meta).encode()
+    head = MAGIC + np.array([VERSION, len(raw_meta)], dtype="<u4").tobytes() + raw_meta
+    data_start = _aligned(len(head))
+
+    with open(path, "wb") as f:
+        f.write(head.ljust(data_start, b"\0"))
+        position = 0
+        for name, data in sections:
+            start = table[name][0]
+            f.write(b"\0" * (start - position))
+            if isinstance(data, list):
+                for payload in data:
+                    f.write(payload)
+            else:
+                f.write(memoryview(data).cast("B"))
+            position = start + table[name][1]
+    return data_start + position
+
+
+# metadados de um checkpoint (sem ler as seções)
+def read_checkpoint_metadata(path):
+    with open(path, "rb") as f:
+        meta, _ = _read_header(f, path)
+    return meta
+
+
+def _read_header(f, path):
+    head = f.read(16)
+    if head[:8] != MAGIC:
+        raise ValueError(f"{path} não é um checkpoint SEIRD")
+    version, meta_len = np.frombuffer(head, dtype="<u4", count=2, offset=8)
+    if version != VERSION:
+        raise ValueError(f"versão de checkpoint não suportada: {version}")
+    meta = json.loads(f.read(int(meta_len)).decode())
+    return meta, _aligned(16 + int(meta_len))
+
+
+# Restaura um checkpoint em `sim` (ou numa nova SEIRDSimulation) e devolve a
+# simulação. A grade passa a ter o tamanho salvo; gravações em andamento não
+# são tocadas.
+def load_checkpoint(path, sim=None):
+    with open(path, "rb") as f:
+        meta, data_start = _read_header(f, path)
+        f.seek(data_start)
+        size = max((start + nbytes for start, nbytes in meta["sections"].values()), default=0)
+        buf = bytearray(size)
+        if f.readinto(buf) != size:
+            raise ValueError(f"{path} está truncado")
+
+    for name, value in meta["params"].items():
+        if name in DEFAULT_PARAMS:
+            check_param(name, value)
+    rows, cols = meta["rows"], meta["cols"]
+
+    def section(name, dtype=np.uint8):
+        start, nbytes = meta["sections"][name]
+        return np.frombuffer(buf, dtype=dtype, count=nbytes // np.dtype(dtype).itemsize, offset=start)
+
+    if sim is None:
+        # grade mínima: tudo abaixo é substituído (evita alocar e contar a
+        # grade inteira duas vezes)
+        sim = SEIRDSimulation(1, 1)
+    sim.rows, sim.cols = rows, cols
+    for name, value in meta["params"].items():
+        if name in DEFAULT_PARAMS:
+            setattr(sim, name, value)
+    sim.update_mode = meta["update_mode"]
+    life = meta["life"]
+    sim.life_rule = LifeRule(life["rule"]) if life else None
+    if life:
+        sim.life_engine = life["engine"]
+        sim.life_jump = life["jump"]
+
+    state = meta["rng"]
+    if type(sim.rng.bit_generator).__name__ != state["bit_generator"]:
+        sim.rng = np.random.Generator(getattr(np.random, state["bit_generator"])())
+    sim.rng.bit_generator.state = state
+    # checkpoints anteriores ao gerador por contador mantêm o da simulação
+    if "cell_rng" in meta:
+        sim.cell_rng = CellRNG.from_key(meta["cell_rng"])
+
+    sim.data_matrix = unpack_nibbles(section("states"), (rows, cols))
+    # cópia: uma janela sobre o buffer manteria o arquivo inteiro na memória
+    sim.timers = section("timers").reshape(rows, cols).copy()
+    sim.counts = np.array(meta["counts"], dtype=np.int64)
+    sim.generation = meta["generation"]
+    sim.series = SeriesBuffer(section("series", np.int64), meta["series_columns"])
+
+    sim.history.clear()
+    history = meta["history"]
+    if history is not None:
+        sim.history.max_bytes = history["max_bytes"]
+        sim.history.keyframe_interval = history["keyframe_interval"]
+        start = meta["sections"]["history"][0]
+        entries = []
+        # (checkpoints mais antigos não marcam as entradas de edição)
+        for kind, nbytes, shape, *edit in history["entries"]:
+            entries.append((kind, bytes(buf[start:start + nbytes]), tuple(shape), bool(edit and edit[0])))
+            start += nbytes
+        sim.history.restore(entries)
+
+    sim._grid_edited()
+    if "plane" in meta["sections"]:
+        sim._life = make_life_engine(sim.data_matrix, sim.life_rule, sim.life_engine)
+        sim._life.load_cells(section("plane", np.int64).reshape(-1, 2))
+    sim._changed()
+    return sim
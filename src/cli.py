@@ -0,0 +1,445 @@
+from cellrng import CellRNG
+from seird import DEFAULT_PARAMS, SEIRDSimulation, check_param
+from export import export_gif
+import argparse
+import csv
+import numpy as np
+import os
+import sys
+import time
+
+
+# ============================================
+# Linha de comando (sem interface gráfica / sem Qt)
+# ============================================
+# conversão de um parâmetro na linha de comando, com a faixa de check_param
+def param_type(name):
+    kind = type(DEFAULT_PARAMS[name])
+
+    def parse(text):
+        try:
+            value = kind(text)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"valor inválido para {name}: {text!r}")
+        try:
+            return check_param(name, value)
+        except ValueError as exc:
+            raise argparse.ArgumentTypeError(str(exc))
+    return parse
+
+
+# parâmetros epidemiológicos comuns a todos os subcomandos
+def add_param_arguments(parser):
+    parser.add_argument("--rows", type=int, default=40, help="linhas da grade")
+    parser.add_argument("--cols", type=int, default=60, help="colunas da grade")
+    # None = não informado: vale o padrão (ou o valor salvo no --checkpoint)
+    for name, value in DEFAULT_PARAMS.items():
+        parser.add_argument(
+            "--" + name.replace("_", "-"), type=param_type(name), default=None,
+            help=f"padrão: {value}",
+        )
+    parser.add_argument("--infected", type=int, default=None,
+                        help="infectados iniciais em posições aleatórias (padrão: 10, ou 0 com --checkpoint)")
+    parser.add_argument("--seed", type=int, default=None, help="semente do gerador aleatório")
+    parser.add_argument("--checkpoint", default=None,
+                        help="parte de um checkpoint .seirdckpt (grade, parâmetros e gerador; --rows/--cols ignorados)")
+
+
+# cria a simulação descrita pelos argumentos; com --checkpoint, a grade e os
+# parâmetros salvos são o ponto de partida e --seed (se dado) troca o gerador,
+# para espalhar várias execuções a partir da mesma condição inicial
+def build_simulation(args):
+    if args.checkpoint:
+        from checkpoint import load_checkpoint
+
+        sim = load_checkpoint(args.checkpoint)
+        if args.seed is not None:
+            sim.rng = np.random.default_rng(args.seed)
+            sim.cell_rng = CellRNG(args.seed)
+        infected = args.infected or 0
+    else:
+        sim = SEIRDSimulation(args.rows, args.cols, seed=args.seed)
+        infected = 10 if args.infected is None else args.infected
+    for name in DEFAULT_PARAMS:
+        value = getattr(args, name)
+        if value is not None:
+            setattr(sim, name, value)
+    sim.randomize_infected(infected)
+    return sim
+
+
+def cmd_gif(args):
+    sim = build_simulation(args)
+    folder = os.path.dirname(os.path.abspath(args.output))
+    if not os.path.exists(folder):
+        os.makedirs(folder)
+    export_gif(sim, args.output, args.generations, scale=args.scale, duration=args.duration)
+    print(f"GIF salvo como {args.output}")
+
+
+def cmd_ensemble(args):
+    from ensemble import run_ensemble, save_ensemble
+
+    sim = build_simulation(args)
+    start = time.perf_counter()
+    result = run_ensemble(
+        sim.data_matrix, sim.timers, sim.params(), args.generations, args.replicates,
+        seed=args.seed, workers=args.workers,
+    )
+    elapsed = time.perf_counter() - start
+    save_ensemble(args.output, result)
+
+    rates = result["attack_rate"]
+    q05, q50, q95 = (float(x) for x in np.quantile(rates, [0.05, 0.5, 0.95]))
+    print(f"{args.replicates} réplicas x {args.generations} gerações em {elapsed:.2f}s")
+    print(f"taxa de ataque: média {rates.mean():.3f}, mediana {q50:.3f}, 90% [{q05:.3f}, {q95:.3f}]")
+    print(f"resultados salvos em {args.output}")
+
+
+def cmd_run(args):
+    from seird import state_counts
+    from tiled import TiledSimulation
+
+    sim = build_simulation(args)
+    # o motor em faixas só conhece as regras SEIRD
+    if sim.life_rule is not None:
+        args.error(f"{args.checkpoint} está no modo Vida ({sim.life_rule.notation}): run só simula SEIRD "
+                   f"(retome-o com app.py --checkpoint)")
+    recorder = None
+    if args.record:
+        from recording import RecordingWriter
+
+        recorder = RecordingWriter(args.record, sim.rows, sim.cols, metadata={"params": sim.params(), "seed": args.seed})
+        recorder.append(sim.data_matrix, sim.timers)
+    with TiledSimulation(sim.data_matrix, sim.timers, sim.params(), workers=args.workers,
+                         seed=sim.cell_rng, generation=sim.generation) as tiled:
+        start = time.perf_counter()
+        if recorder is None:
+            tiled.step(args.generations)
+        else:
+            for _ in range(args.generations):
+                tiled.step()
+                recorder.append(tiled.states, tiled.timers)
+            recorder.close()
+        elapsed = time.perf_counter() - start
+        counts = state_counts(tiled.states)
+        if args.output:
+            np.savez_compressed(args.output, states=tiled.states, timers=tiled.timers)
+        workers = tiled.workers
+
+    cells = sim.rows * sim.cols * args.generations
+    print(f"{args.generations} gerações de {sim.rows}x{sim.cols} em {elapsed:.2f}s "
+          f"({workers} processos, {cells / max(elapsed, 1e-9) / 1e6:.1f} M células/s)")
+    print("S/E/I/R/D finais: " + " ".join(str(int(n)) for n in counts))
+    if args.output:
+        print(f"grade final salva em {args.output}")
+    if args.record:
+        print(f"gravação salva em {args.record}")
+
+
+def cmd_replay(args):
+    from recording import Recording
+
+    rec = Recording(args.recording)
+    print(f"{args.recording}: {len(rec)} gerações de {rec.shape[0]}x{rec.shape[1]}")
+    if args.stats:
+        with open(args.stats, "w", newline="") as fp:
+            writer = csv.writer(fp)
+            writer.writerow(["generation", "S", "E", "I", "R", "D"])
+            for entry in rec.index:
+                writer.writerow([int(entry["generation"])] + [int(n) for n in entry["counts"]])
+        print(f"séries S/E/I/R/D salvas em {args.stats}")
+    if args.gif:
+        from export import export_recording_gif
+
+        try:
+            export_recording_gif(rec, args.gif, start=args.start, stop=args.stop, scale=args.scale,
+                                 duration=args.duration)
+        except ValueError as exc:
+            args.error(str(exc))
+        print(f"GIF salvo como {args.gif}")
+
+
+# "p_infection=0.1,0.2,0.3" -> ("p_infection", ["0.1", "0.2", "0.3"])
+def parse_assignment(text):
+    name, _, values = text.partition("=")
+    name = name.strip().replace("-", "_")
+    if name not in DEFAULT_PARAMS or not values:
+        raise argparse.ArgumentTypeError(f"esperado parametro=valores, recebido {text!r}")
+    return name, values
+
+
+# "incubation_period=1:5" -> ("incubation_period", (1, 5)); só parâmetros numéricos
+def parse_range(text):
+    name, values = parse_assignment(text)
+    kind = type(DEFAULT_PARAMS[name])
+    low, _, high = values.partition(":")
+    if kind not in (int, float):
+        raise argparse.ArgumentTypeError(f"{name} não é numérico, use --grid {name}=...")
+    try:
+        low, high = kind(low), kind(high)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"esperado {name}=MIN:MAX, recebido {text!r}")
+    try:
+        return name, (check_param(name, low), check_param(name, high))
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc))
+
+
+def cmd_sweep(args):
+    from sweep import grid_points, random_points, run_sweep, save_sweep_csv
+
+    # a grade inicial entra na chave do cache: sem semente explícita usa 0,
+    # para que varreduras repetidas reaproveitem os resultados
+    if args.seed is None:
+        args.seed = 0
+    sim = build_simulation(args)
+    # parâmetros fora da varredura: os da linha de comando / do checkpoint
+    base = sim.params()
+
+    points = []
+    if args.grid:
+        try:
+            points += grid_points({name: values.split(",") for name, values in args.grid}, base)
+        except ValueError as exc:
+            args.error(str(exc))
+    if args.sample:
+        points += random_points(dict(args.sample), args.samples, seed=args.seed, base=base)
+    if not points:
+        points = grid_points({}, base)
+
+    start = time.perf_counter()
+    records = run_sweep(
+        sim.data_matrix, sim.timers, points, args.generations,
+        replicates=args.replicates, seed=args.seed,
+        cache_dir=args.cache_dir, workers=args.workers,
+    )
+    elapsed = time.perf_counter() - start
+    save_sweep_csv(args.output, records)
+    cached = sum(r["cached"] for r in records)
+    print(f"{len(records)} execuções ({cached} do cache, {len(records) - cached} calculadas) em {elapsed:.2f}s")
+    print(f"resumo salvo em {args.output}")
+
+
+def parse_list(kind):
+    def parse(text):
+        try:
+            return [kind(v) for v in text.split(",") if v]
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"lista inválida: {text!r}")
+    return parse
+
+
+def positive_int(text):
+    try:
+        value = int(text)
+    except ValueError:
+        value = 0
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"esperado inteiro >= 1, recebido {text!r}")
+    return value
+
+
+def cmd_bench(args):
+    from bench import compare_results, format_result, load_results, run_benchmarks, save_results
+
+    report = run_benchmarks(
+        sizes=args.sizes, densities=args.densities, generations=args.generations,
+        frames=args.frames, scale=args.scale, history_steps=args.history_steps,
+        progress=lambda msg: print(msg, file=sys.stderr),
+    )
+    for result in report["results"]:
+        print(format_result(result))
+    if args.output:
+        save_results(args.output, report)
+        print(f"resultados salvos em {args.output}")
+    if args.baseline:
+        regressions = compare_results(report, load_results(args.baseline), args.threshold)
+        for result, old, change in regressions:
+            print(f"REGRESSÃO {format_result(result)} (antes {old:,.1f}, {change:+.0%})")
+        if regressions:
+            return 1
+        print(f"nenhuma regressão acima de {args.threshold:.0%} em relação a {args.baseline}")
+    return 0
+
+
+def cmd_profile(args):
+    from instrument import format_snapshot, metrics, profile_calls
+
+    sim = build_simulation(args)
+    summary = profile_calls(sim.next_generation, args.generations, args.output, top=args.top, sort=args.sort)
+    print(summary)
+    print(format_snapshot(metrics.snapshot()))
+    print(f"perfil de {args.generations} gerações salvo em {args.output}")
+
+
+# simula N gerações (0 = só o cenário inicial) e salva um checkpoint
+def cmd_checkpoint(args):
+    from checkpoint import save_checkpoint
+
+    sim = build_simulation(args)
+    for _ in range(args.generations):
+        sim.next_generation()
+    start = time.perf_counter()
+    size = save_checkpoint(sim, args.output, include_history=not args.no_history)
+    elapsed = time.perf_counter() - start
+    print(f"checkpoint da geração {sim.generation} ({sim.rows}x{sim.cols}) salvo em {args.output}: "
+          f"{size / 1e6:.1f} MB em {elapsed * 1000:.0f} ms")
+
+
+# Jogo da Vida: padrão RLE centralizado (ou sopa aleatória) numa janela
+# rows x cols; no HashLife o plano é infinito e a janela é só o que aparece no GIF
+def cmd_life(args):
+    from export import export_life_gif
+    from life import LifeRule, load_rle, make_life_engine
+
+    rule = LifeRule(args.rule) if args.rule else None
+    if args.pattern:
+        pattern, pattern_rule = load_rle(args.pattern)
+        rule = rule or pattern_rule
+        cells = np.zeros((args.rows, args.cols), dtype=np.uint8)
+        h, w = min(pattern.shape[0], args.rows), min(pattern.shape[1], args.cols)
+        r0, c0 = (args.rows - h) // 2, (args.cols - w) // 2
+        cells[r0:r0 + h, c0:c0 + w] = pattern[:h, :w]
+    else:
+        rng = np.random.default_rng(args.seed)
+        cells = (rng.random((args.rows, args.cols)) < args.density).astype(np.uint8)
+    rule = rule or LifeRule("B3/S23")
+
+    if args.gif:
+        start = time.perf_counter()
+        export_life_gif(cells, rule, args.gif, args.generations // args.step + 1, step=args.step,
+                        engine=args.engine, scale=args.scale, duration=args.duration)
+        print(f"GIF salvo como {args.gif} ({time.perf_counter() - start:.2f}s)")
+        return 0
+
+    life = make_life_engine(cells, rule, args.engine)
+    population = life.population
+    start = time.perf_counter()
+    life.step(args.generations)
+    elapsed = time.perf_counter() - start
+    print(f"{rule.notation}, motor {args.engine}: {args.generations} gerações em {elapsed:.3f}s")
+    print(f"população: {population} -> {life.population}")
+    if args.output:
+        np.save(args.output, life.cells)
+        print(f"janela final salva em {args.output}")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="cli.py",
+        description="ConwayStudio — simulação SEIRD sem interface gráfica",
+    )
+    parser.add_argument("--metrics-log", default=None,
+                        help="grava cada medida de desempenho (por fase) neste arquivo, em JSON lines")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    gif = sub.add_parser("gif", help="simula N gerações e exporta um GIF")
+    add_param_arguments(gif)
+    gif.add_argument("--generations", type=int, default=100, help="gerações no GIF")
+    gif.add_argument("--scale", type=int, default=3, help="pixels por célula")
+    gif.add_argument("--duration", type=int, default=120, help="ms por quadro")
+    gif.add_argument("-o", "--output", required=True, help="caminho do GIF")
+    gif.set_defaults(func=cmd_gif)
+
+    run = sub.add_parser("run", help="simula uma grade grande dividida em faixas entre vários processos")
+    add_param_arguments(run)
+    run.add_argument("--generations", type=int, default=100, help="gerações a simular")
+    run.add_argument("--workers", type=int, default=None, help="processos/faixas (padrão: todos os núcleos)")
+    run.add_argument("-o", "--output", default=None, help="arquivo .npz para a grade final (opcional)")
+    run.add_argument("--record", default=None, help="grava todas as gerações neste arquivo .seirdrec")
+    run.set_defaults(func=cmd_run, error=run.error)
+
+    rep = sub.add_parser("replay", help="gera GIF ou estatísticas de uma gravação, sem simular de novo")
+    rep.add_argument("recording", help="arquivo .seirdrec")
+    rep.add_argument("--gif", default=None, help="GIF de saída")
+    rep.add_argument("--start", type=int, default=0, help="primeira geração do GIF")
+    rep.add_argument("--stop", type=int, default=None, help="geração final do GIF (exclusiva)")
+    rep.add_argument("--scale", type=int, default=3, help="pixels por célula")
+    rep.add_argument("--duration", type=int, default=120, help="ms por quadro")
+    rep.add_argument("--stats", default=None, help="CSV com as contagens S/E/I/R/D por geração")
+    rep.set_defaults(func=cmd_replay, error=rep.error)
+
+    ens = sub.add_parser("ensemble", help="roda N réplicas independentes em paralelo e agrega as séries S/E/I/R/D")
+    add_param_arguments(ens)
+    ens.add_argument("--generations", type=int, default=100, help="gerações por réplica")
+    ens.add_argument("--replicates", type=int, default=100, help="número de réplicas")
+    ens.add_argument("--workers", type=int, default=None, help="processos (padrão: todos os núcleos)")
+    ens.add_argument("-o", "--output", required=True, help="arquivo .npz de saída")
+    ens.set_defaults(func=cmd_ensemble)
+
+    sw = sub.add_parser("sweep", help="varre parâmetros em paralelo, com cache em disco por execução")
+    add_param_arguments(sw)
+    sw.add_argument("--grid", type=parse_assignment, action="append", default=[],
+                    metavar="PARAM=V1,V2,...", help="valores de uma dimensão da grade (repetível)")
+    sw.add_argument("--sample", type=parse_range, action="append", default=[],
+                    metavar="PARAM=MIN:MAX", help="intervalo para amostragem aleatória (repetível)")
+    sw.add_argument("--samples", type=int, default=20, help="pontos sorteados com --sample")
+    sw.add_argument("--generations", type=int, default=100, help="gerações por execução")
+    sw.add_argument("--replicates", type=int, default=1, help="sementes por ponto")
+    sw.add_argument("--workers", type=int, default=None, help="processos (padrão: todos os núcleos)")
+    sw.add_argument("--cache-dir", default=".sweep_cache", help="pasta do cache de resultados")
+    sw.add_argument("-o", "--output", required=True, help="tabela CSV de saída")
+    sw.set_defaults(func=cmd_sweep, error=sw.error)
+
+    bn = sub.add_parser("bench", help="mede passo, desenho, codificação GIF e memória do histórico")
+    bn.add_argument("--sizes", type=parse_list(int), default=[100, 500, 1000], help="lados das grades (ex.: 100,500)")
+    bn.add_argument("--densities", type=parse_list(float), default=[0.001, 0.01, 0.1],
+                    help="frações iniciais de infectados")
+    bn.add_argument("--generations", type=int, default=20, help="gerações por medida de passo")
+    bn.add_argument("--frames", type=int, default=20, help="quadros desenhados/codificados")
+    bn.add_argument("--scale", type=int, default=2, help="pixels por célula nos quadros")
+    bn.add_argument("--history-steps", type=int, default=100, help="gerações guardadas no histórico")
+    bn.add_argument("-o", "--output", default=None, help="arquivo JSON com os resultados")
+    bn.add_argument("--baseline", default=None, help="JSON de uma execução anterior para comparar")
+    bn.add_argument("--threshold", type=float, default=0.2,
+                    help="piora relativa tolerada antes de falhar (padrão: 0.2)")
+    bn.set_defaults(func=cmd_bench)
+
+    pf = sub.add_parser("profile", help="roda N gerações sob o cProfile e salva as estatísticas")
+    add_param_arguments(pf)
+    pf.add_argument("--generations", type=int, default=100, help="gerações perfiladas")
+    pf.add_argument("--top", type=int, default=20, help="funções listadas no resumo")
+    pf.add_argument("--sort", default="cumulative", help="ordem do resumo (cumulative, tottime, ...)")
+    pf.add_argument("-o", "--output", default="perfil.prof", help="arquivo de estatísticas (pstats)")
+    pf.set_defaults(func=cmd_profile)
+
+    ck = sub.add_parser("checkpoint", help="salva o estado completo (grade, parâmetros, gerador) para retomar depois")
+    add_param_arguments(ck)
+    ck.add_argument("--generations", type=int, default=0, help="gerações simuladas antes de salvar")
+    ck.add_argument("--no-history", action="store_true", help="não salva o histórico de desfazer")
+    ck.add_argument("-o", "--output", required=True, help="arquivo .seirdckpt")
+    ck.set_defaults(func=cmd_checkpoint)
+
+    lf = sub.add_parser("life", help="Jogo da Vida (regras B/S) com motor de bits ou HashLife")
+    lf.add_argument("--pattern", default=None, help="padrão RLE (centralizado na janela)")
+    lf.add_argument("--density", type=float, default=0.3, help="densidade da sopa aleatória (sem --pattern)")
+    lf.add_argument("--rows", type=int, default=200, help="linhas da janela")
+    lf.add_argument("--cols", type=int, default=200, help="colunas da janela")
+    lf.add_argument("--rule", default=None, help="regra B/S ou nome (padrão: a do RLE, ou B3/S23)")
+    lf.add_argument("--engine", choices=("array", "bitpacked", "hashlife"), default="bitpacked",
+                    help="motor (hashlife: plano infinito, saltos enormes)")
+    lf.add_argument("--generations", type=int, default=1000, help="gerações a simular")
+    lf.add_argument("--step", type=positive_int, default=1, help="gerações entre quadros do GIF")
+    lf.add_argument("--gif", default=None, help="exporta um GIF em vez de só simular")
+    lf.add_argument("--scale", type=int, default=3, help="pixels por célula")
+    lf.add_argument("--duration", type=int, default=120, help="ms por quadro")
+    lf.add_argument("--seed", type=int, default=None, help="semente da sopa aleatória")
+    lf.add_argument("-o", "--output", default=None, help="arquivo .npy para a janela final (opcional)")
+    lf.set_defaults(func=cmd_life)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.metrics_log:
+        from instrument import metrics
+
+        metrics.log_to(args.metrics_log)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+from concurrent.futures import ProcessPoolExecutor
+from cellrng import CellRNG
+from seird import STATE_RGB, SUSCEPTIBLE, advance, apply_transitions, state_counts
+from types import SimpleNamespace
+import json
+import numpy as np
+import os
+
+
+# ============================================
+# Ensemble de Monte Carlo (várias réplicas em paralelo)
+# ============================================
+# Cada réplica parte da mesma grade inicial com um gerador independente
+# (SeedSequence.spawn) e devolve a série de contagens por estado. Os sorteios
+# são por contador (CellRNG): uma réplica dá o mesmo resultado em qualquer
+# motor e em qualquer processo.
+
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+N_STATES = len(STATE_RGB)
+
+# estado do processo trabalhador: a grade inicial é enviada uma única vez
+# por processo (initializer), não a cada réplica
+_worker_scenario = None
+
+
+def _init_worker(states, timers, params):
+    global _worker_scenario
+    _worker_scenario = (states, timers, SimpleNamespace(**params))
+
+
+# roda uma réplica e devolve as contagens (gerações + 1, 5) em uint32
+def simulate_counts(states, timers, params, generations, seed_seq):
+    rng = CellRNG(seed_seq)
+    # o passo esparso altera a grade no lugar: trabalha numa cópia
+    states = states.copy()
+    timers = timers.copy()
+    active = None
+    counts = np.empty((generations + 1, N_STATES), dtype=np.uint32)
+    current = state_counts(states)
+    counts[0] = current
+    stats = {}
+    for g in range(1, generations + 1):
+        states, timers, active, _ = advance(states, timers, params, rng, g - 1, active, stats=stats)
+        apply_transitions(current, stats)
+        counts[g] = current
+    return counts
+
+
+def _run_replicate(task):
+    generations, seed_seq = task
+    states, timers, params = _worker_scenario
+    return simulate_counts(states, timers, params, generations, seed_seq)
+
+
+# fração dos suscetíveis iniciais que deixaram S até o fim de cada réplica
+def attack_rates(counts):
+    s0 = counts[:, 0, SUSCEPTIBLE].astype(np.float64)
+    s_end = counts[:, -1, SUSCEPTIBLE].astype(np.float64)
+    return np.divide(s0 - s_end, s0, out=np.zeros_like(s0), where=s0 > 0)
+
+
+# média, quantis e distribuição da taxa de ataque de um conjunto de réplicas
+def summarize(counts):
+    return {
+        "mean": counts.mean(axis=0),
+        "quantile_levels": np.array(QUANTILES),
+        "quantiles": np.quantile(counts, QUANTILES, axis=0),
+        "attack_rate": attack_rates(counts),
+    }
+
+
+# Roda `replicates` réplicas de `generations` passos a partir de
+# (states, timers) com os parâmetros `params` (dict), usando `workers`
+# processos (padrão: todos os núcleos).
+def run_ensemble(states, timers, params, generations, replicates, seed=None, workers=None):
+    seeds = np.random.SeedSequence(seed).spawn(replicates)
+    workers = workers or os.cpu_count() or 1
+    tasks = [(generations, s) for s in seeds]
+    if workers == 1:
+        _init_worker(states, timers, params)
+        series = [_run_replicate(t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, replicates),
+            initializer=_init_worker,
+            initargs=(states, timers, params),
+        ) as pool:
+            series = list(pool.map(_run_replicate, tasks))
+    counts = np.stack(series)
+    result = summarize(counts)
+    result["counts"] = counts
+    result["params"] = dict(params)
+    result["seed_entropy"] = seeds[0].entropy if seeds else None
+    return result
+
+
+# grava o resultado em .npz comprimido: uma coluna (array) por campo
+def save_ensemble(path, result):
+    np.savez_compressed(
+        path,
+        counts=result["counts"],
+        mean=result["mean"],
+        quantile_levels=result["quantile_levels"],
+        quantiles=result["quantiles"],
+        attack_rate=result["attack_rate"],
+        params=np.array(json.dumps(result["params"])),
+        seed_entropy=np.array(str(result["seed_entropy"])),
+    )
+    return path
+
+
+def load_ensemble(path):
+    with np.load(path) as data:
+        result = {name: data[name] for name in data.files}
+    result["params"] = json.loads(str(result["params"]))
+    return result
@@ -0,0 +1,241 @@
+from PIL import GifImagePlugin, Image
+from instrument import metrics
+from life import LIFE_RGB, make_life_engine
+from queue import Empty, Full, Queue
+from seird import STATE_RGB, seird_step
+from threading import Event, Thread
+from types import SimpleNamespace
+import numpy as np
+import os
+
+
+# ============================================
+# Exportação de GIF (sem dependência de Qt)
+# ============================================
+# paleta fixa indexada pelo código do estado (mesma para todos os quadros)
+def make_palette(rgb):
+    return [channel for state in sorted(rgb) for channel in rgb[state]]
+
+
+PALETTE = make_palette(STATE_RGB)
+LIFE_PALETTE = make_palette(LIFE_RGB)
+
+
+# desenha um quadro em modo 'P' (paleta) com `scale` x `scale` pixels por célula:
+# o próprio array de estados vira o índice da paleta, ampliado por repetição
+def render_frame(states, scale, palette=PALETTE):
+    rows, cols = states.shape
+    pixels = np.broadcast_to(
+        states.reshape(rows, 1, cols, 1), (rows, scale, cols, scale)
+    ).reshape(rows * scale, cols * scale)
+    img = Image.frombuffer("P", (cols * scale, rows * scale), np.ascontiguousarray(pixels), "raw", "P", 0, 1)
+    img.putpalette(palette)
+    return img
+
+
+# cabeçalho do GIF (tela lógica, paleta global fixa e laço infinito)
+def gif_header(img, duration, loop=0):
+    header, _ = GifImagePlugin.getheader(img, info={"duration": duration, "loop": loop, "optimize": False})
+    return b"".join(header)
+
+
+# um quadro codificado (cabeçalho local + LZW), usando a paleta global
+def encode_frame(img, duration):
+    return b"".join(GifImagePlugin.getdata(img, duration=duration))
+
+
+# ============================================
+# Pipeline de exportação em estágios
+# ============================================
+# simula -> desenha -> codifica, cada estágio numa thread ligada à seguinte por
+# uma fila limitada; o chamador grava cada quadro no disco assim que fica
+# pronto. A memória não cresce com o número de gerações.
+_DONE = object()
+QUEUE_SIZE = 4
+
+
+class ExportCancelled(Exception):
+    pass
+
+
+# coloca `item` na fila sem travar para sempre se a exportação for cancelada
+def _put(queue, item, cancel):
+    while not cancel.is_set():
+        try:
+            queue.put(item, timeout=0.1)
+            return True
+        except Full:
+            pass
+    return False
+
+
+def _get(queue, cancel):
+    while not cancel.is_set():
+        try:
+            return queue.get(timeout=0.1)
+        except Empty:
+            pass
+    return _DONE
+
+
+def _run_stage(source, outbox, cancel, errors):
+    try:
+        for item in source:
+            if not _put(outbox, item, cancel):
+                return
+    except Exception as exc:
+        errors.append(exc)
+        cancel.set()
+        return
+    _put(outbox, _DONE, cancel)
+
+
+def _drain(inbox, cancel):
+    while True:
+        item = _get(inbox, cancel)
+        if item is _DONE:
+            return
+        yield item
+
+
+# Grava em GIF os `total` quadros produzidos por `source` (iterável de grades
+# de estados), passando pelos estágios fonte -> desenho -> codificação.
+# `progress(feitos, total)` é chamado a cada quadro gravado; se `cancel`
+# (threading.Event) for acionado, o arquivo parcial é apagado e
+# ExportCancelled é levantada.
+def write_gif(source, path, total, scale=4, duration=120, progress=None, cancel=None, palette=PALETTE):
+    cancel = cancel if cancel is not None else Event()
+    stop = Event()
+
+    def render(grids):
+        for states in grids:
+            with metrics.phase("gif_render", cells=states.size):
+                img = render_frame(states, scale, palette)
+            yield img
+
+    def encode(frames):
+        first = True
+        for img in frames:
+            with metrics.phase("gif_encode"):
+                chunk = encode_frame(img, duration)
+                if first:
+                    chunk = gif_header(img, duration) + chunk
+                    first = False
+            yield chunk
+
+    rendered = Queue(QUEUE_SIZE)
+    encoded = Queue(QUEUE_SIZE)
+    to_render = Queue(QUEUE_SIZE)
+    errors = []
+    stages = [
+        Thread(target=_run_stage, args=(source, to_render, stop, errors), daemon=True),
+        Thread(target=_run_stage, args=(render(_drain(to_render, stop)), rendered, stop, errors), daemon=True),
+        Thread(target=_run_stage, args=(encode(_drain(rendered, stop)), encoded, stop, errors), daemon=True),
+    ]
+    for stage in stages:
+        stage.start()
+
+    done = 0
+    try:
+        with open(path, "wb") as fp:
+            while True:
+                if cancel.is_set():
+                    stop.set()
+                chunk = _get(encoded, stop)
+                if chunk is _DONE:
+                    break
+                fp.write(chunk)
+                done += 1
+                if progress is not None:
+                    progress(done, total)
+            fp.write(b";")  # trailer
+    finally:
+        stop.set()
+        for stage in stages:
+            stage.join()
+
+    if errors:
+        os.remove(path)
+        raise errors[0]
+    if done < total:
+        os.remove(path)
+        raise ExportCancelled(path)
+    return path
+
+
+# Cópia de tudo o que a exportação lê de `sim` (grade, timers, parâmetros,
+# gerador por contador, geração e modo Vida). Quem avança o modelo em outra
+# thread tira a cópia sob a trava do modelo e exporta a partir dela.
+def gif_snapshot(sim):
+    return SimpleNamespace(
+        states=sim.data_matrix.copy(),
+        timers=sim.timers.copy(),
+        params=SimpleNamespace(**sim.params()),
+        rng=sim.cell_rng,
+        generation=sim.generation,
+        life_rule=sim.life_rule,
+        life_jump=sim.life_jump,
+        life_engine=sim.life_engine,
+    )
+
+
+# Simula `gen_count` gerações a partir do estado atual de `sim` e grava o GIF.
+# A simulação roda sobre uma cópia do estado com o gerador por contador de
+# `sim`: o GIF mostra o mesmo futuro que a interface produziria, e a grade e o
+# histórico de `sim` não mudam.
+def export_gif(sim, path, gen_count, scale=4, duration=120, progress=None, cancel=None):
+    return export_snapshot_gif(gif_snapshot(sim), path, gen_count, scale=scale, duration=duration,
+                               progress=progress, cancel=cancel)
+
+
+# o mesmo que export_gif, a partir de uma cópia feita por gif_snapshot
+def export_snapshot_gif(snapshot, path, gen_count, scale=4, duration=120, progress=None, cancel=None):
+    if snapshot.life_rule is not None:
+        return export_life_gif(
+            snapshot.states, snapshot.life_rule, path, gen_count, step=snapshot.life_jump,
+            engine=snapshot.life_engine, scale=scale, duration=duration, progress=progress, cancel=cancel,
+        )
+    states = snapshot.states
+    timers = snapshot.timers
+    params = snapshot.params
+    rng = snapshot.rng
+    generation = snapshot.generation
+
+    def simulate():
+        nonlocal states, timers
+        for i in range(gen_count):
+            yield states
+            if i + 1 < gen_count:
+                with metrics.phase("gif_step", cells=states.size):
+                    states, timers = seird_step(states, timers, params, rng, generation + i)
+
+    return write_gif(simulate(), path, gen_count, scale=scale, duration=duration, progress=progress, cancel=cancel)
+
+
+# GIF do Jogo da Vida: `frames` quadros, avançando `step` gerações entre eles
+# com o motor de life.py (o HashLife torna passos enormes baratos).
+def export_life_gif(cells, rule, path, frames, step=1, engine="bitpacked", scale=4, duration=120,
+                    progress=None, cancel=None):
+    life = make_life_engine(cells, rule, engine)
+
+    def simulate():
+        for i in range(frames):
+            yield life.cells
+            if i + 1 < frames:
+                with metrics.phase("gif_step", cells=cells.size * step):
+                    life.step(step)
+
+    return write_gif(simulate(), path, frames, scale=scale, duration=duration, progress=progress,
+                     cancel=cancel, palette=LIFE_PALETTE)
+
+
+# Regenera um GIF das gerações [start, stop) de uma gravação, sem simular.
+# O intervalo é conferido antes de abrir `path` (vazio não gera GIF).
+def export_recording_gif(recording, path, start=0, stop=None, scale=4, duration=120, progress=None, cancel=None):
+    stop = len(recording) if stop is None else stop
+    if not 0 <= start < stop <= len(recording):
+        raise ValueError(f"intervalo [{start}, {stop}) fora da gravação (0..{len(recording)})")
+    total = stop - start
+    palette = LIFE_PALETTE if recording.metadata.get("life_rule") else PALETTE
+    return write_gif(recording.states(start, stop), path, total, scale=scale, duration=duration, progress=progress,
+                     cancel=cancel, palette=palette)
@@ -0,0 +1,171 @@
+from collections import deque
+import numpy as np
+import zlib
+
+
+# ============================================
+# Histórico limitado (desfazer) com compressão por diferenças
+# ============================================
+# Cada geração é guardada como um quadro-chave (estados + timers completos)
+# ou como a lista das células que mudaram desde a geração anterior, sempre
+# comprimidos com zlib. Quando o total passa de `max_bytes`, as gerações mais
+# antigas são descartadas. Entradas marcadas como edição guardam a grade de
+# antes de uma edição manual (um traço de pincel) em vez de uma geração.
+class GenerationHistory:
+    KEYFRAME = 0
+    DELTA = 1
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, keyframe_interval=32):
+        self.max_bytes = max_bytes
+        self.keyframe_interval = keyframe_interval
+        self.nbytes = 0
+        # entradas: (tipo, payload comprimido, formato da grade, edição)
+        self._entries = deque()
+        # gerações desde o último quadro-chave
+        self._since_keyframe = 0
+        # cópia descomprimida da entrada mais recente (evita reconstruir no push)
+        self._tail = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __bool__(self):
+        return bool(self._entries)
+
+    def clear(self):
+        self._entries.clear()
+        self.nbytes = 0
+        self._since_keyframe = 0
+        self._tail = None
+
+    # entradas (tipo, payload comprimido, formato, edição), da mais antiga
+    # para a mais recente; `restore` aceita a mesma lista (checkpoints)
+    def entries(self):
+        return list(self._entries)
+
+    def restore(self, entries):
+        self.clear()
+        for entry in entries:
+            self._append(entry)
+        self._since_keyframe = self._count_since_keyframe()
+        self._evict()
+
+    # guarda uma geração (os arrays são copiados). `changed`, se dado, são os
+    # índices lineares de todas as células que podem diferir da geração
+    # guardada antes: o delta sai direto deles, sem comparar a grade inteira.
+    # Com edit=True a entrada é a grade de antes de uma edição manual.
+    def push(self, states, timers, changed=None, edit=False):
+        prev = self._tail
+        if prev is None and self._entries:
+            prev = self._reconstruct(len(self._entries) - 1)
+
+        if (changed is not None and prev is not None and prev[0].shape == states.shape
+                and self._since_keyframe < self.keyframe_interval):
+            changed = np.unique(np.asarray(changed, dtype=np.uint32))
+            entry = self._encode_changes(changed, states.ravel()[changed], timers.ravel()[changed], states.shape)
+            # a cópia mais recente é atualizada no lugar
+            prev[0].ravel()[changed] = states.ravel()[changed]
+            prev[1].ravel()[changed] = timers.ravel()[changed]
+            self._since_keyframe += 1
+            self._append((*entry, edit))
+            self._tail = prev
+            self._evict()
+            return
+
+        states = np.array(states, dtype=np.uint8)
+        timers = np.array(timers, dtype=np.uint8)
+        entry = None
+        if prev is not None and prev[0].shape == states.shape and self._since_keyframe < self.keyframe_interval:
+            entry = self._encode_delta(prev, states, timers)
+        if entry is None:
+            entry = self._keyframe(states, timers)
+            self._since_keyframe = 0
+        else:
+            self._since_keyframe += 1
+
+        self._append((*entry, edit))
+        self._tail = (states, timers)
+        self._evict()
+
+    def _append(self, entry):
+        self._entries.append(entry)
+        self.nbytes += len(entry[1])
+
+    # a entrada mais recente é de uma edição manual?
+    def last_is_edit(self):
+        return bool(self._entries) and self._entries[-1][3]
+
+    # remove e devolve (estados, timers) da geração mais recente
+    def pop(self):
+        if not self._entries:
+            return None
+        if self._tail is not None:
+            result = self._tail
+        else:
+            result = self._reconstruct(len(self._entries) - 1)
+        _, payload, _, _ = self._entries.pop()
+        self.nbytes -= len(payload)
+        self._tail = None
+        self._since_keyframe = self._count_since_keyframe()
+        return result
+
+    # entradas depois do último quadro-chave
+    def _count_since_keyframe(self):
+        count = 0
+        for i in range(len(self._entries) - 1, -1, -1):
+            if self._entries[i][0] == self.KEYFRAME:
+                break
+            count += 1
+        return count
+
+    def _keyframe(self, states, timers):
+        return (self.KEYFRAME, zlib.compress(states.tobytes() + timers.tobytes(), 1), states.shape)
+
+    def _encode_delta(self, prev, states, timers):
+        changed = np.flatnonzero((prev[0] != states) | (prev[1] != timers)).astype(np.uint32)
+        # delta maior que um quadro-chave não compensa
+        if changed.size * 6 >= states.size * 2:
+            return None
+        return self._encode_changes(changed, states.ravel()[changed], timers.ravel()[changed], states.shape)
+
+    def _encode_changes(self, changed, state_values, timer_values, shape):
+        # índices guardados como distâncias entre células alteradas (comprimem melhor)
+        gaps = np.diff(changed, prepend=np.uint32(0))
+        raw = gaps.tobytes() + state_values.tobytes() + timer_values.tobytes()
+        return (self.DELTA, zlib.compress(raw, 1), shape)
+
+    def _decode(self, entry, base=None):
+        kind, payload, shape = entry[:3]
+        raw = zlib.decompress(payload)
+        if kind == self.KEYFRAME:
+            size = shape[0] * shape[1]
+            buf = np.frombuffer(raw, dtype=np.uint8)
+            return buf[:size].reshape(shape).copy(), buf[size:].reshape(shape).copy()
+        n = len(raw) // 6
+        changed = np.cumsum(np.frombuffer(raw, dtype=np.uint32, count=n), dtype=np.uint32)
+        states, timers = base[0].copy(), base[1].copy()
+        states.ravel()[changed] = np.frombuffer(raw, dtype=np.uint8, count=n, offset=4 * n)
+        timers.ravel()[changed] = np.frombuffer(raw, dtype=np.uint8, count=n, offset=5 * n)
+        return states, timers
+
+    # reconstrói a geração `i` a partir do quadro-chave anterior mais próximo
+    def _reconstruct(self, i):
+        start = i
+        while self._entries[start][0] != self.KEYFRAME:
+            start -= 1
+        result = self._decode(self._entries[start])
+        for j in range(start + 1, i + 1):
+            result = self._decode(self._entries[j], result)
+        return result
+
+    def _evict(self):
+        while self.nbytes > self.max_bytes and len(self._entries) > 1:
+            oldest = self._entries.popleft()
+            self.nbytes -= len(oldest[1])
+            # a nova entrada mais antiga precisa virar quadro-chave
+            if self._entries[0][0] == self.DELTA:
+                states, timers = self._decode(self._entries[0], self._decode(oldest))
+                self.nbytes -= len(self._entries[0][1])
+                self._entries[0] = (*self._keyframe(states, timers), self._entries[0][3])
+                self.nbytes += len(self._entries[0][1])
+                self._since_keyframe = self._count_since_keyframe()
@@ -0,0 +1,105 @@
+from contextlib import contextmanager
+from threading import Lock
+import cProfile
+import io
+import json
+import pstats
+import time
+
+
+# ============================================
+# Instrumentação leve por fase (sem dependência de Qt)
+# ============================================
+# Cada fase (passo, histórico, repintura, desenho e codificação do GIF,
+# miniaturas...) acumula chamadas, tempo total/último/máximo e células
+# processadas. Opcionalmente cada medida vira uma linha JSON num arquivo.
+# O custo por medida é de duas leituras de relógio e um lock.
+class Instruments:
+    def __init__(self):
+        self._lock = Lock()
+        self._phases = {}
+        self._counters = {}
+        self._log = None
+
+    @contextmanager
+    def phase(self, name, **fields):
+        start = time.perf_counter()
+        try:
+            yield fields
+        finally:
+            self.record(name, time.perf_counter() - start, **fields)
+
+    # registra uma medida; `cells` (opcional) soma as células processadas
+    def record(self, name, seconds, cells=0, **fields):
+        with self._lock:
+            stats = self._phases.get(name)
+            if stats is None:
+                stats = self._phases[name] = {"count": 0, "total": 0.0, "last": 0.0, "max": 0.0, "cells": 0}
+            stats["count"] += 1
+            stats["total"] += seconds
+            stats["last"] = seconds
+            stats["max"] = max(stats["max"], seconds)
+            stats["cells"] += cells
+            if self._log is not None:
+                line = {"time": time.time(), "phase": name, "seconds": seconds, **fields}
+                if cells:
+                    line["cells"] = cells
+                self._log.write(json.dumps(line) + "\n")
+
+    def count(self, name, n=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    # cópia das estatísticas: {"phases": {nome: {...}}, "counters": {...}}
+    def snapshot(self):
+        with self._lock:
+            phases = {}
+            for name, stats in self._phases.items():
+                phases[name] = dict(stats, mean=stats["total"] / stats["count"])
+            return {"phases": phases, "counters": dict(self._counters)}
+
+    def reset(self):
+        with self._lock:
+            self._phases.clear()
+            self._counters.clear()
+
+    # passa a gravar cada medida em `path` (JSON lines); None desliga
+    def log_to(self, path):
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+            self._log = open(path, "a", buffering=1) if path else None
+
+
+# instância usada pelo núcleo, pela exportação e pela interface
+metrics = Instruments()
+
+
+# resumo de uma linha por fase, para logs e para o painel da interface
+def format_snapshot(snapshot):
+    lines = []
+    for name, stats in sorted(snapshot["phases"].items()):
+        line = (f"{name:<11} {stats['count']:>6}x  último {stats['last'] * 1000:7.2f} ms  "
+                f"média {stats['mean'] * 1000:7.2f} ms")
+        if stats["cells"] and stats["total"] > 0:
+            line += f"  {stats['cells'] / stats['total'] / 1e6:7.1f} M células/s"
+        lines.append(line)
+    for name, value in sorted(snapshot["counters"].items()):
+        lines.append(f"{name:<11} {value:>6}")
+    return "\n".join(lines)
+
+
+# roda `fn()` `n` vezes sob o cProfile, salva as estatísticas em `path`
+# (abrir com pstats ou snakeviz) e devolve as `top` funções mais caras
+def profile_calls(fn, n, path, top=20, sort="cumulative"):
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        for _ in range(n):
+            fn()
+    finally:
+        profiler.disable()
+    profiler.dump_stats(path)
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats(sort).print_stats(top)
+    return out.getvalue()
@@ -0,0 +1,204 @@
+import numpy as np
+
+
+# ============================================
+# Vizinhanças e núcleos de infecção
+# ============================================
+# Um núcleo é uma matriz de pesos (2r+1) x (2r+1) centrada na célula, com
+# centro zero. A pressão de infecção de uma célula é a soma dos pesos dos
+# vizinhos infectados; com pesos todos 1 ela é a contagem de vizinhos e a
+# probabilidade de contágio continua tabelada por contagem.
+#
+# Especificações aceitas por `get_kernel` (o parâmetro `neighborhood`):
+#   "moore", "moore:R"              quadrado de raio R (padrão 1, 8 vizinhos)
+#   "von-neumann", "von-neumann:R"  losango |dr| + |dc| <= R
+#   "exp:R:ESCALA"                  peso exp(-(d - 1) / ESCALA), d <= R
+#   "power:R:ALFA"                  peso d^-ALFA, d <= R
+#   "gauss:R:SIGMA"                 peso exp(-(d² - 1) / (2 SIGMA²)), d <= R
+#   caminho de um .npy / .txt       matriz de pesos arbitrária
+# (d é a distância euclidiana; nos núcleos com decaimento o peso a distância 1
+# vale 1, então p_infection continua sendo a probabilidade por contato
+# próximo.)
+#
+# Os deslocamentos e pesos são calculados uma vez por núcleo. Núcleos
+# pequenos somam fatias deslocadas da grade (uma por vizinho); acima dos
+# limites abaixo a pressão é uma convolução por FFT, cujo custo não depende
+# do raio. O espectro do núcleo fica guardado por tamanho de grade.
+
+# vizinhos somados direto: contagens em uint8 são baratas (Moore até raio 5);
+# pesos reais custam uma multiplicação em float por vizinho
+DIRECT_MAX_TAPS = 120
+DIRECT_MAX_WEIGHTED_TAPS = 24
+
+
+def _fast_len(n):
+    # menor m >= n da forma 2^a 3^b 5^c (tamanhos rápidos para a FFT)
+    best = 1 << max(n - 1, 0).bit_length()
+    p5 = 1
+    while p5 < best:
+        p35 = p5
+        while p35 < best:
+            m = p35
+            while m < n:
+                m *= 2
+            best = min(best, m)
+            p35 *= 3
+        p5 *= 5
+    return best
+
+
+class InfectionKernel:
+    def __init__(self, weights, spec=None, diagonal_moves=True):
+        weights = np.array(weights, dtype=np.float64)
+        if weights.ndim != 2 or weights.shape[0] != weights.shape[1] or weights.shape[0] % 2 == 0:
+            raise ValueError("o núcleo deve ser uma matriz quadrada de lado ímpar")
+        if (weights < 0).any():
+            raise ValueError("pesos do núcleo não podem ser negativos")
+        self.radius = weights.shape[0] // 2
+        weights[self.radius, self.radius] = 0
+        self.weights = weights
+        self.spec = spec
+        # mobilidade: trocas também nas diagonais (False em von Neumann)
+        self.diagonal_moves = diagonal_moves
+
+        rows, cols = np.nonzero(weights)
+        self.offsets = [(int(r) - self.radius, int(c) - self.radius) for r, c in zip(rows, cols)]
+        self.tap_weights = weights[rows, cols]
+        self.taps = len(self.offsets)
+        # pesos todos 1: pressão = contagem inteira de vizinhos
+        self.unweighted = bool((self.tap_weights == 1).all())
+        if self.unweighted:
+            self.dtype = np.uint8 if self.taps <= 0xFF else np.uint16 if self.taps <= 0xFFFF else np.uint32
+        else:
+            self.dtype = np.float64
+        self._spectra = {}
+
+    def __repr__(self):
+        return f"InfectionKernel({self.spec or 'custom'!r}, radius={self.radius}, taps={self.taps})"
+
+    # soma dos pesos dos vizinhos em que `mask` é verdadeira (borda vazia)
+    def pressure(self, mask):
+        mask = np.asarray(mask)
+        if self.taps > (DIRECT_MAX_TAPS if self.unweighted else DIRECT_MAX_WEIGHTED_TAPS):
+            return self._fft_pressure(mask)
+        rows, cols = mask.shape
+        r = self.radius
+        padded = np.pad(mask.view(np.uint8) if mask.dtype == bool else mask.astype(np.uint8), r)
+        total = np.zeros((rows, cols), dtype=self.dtype)
+        for (dr, dc), w in zip(self.offsets, self.tap_weights):
+            window = padded[r + dr:r + dr + rows, r + dc:r + dc + cols]
+            if self.unweighted:
+                total += window
+            else:
+                total += w * window
+        return total
+
+    # convolução linear por FFT, sem dar a volta nas bordas
+    def _fft_pressure(self, mask):
+        rows, cols = mask.shape
+        r = self.radius
+        shape = (_fast_len(rows + 2 * r), _fast_len(cols + 2 * r))
+        spectrum = self._spectra.get(shape)
+        if spectrum is None:
+            # convolução com o núcleo espelhado = soma dos pesos dos vizinhos
+            spectrum = self._spectra[shape] = np.fft.rfft2(self.weights[::-1, ::-1], s=shape)
+        full = np.fft.irfft2(np.fft.rfft2(mask.astype(np.float64), s=shape) * spectrum, s=shape)
+        total = full[r:r + rows, r:r + cols]
+        if self.unweighted:
+            return np.rint(total).astype(self.dtype)
+        return np.maximum(total, 0.0)
+
+    # pressão numa única célula (edição e inspeção): só os vizinhos do
+    # núcleo são lidos, sem montar uma máscara da grade inteira
+    def pressure_at(self, states, state_type, r, c):
+        rows, cols = states.shape
+        total = 0
+        for (dr, dc), w in zip(self.offsets, self.tap_weights):
+            rr, cc = r + dr, c + dc
+            if 0 <= rr < rows and 0 <= cc < cols and states[rr, cc] == state_type:
+                total += int(w) if self.unweighted else float(w)
+        return total
+
+
+def _distances(radius):
+    d = np.arange(-radius, radius + 1)
+    return np.hypot(d[:, None], d[None, :])
+
+
+def moore_kernel(radius=1):
+    side = 2 * int(radius) + 1
+    return InfectionKernel(np.ones((side, side)), f"moore:{radius}")
+
+
+def von_neumann_kernel(radius=1):
+    d = np.arange(-int(radius), int(radius) + 1)
+    weights = (np.abs(d[:, None]) + np.abs(d[None, :]) <= radius).astype(np.float64)
+    return InfectionKernel(weights, f"von-neumann:{radius}", diagonal_moves=False)
+
+
+def _decay_weights(radius, weight_of):
+    radius = int(radius)
+    d = _distances(radius)
+    with np.errstate(divide="ignore"):
+        return np.where((d > 0) & (d <= radius), weight_of(d), 0.0)
+
+
+def exponential_kernel(radius, scale):
+    scale = float(scale)
+    weights = _decay_weights(radius, lambda d: np.exp(-(d - 1) / scale))
+    return InfectionKernel(weights, f"exp:{radius}:{scale:g}")
+
+
+def power_kernel(radius, alpha):
+    alpha = float(alpha)
+    weights = _decay_weights(radius, lambda d: d ** -alpha)
+    return InfectionKernel(weights, f"power:{radius}:{alpha:g}")
+
+
+def gaussian_kernel(radius, sigma):
+    sigma = float(sigma)
+    weights = _decay_weights(radius, lambda d: np.exp(-(d ** 2 - 1) / (2 * sigma ** 2)))
+    return InfectionKernel(weights, f"gauss:{radius}:{sigma:g}")
+
+
+# nome -> (construtor, argumentos padrão)
+KERNEL_SHAPES = {
+    "moore": (moore_kernel, (1,)),
+    "von-neumann": (von_neumann_kernel, (1,)),
+    "exp": (exponential_kernel, (8, 2.0)),
+    "power": (power_kernel, (16, 2.0)),
+    "gauss": (gaussian_kernel, (8, 3.0)),
+}
+
+# núcleos já construídos, por especificação (um por processo)
+_kernels = {}
+
+
+def make_kernel(spec):
+    if spec.endswith((".npy", ".txt")):
+        weights = np.load(spec) if spec.endswith(".npy") else np.loadtxt(spec)
+        return InfectionKernel(weights, spec)
+    name, *args = spec.strip().lower().split(":")
+    try:
+        builder, defaults = KERNEL_SHAPES[name]
+    except KeyError:
+        raise ValueError(f"vizinhança desconhecida: {spec!r} (use {', '.join(KERNEL_SHAPES)})") from None
+    if len(args) > len(defaults):
+        raise ValueError(f"argumentos demais em {spec!r}")
+    try:
+        args = [float(a) if "." in a else int(a) for a in args]
+    except ValueError:
+        raise ValueError(f"argumento inválido em {spec!r}") from None
+    if args and args[0] < 1:
+        raise ValueError(f"raio deve ser >= 1 em {spec!r}")
+    return builder(*args, *defaults[len(args):])
+
+
+# núcleo de uma especificação (ou o próprio núcleo), construído uma única vez
+def get_kernel(spec):
+    if isinstance(spec, InfectionKernel):
+        return spec
+    kernel = _kernels.get(spec)
+    if kernel is None:
+        kernel = _kernels[spec] = make_kernel(spec)
+    return kernel
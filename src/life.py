@@ -0,0 +1,524 @@
+import numpy as np
+import re
+
+
+# ============================================
+# Jogo da Vida e regras B/S (sem dependência de Qt)
+# ============================================
+# Células: 0 = morta, 1 = viva. Uma regra "Bxx/Syy" diz com quantos vizinhos
+# de Moore uma célula morta nasce (B) e uma viva sobrevive (S).
+# Motores (mesma interface: `step(n)`, `cells`, `population`, `generation`):
+#   - ArrayLife: referência em numpy, um byte por célula (grade limitada);
+#   - BitPackedLife: 64 células por palavra uint64 (grade limitada);
+#   - HashLife: quadtree memoizada, plano infinito; `cells` é a janela
+#     rows x cols com o canto em (0, 0). Salta 2^k gerações de uma vez.
+DEAD_CELL = 0
+LIVE_CELL = 1
+
+# cores para a view e para o GIF no modo Vida
+LIFE_RGB = {
+    DEAD_CELL: (255, 255, 255),
+    LIVE_CELL: (20, 20, 20),
+}
+
+LIFE_RULES = {
+    "conway": "B3/S23",
+    "highlife": "B36/S23",
+    "seeds": "B2/S",
+    "day-and-night": "B3678/S34678",
+    "life-without-death": "B3/S012345678",
+}
+
+
+class LifeRule:
+    def __init__(self, notation="B3/S23"):
+        notation = LIFE_RULES.get(notation.lower(), notation)
+        match = re.fullmatch(r"\s*[Bb]([0-8]*)\s*/\s*[Ss]([0-8]*)\s*", notation)
+        if match is None:
+            raise ValueError(f"regra inválida: {notation!r} (use o formato B3/S23)")
+        self.birth = frozenset(int(n) for n in match.group(1))
+        self.survive = frozenset(int(n) for n in match.group(2))
+        self.notation = "B{}/S{}".format(
+            "".join(str(n) for n in sorted(self.birth)), "".join(str(n) for n in sorted(self.survive))
+        )
+        # próxima célula por (estado atual, vizinhos vivos)
+        self.table = np.zeros((2, 9), dtype=np.uint8)
+        self.table[0, sorted(self.birth)] = 1
+        self.table[1, sorted(self.survive)] = 1
+
+    def __repr__(self):
+        return f"LifeRule({self.notation!r})"
+
+    def __eq__(self, other):
+        return isinstance(other, LifeRule) and self.notation == other.notation
+
+    def __hash__(self):
+        return hash(self.notation)
+
+
+# um passo de referência (bordas mortas)
+def life_step(cells, rule):
+    rows, cols = cells.shape
+    padded = np.pad((cells != 0).astype(np.uint8), 1)
+    neighbors = np.zeros((rows, cols), dtype=np.uint8)
+    for dr in (-1, 0, 1):
+        for dc in (-1, 0, 1):
+            if dr or dc:
+                neighbors += padded[1 + dr:1 + dr + rows, 1 + dc:1 + dc + cols]
+    return rule.table[padded[1:-1, 1:-1], neighbors]
+
+
+# ============================================
+# Leitura de padrões RLE (formato usado pelo Golly e pelo LifeWiki)
+# ============================================
+# devolve (células uint8, regra ou None)
+def parse_rle(text):
+    width = height = 0
+    rule = None
+    body = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("x") and not body:
+            header = dict(
+                (key.strip(), value.strip())
+                for key, value in (item.split("=", 1) for item in line.split(",") if "=" in item)
+            )
+            width, height = int(header["x"]), int(header["y"])
+            rule = LifeRule(header["rule"]) if "rule" in header else None
+            continue
+        body.append(line)
+
+    cells = np.zeros((height, width), dtype=np.uint8)
+    r = c = 0
+    for count, tag in re.findall(r"(\d*)([bo$!A-Za-z.])", "".join(body)):
+        n = int(count) if count else 1
+        if tag == "!":
+            break
+        if tag == "$":
+            r += n
+            c = 0
+        elif tag in "b.":
+            c += n
+        else:
+            cells[r, c:c + n] = LIVE_CELL
+            c += n
+    return cells, rule
+
+
+def load_rle(path):
+    with open(path) as f:
+        return parse_rle(f.read())
+
+
+# ============================================
+# Motor de referência (um byte por célula)
+# ============================================
+class ArrayLife:
+    def __init__(self, cells, rule):
+        self.rule = rule
+        self._cells = (np.asarray(cells) != 0).astype(np.uint8)
+        self.generation = 0
+
+    def step(self, generations=1):
+        for _ in range(generations):
+            self._cells = life_step(self._cells, self.rule)
+        self.generation += generations
+
+    @property
+    def cells(self):
+        return self._cells.copy()
+
+    @property
+    def population(self):
+        return int(np.count_nonzero(self._cells))
+
+
+# ============================================
+# Motor bit a bit: 64 células por palavra
+# ============================================
+# Cada linha vira ceil(cols / 64) palavras uint64; o bit j da palavra k é a
+# coluna 64k + j. Os 8 vizinhos são a própria grade deslocada (linhas por
+# fatia, colunas por shift com o bit que atravessa de uma palavra para a
+# outra); a contagem é feita em 4 planos de bits com somadores, e a regra
+# vira operações lógicas sobre os planos.
+def pack_rows(cells):
+    rows, cols = cells.shape
+    words = max(1, -(-cols // 64))
+    padded = np.zeros((rows, words * 64), dtype=np.uint8)
+    padded[:, :cols] = cells != 0
+    return np.packbits(padded, axis=1, bitorder="little").view("<u8")
+
+
+def unpack_rows(bits, cols):
+    return np.unpackbits(bits.view(np.uint8), axis=1, bitorder="little")[:, :cols]
+
+
+# colunas c-1 e c+1 de cada bit (bits de fora da grade entram como zero)
+def _shift_west(x):
+    out = x << np.uint64(1)
+    out[:, 1:] |= x[:, :-1] >> np.uint64(63)
+    return out
+
+
+def _shift_east(x):
+    out = x >> np.uint64(1)
+    out[:, :-1] |= x[:, 1:] << np.uint64(63)
+    return out
+
+
+class BitPackedLife:
+    def __init__(self, cells, rule):
+        self.rule = rule
+        self.rows, self.cols = cells.shape
+        self.bits = pack_rows(np.asarray(cells))
+        self.generation = 0
+        # bits além da última coluna ficam sempre zerados
+        tail = self.cols % 64
+        self._last_mask = np.uint64((1 << tail) - 1 if tail else (1 << 64) - 1)
+
+    def _step(self, bits):
+        rows, words = bits.shape
+        padded = np.zeros((rows + 2, words), dtype=bits.dtype)
+        padded[1:-1] = bits
+        above = padded[:-2]
+        below = padded[2:]
+        neighbors = (
+            above, _shift_west(above), _shift_east(above),
+            _shift_west(bits), _shift_east(bits),
+            below, _shift_west(below), _shift_east(below),
+        )
+
+        # soma de 8 bits em planos s0..s3 (só os planos já alcançáveis)
+        planes = []
+        for k, x in enumerate(neighbors, 1):
+            carry = x
+            for i in range(len(planes)):
+                planes[i], carry = planes[i] ^ carry, planes[i] & carry
+            if len(planes) < k.bit_length():
+                planes.append(carry)
+
+        def count_is(n):
+            mask = None
+            for i, plane in enumerate(planes):
+                term = plane if (n >> i) & 1 else ~plane
+                mask = term if mask is None else mask & term
+            return mask
+
+        zero = np.zeros_like(bits)
+        born = zero
+        for n in self.rule.birth:
+            born = born | count_is(n)
+        stays = zero
+        for n in self.rule.survive:
+            stays = stays | count_is(n)
+        new = (born & ~bits) | (stays & bits)
+        new[:, -1] &= self._last_mask
+        return new
+
+    def step(self, generations=1):
+        for _ in range(generations):
+            self.bits = self._step(self.bits)
+        self.generation += generations
+
+    @property
+    def cells(self):
+        return unpack_rows(self.bits, self.cols)
+
+    @property
+    def population(self):
+        return int(np.unpackbits(self.bits.view(np.uint8)).sum())
+
+
+# ============================================
+# HashLife (quadtree com memoização)
+# ============================================
+# Nós imutáveis e únicos (mesmo conteúdo = mesmo objeto): um nó de nível k é
+# um quadrado 2^k x 2^k com quadrantes nw/ne/sw/se de nível k-1. O resultado
+# de avançar o centro de um nó 2^j gerações fica guardado, então padrões
+# regulares (repetições no espaço e no tempo) custam quase nada para saltar
+# muitas gerações. O universo é infinito; a raiz cresce quando o padrão se
+# aproxima da borda. A regra não pode ter B0 (o fundo morto passaria a nascer).
+class _Node:
+    __slots__ = ("nw", "ne", "sw", "se", "level", "population", "__weakref__")
+
+    def __init__(self, nw, ne, sw, se, level, population):
+        self.nw = nw
+        self.ne = ne
+        self.sw = sw
+        self.se = se
+        self.level = level
+        self.population = population
+
+
+class HashLife:
+    # acima disto o cache é esvaziado (só a raiz é mantida)
+    MAX_CACHE = 2_000_000
+
+    def __init__(self, cells, rule, max_jump=None):
+        if 0 in rule.birth:
+            raise ValueError("HashLife não suporta regras com B0")
+        self.rule = rule
+        self.max_jump = max_jump
+        self.rows, self.cols = cells.shape
+        self.generation = 0
+        self._reset_caches()
+
+        # a janela rows x cols fica no quadrante que começa em (-side/2, -side/2)
+        side = 1
+        level = 0
+        while side < max(self.rows, self.cols, 4):
+            side *= 2
+            level += 1
+        self._origin = -side // 2
+        grid = np.zeros((side, side), dtype=np.uint8)
+        grid[:self.rows, :self.cols] = np.asarray(cells) != 0
+        self.root = self._from_array(grid, level)
+
+    def _reset_caches(self):
+        self._nodes = {}
+        self._results = {}
+        self._zeros = {}
+        self._blocks = {}
+        self.off = _Node(None, None, None, None, 0, 0)
+        self.on = _Node(None, None, None, None, 0, 1)
+
+    # nó único para os quatro quadrantes
+    def join(self, nw, ne, sw, se):
+        key = (id(nw), id(ne), id(sw), id(se))
+        node = self._nodes.get(key)
+        if node is None:
+            node = _Node(nw, ne, sw, se, nw.level + 1,
+                         nw.population + ne.population + sw.population + se.population)
+            # as chaves usam id(): os filhos ficam vivos enquanto o pai existir
+            self._nodes[key] = node
+        return node
+
+    def zero(self, level):
+        node = self._zeros.get(level)
+        if node is None:
+            node = self.off if level == 0 else self.join(*(self.zero(level - 1),) * 4)
+            self._zeros[level] = node
+        return node
+
+    # mesmo conteúdo, um nível acima, centralizado (margem morta em volta)
+    def centre(self, m):
+        z = self.zero(m.level - 1)
+        return self.join(
+            self.join(z, z, z, m.nw), self.join(z, z, m.ne, z),
+            self.join(z, m.sw, z, z), self.join(m.se, z, z, z),
+        )
+
+    # quadrado central (metade do lado)
+    def _inner(self, m):
+        return self.join(m.nw.se, m.ne.sw, m.sw.ne, m.se.nw)
+
+    def _from_array(self, grid, level):
+        if level == 0:
+            return self.on if grid[0, 0] else self.off
+        if not grid.any():
+            return self.zero(level)
+        h = grid.shape[0] // 2
+        return self.join(
+            self._from_array(grid[:h, :h], level - 1), self._from_array(grid[:h, h:], level - 1),
+            self._from_array(grid[h:, :h], level - 1), self._from_array(grid[h:, h:], level - 1),
+        )
+
+    # nó de nível 2 (4x4): centro 2x2 uma geração adiante
+    def _life_4x4(self, m):
+        grid = self._to_array(m)
+        table = self.rule.table
+        out = []
+        for r in (1, 2):
+            for c in (1, 2):
+                n = int(grid[r - 1:r + 2, c - 1:c + 2].sum()) - int(grid[r, c])
+                out.append(self.on if table[grid[r, c], n] else self.off)
+        return self.join(*out)
+
+    # centro (nível k-1) de `m` avançado 2^j gerações, j <= k-2
+    def _successor(self, m, j):
+        key = (id(m), j)
+        result = self._results.get(key)
+        if result is not None:
+            return result
+        if m.population == 0:
+            result = m.nw
+        elif m.level == 2:
+            result = self._life_4x4(m)
+        else:
+            join = self.join
+            a, b, c, d = m.nw, m.ne, m.sw, m.se
+            # 9 sub-quadrados sobrepostos de nível k-1
+            subs = (
+                (a.nw, a.ne, a.sw, a.se), (a.ne, b.nw, a.se, b.sw), (b.nw, b.ne, b.sw, b.se),
+                (a.sw, a.se, c.nw, c.ne), (a.se, b.sw, c.ne, d.nw), (b.sw, b.se, d.nw, d.ne),
+                (c.nw, c.ne, c.sw, c.se), (c.ne, d.nw, c.se, d.sw), (d.nw, d.ne, d.sw, d.se),
+            )
+            if j < m.level - 2:
+                # salto menor que o máximo: cada sub-quadrado já avança 2^j e
+                # o resultado é montado com os centros deles
+                c1, c2, c3, c4, c5, c6, c7, c8, c9 = (self._successor(join(*s), j) for s in subs)
+                result = join(
+                    join(c1.se, c2.sw, c4.ne, c5.nw), join(c2.se, c3.sw, c5.ne, c6.nw),
+                    join(c4.se, c5.sw, c7.ne, c8.nw), join(c5.se, c6.sw, c8.ne, c9.nw),
+                )
+            else:
+                # salto máximo: duas metades de 2^(k-3) gerações
+                c1, c2, c3, c4, c5, c6, c7, c8, c9 = (self._successor(join(*s), j - 1) for s in subs)
+                result = join(
+                    self._successor(join(c1, c2, c4, c5), j - 1), self._successor(join(c2, c3, c5, c6), j - 1),
+                    self._successor(join(c4, c5, c7, c8), j - 1), self._successor(join(c5, c6, c8, c9), j - 1),
+                )
+        self._results[key] = result
+        return result
+
+    def step(self, generations=1):
+        remaining = generations
+        while remaining > 0:
+            j = remaining.bit_length() - 1
+            if self.max_jump is not None:
+                j = min(j, self.max_jump)
+            # o padrão precisa caber no quadrado central, com margem para
+            # andar 2^j células (velocidade máxima de 1 célula por geração)
+            root = self.root
+            while root.level < j + 2 or root.population != self._inner(root).population:
+                root = self.centre(root)
+            self.root = self._successor(self.centre(root), j)
+            remaining -= 1 << j
+            self.generation += 1 << j
+            if len(self._nodes) > self.MAX_CACHE:
+                self._collect()
+
+    # esvazia os caches e reconstrói a raiz (o conteúdo não muda)
+    def _collect(self):
+        old_root = self.root
+        self._reset_caches()
+        self.root = self._copy(old_root, {})
+
+    def _copy(self, node, seen):
+        if node.level == 0:
+            return self.on if node.population else self.off
+        copied = seen.get(id(node))
+        if copied is None:
+            copied = self.join(self._copy(node.nw, seen), self._copy(node.ne, seen),
+                               self._copy(node.sw, seen), self._copy(node.se, seen))
+            seen[id(node)] = copied
+        return copied
+
+    def _to_array(self, node):
+        side = 1 << node.level
+        if node.population == 0:
+            return np.zeros((side, side), dtype=np.uint8)
+        if node.level == 0:
+            return np.ones((1, 1), dtype=np.uint8)
+        # blocos pequenos são reaproveitados (os nós são únicos)
+        if node.level <= 3:
+            block = self._blocks.get(id(node))
+            if block is not None:
+                return block
+        h = side // 2
+        out = np.empty((side, side), dtype=np.uint8)
+        out[:h, :h] = self._to_array(node.nw)
+        out[:h, h:] = self._to_array(node.ne)
+        out[h:, :h] = self._to_array(node.sw)
+        out[h:, h:] = self._to_array(node.se)
+        if node.level <= 3:
+            self._blocks[id(node)] = out
+        return out
+
+    # copia para `out` a parte do nó (canto em y, x) que cai na janela
+    def _paint(self, node, y, x, out):
+        side = 1 << node.level
+        rows, cols = out.shape
+        if node.population == 0 or y >= rows or x >= cols or y + side <= 0 or x + side <= 0:
+            return
+        if node.level <= 3 or (y >= 0 and x >= 0 and y + side <= rows and x + side <= cols and side <= 64):
+            block = self._to_array(node)
+            r0, c0 = max(y, 0), max(x, 0)
+            r1, c1 = min(y + side, rows), min(x + side, cols)
+            out[r0:r1, c0:c1] = block[r0 - y:r1 - y, c0 - x:c1 - x]
+            return
+        h = side // 2
+        self._paint(node.nw, y, x, out)
+        self._paint(node.ne, y, x + h, out)
+        self._paint(node.sw, y + h, x, out)
+        self._paint(node.se, y + h, x + h, out)
+
+    # Células vivas do plano inteiro (n x 2: linha, coluna), relativas ao
+    # canto da janela; podem estar fora dela. Com load_cells, guarda e
+    # restaura o universo que `cells` corta na janela.
+    def live_cells(self):
+        out = []
+        corner = -(1 << self.root.level) // 2 - self._origin
+        self._gather(self.root, corner, corner, out)
+        return np.concatenate(out) if out else np.zeros((0, 2), dtype=np.int64)
+
+    def _gather(self, node, y, x, out):
+        if node.population == 0:
+            return
+        if node.level <= 3:
+            r, c = np.nonzero(self._to_array(node))
+            out.append(np.stack([r + y, c + x], axis=1).astype(np.int64))
+            return
+        h = 1 << (node.level - 1)
+        self._gather(node.nw, y, x, out)
+        self._gather(node.ne, y, x + h, out)
+        self._gather(node.sw, y + h, x, out)
+        self._gather(node.se, y + h, x + h, out)
+
+    # troca o plano pelas células vivas `points` (como em live_cells)
+    def load_cells(self, points):
+        points = np.asarray(points, dtype=np.int64).reshape(-1, 2)
+        ys = points[:, 0] + self._origin
+        xs = points[:, 1] + self._origin
+        level = self.root.level
+        if len(points):
+            reach = int(max(ys.max() + 1, xs.max() + 1, -ys.min(), -xs.min()))
+            while (1 << (level - 1)) < reach:
+                level += 1
+        half = 1 << (level - 1)
+        self.root = self._from_points(ys + half, xs + half, level)
+
+    # nó de nível `level` com as células (ys, xs) relativas ao canto dele
+    def _from_points(self, ys, xs, level):
+        if len(ys) == 0:
+            return self.zero(level)
+        if level <= 3:
+            grid = np.zeros((1 << level, 1 << level), dtype=np.uint8)
+            grid[ys, xs] = 1
+            return self._from_array(grid, level)
+        h = 1 << (level - 1)
+        south = ys >= h
+        east = xs >= h
+        quadrants = []
+        for s, e in ((False, False), (False, True), (True, False), (True, True)):
+            inside = (south == s) & (east == e)
+            quadrants.append(self._from_points(ys[inside] - h * s, xs[inside] - h * e, level - 1))
+        return self.join(*quadrants)
+
+    @property
+    def cells(self):
+        out = np.zeros((self.rows, self.cols), dtype=np.uint8)
+        corner = -(1 << self.root.level) // 2 - self._origin
+        self._paint(self.root, corner, corner, out)
+        return out
+
+    @property
+    def population(self):
+        return self.root.population
+
+
+LIFE_ENGINES = {
+    "array": ArrayLife,
+    "bitpacked": BitPackedLife,
+    "hashlife": HashLife,
+}
+
+
+def make_life_engine(cells, rule, engine="bitpacked"):
+    try:
+        factory = LIFE_ENGINES[engine]
+    except KeyError:
+        raise ValueError(f"motor desconhecido: {engine!r} (use {', '.join(LIFE_ENGINES)})") from None
+    return factory(cells, rule)
@@ -0,0 +1,161 @@
+from seird import STATE_RGB
+import json
+import numpy as np
+import os
+
+
+# ============================================
+# Gravação de trajetórias em disco (mapeável em memória)
+# ============================================
+# Arquivo `.seirdrec`:
+#   cabeçalho (HEADER_SIZE bytes): assinatura, versão, linhas, colunas,
+#   tamanho do quadro e metadados em JSON (parâmetros etc.)
+#   quadros de tamanho fixo, um por geração: estados empacotados em 3 bits
+#   (8 células em 3 bytes) seguidos dos timers (1 byte por célula)
+# Arquivo `.seirdrec.idx`: um registro INDEX_DTYPE por geração com o número
+# da geração, o deslocamento do quadro e as contagens S/E/I/R/D, para
+# estatísticas sem decodificar quadros.
+# Os dois arquivos só crescem por acréscimo: o tamanho é limitado pelo disco.
+
+MAGIC = b"SEIRDREC"
+VERSION = 1
+HEADER_SIZE = 4096
+N_STATES = len(STATE_RGB)
+
+INDEX_DTYPE = np.dtype([
+    ("generation", "<u4"),
+    ("offset", "<u8"),
+    ("counts", "<u4", (N_STATES,)),
+])
+
+
+def index_path(path):
+    return path + ".idx"
+
+
+# bytes ocupados por `n` estados empacotados
+def packed_size(n):
+    return (n + 7) // 8 * 3
+
+
+# 8 estados (0..7) por grupo de 3 bytes, little-endian
+def pack_states(states):
+    flat = states.reshape(-1)
+    groups = (flat.size + 7) // 8
+    padded = np.zeros(groups * 8, dtype=np.uint32)
+    padded[:flat.size] = flat
+    padded = padded.reshape(groups, 8)
+    words = np.zeros(groups, dtype=np.uint32)
+    for k in range(8):
+        words |= (padded[:, k] & 7) << (3 * k)
+    return words.astype("<u4").view(np.uint8).reshape(groups, 4)[:, :3].reshape(-1)
+
+
+def unpack_states(buf, shape):
+    n = shape[0] * shape[1]
+    groups = (n + 7) // 8
+    raw = np.frombuffer(buf, dtype=np.uint8, count=groups * 3).reshape(groups, 3).astype(np.uint32)
+    words = raw[:, 0] | (raw[:, 1] << 8) | (raw[:, 2] << 16)
+    states = np.empty((groups, 8), dtype=np.uint8)
+    for k in range(8):
+        states[:, k] = (words >> (3 * k)) & 7
+    return states.reshape(-1)[:n].reshape(shape)
+
+
+class RecordingWriter:
+    def __init__(self, path, rows, cols, metadata=None):
+        self.path = path
+        self.shape = (rows, cols)
+        self.frame_size = packed_size(rows * cols) + rows * cols
+        self.generation = 0
+
+        meta = json.dumps(metadata or {}).encode()
+        header = MAGIC + np.array([VERSION, rows, cols, len(meta)], dtype="<u4").tobytes() \
+            + np.array([self.frame_size], dtype="<u8").tobytes() + meta
+        if len(header) > HEADER_SIZE:
+            raise ValueError("metadados grandes demais para o cabeçalho")
+        self._data = open(path, "wb")
+        self._data.write(header.ljust(HEADER_SIZE, b"\0"))
+        self._index = open(index_path(path), "wb")
+        self._offset = HEADER_SIZE
+
+    # grava uma geração e devolve o número dela
+    def append(self, states, timers, counts=None):
+        if counts is None:
+            counts = np.bincount(states.reshape(-1), minlength=N_STATES)[:N_STATES]
+        self._data.write(pack_states(states).tobytes())
+        self._data.write(np.ascontiguousarray(timers, dtype=np.uint8).tobytes())
+        entry = np.zeros(1, dtype=INDEX_DTYPE)
+        entry["generation"] = self.generation
+        entry["offset"] = self._offset
+        entry["counts"] = counts
+        self._index.write(entry.tobytes())
+        self._offset += self.frame_size
+        self.generation += 1
+        return self.generation - 1
+
+    def flush(self):
+        self._data.flush()
+        self._index.flush()
+
+    def close(self):
+        if self._data is not None:
+            self._data.close()
+            self._index.close()
+            self._data = None
+            self._index = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Leitura com acesso aleatório: os quadros são lidos direto do mapa de
+# memória, então pular para qualquer geração custa o mesmo.
+class Recording:
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as fp:
+            header = fp.read(HEADER_SIZE)
+        if header[:8] != MAGIC:
+            raise ValueError(f"{path} não é uma gravação SEIRD")
+        version, rows, cols, meta_len = np.frombuffer(header, dtype="<u4", count=4, offset=8)
+        if version != VERSION:
+            raise ValueError(f"versão de gravação não suportada: {version}")
+        self.frame_size = int(np.frombuffer(header, dtype="<u8", count=1, offset=24)[0])
+        self.shape = (int(rows), int(cols))
+        self.metadata = json.loads(header[32:32 + int(meta_len)].decode() or "{}")
+
+        self.index = np.fromfile(index_path(path), dtype=INDEX_DTYPE)
+        # uma gravação interrompida pode ter índice sem o quadro completo
+        data_size = os.path.getsize(path)
+        complete = self.index["offset"] + self.frame_size <= data_size
+        self.index = self.index[complete]
+        self._data = np.memmap(path, dtype=np.uint8, mode="r") if len(self.index) else None
+
+    def __len__(self):
+        return len(self.index)
+
+    # contagens S/E/I/R/D por geração (gerações x 5), sem decodificar quadros
+    @property
+    def counts(self):
+        return self.index["counts"]
+
+    # (estados, timers) da i-ésima geração gravada
+    def frame(self, i):
+        offset = int(self.index["offset"][i])
+        n = self.shape[0] * self.shape[1]
+        packed = packed_size(n)
+        states = unpack_states(self._data[offset:offset + packed], self.shape)
+        timers = np.array(self._data[offset + packed:offset + packed + n]).reshape(self.shape)
+        return states, timers
+
+    def states(self, start=0, stop=None):
+        stop = len(self) if stop is None else min(stop, len(self))
+        for i in range(start, stop):
+            yield self.frame(i)[0]
+
+    def close(self):
+        self._data = None
@@ -0,0 +1,729 @@
+from cellrng import DRAW_CONTACT, DRAW_PAIRING, DRAW_RECOVERY, DRAW_SWAP, CellRNG
+from history import GenerationHistory
+from instrument import metrics
+from kernels import get_kernel
+from life import LIFE_RGB, LifeRule, make_life_engine
+from series import SeriesBuffer
+import numpy as np
+import time
+
+
+# ============================================
+# Estados epidemiológicos
+# ============================================
+SUSCEPTIBLE = 0  # Suscetível
+EXPOSED = 1      # Exposto (incubação)
+INFECTED = 2     # Infectado (contagioso)
+RECOVERED = 3    # Recuperado (imune)
+DEAD = 4         # Morto (não suscetível)
+
+# Cor RGB por estado (para exibição e para os GIFs)
+STATE_RGB = {
+    SUSCEPTIBLE: (255, 255, 255),  # white
+    EXPOSED: (255, 165, 0),        # orange
+    INFECTED: (220, 20, 60),       # crimson / red
+    RECOVERED: (144, 238, 144),    # lightgreen
+    DEAD: (105, 105, 105),         # dimgray
+}
+
+# rótulos curtos por estado (gráfico de séries)
+STATE_NAMES = {SUSCEPTIBLE: "S", EXPOSED: "E", INFECTED: "I", RECOVERED: "R", DEAD: "D"}
+LIFE_NAMES = {0: "mortas", 1: "vivas"}
+
+# versão da semântica do passo: mude sempre que o mesmo (parâmetros, semente,
+# grade) passar a gerar outra trajetória, para invalidar caches de resultados
+ENGINE_VERSION = 4
+
+# Parâmetros epidemiológicos padrão
+DEFAULT_PARAMS = {
+    "p_infection": 0.25,      # probabilidade base de infecção por contato
+    "p_recovery": 0.05,       # probabilidade (por passo) de recuperação
+    "p_mortality": 0.01,      # probabilidade (por passo) de morrer se infectado
+    "incubation_period": 2,   # passos E -> I
+    "infectious_period": 6,   # passos I -> R (se não morrer)
+    "mobility_rate": 0.0,     # probabilidade de trocar de posição com um vizinho
+    "neighborhood": "moore",  # vizinhança/núcleo do contágio (ver kernels.py)
+}
+
+# faixas aceitas dos parâmetros inteiros: os períodos vão para timers uint8
+PARAM_RANGES = {
+    "incubation_period": (0, 255),
+    "infectious_period": (0, 255),
+}
+
+
+# confere um parâmetro na entrada (linha de comando, varredura, checkpoint),
+# para que o passo nunca encontre um valor que não cabe nos timers
+def check_param(name, value):
+    low, high = PARAM_RANGES.get(name, (None, None))
+    if low is not None and not low <= value <= high:
+        raise ValueError(f"{name} deve estar entre {low} e {high}, recebido {value}")
+    return value
+
+
+# ============================================
+# Motor vetorizado (NumPy)
+# ============================================
+# deslocamentos da vizinhança de Moore (8 vizinhos)
+MOORE_OFFSETS = [(dr, dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1) if (dr, dc) != (0, 0)]
+
+# no modo "auto", o passo esparso é usado enquanto as células E/I forem no
+# máximo esta fração da grade
+SPARSE_MAX_FRACTION = 0.02
+
+
+# conta, para cada célula, quantos vizinhos estão em `state_type` (soma dos
+# pesos, para núcleos com pesos); por padrão a vizinhança de Moore
+def count_neighbors_array(states, state_type, neighborhood="moore"):
+    return get_kernel(neighborhood).pressure(states == state_type)
+
+
+# núcleo de contágio de um objeto de parâmetros (sem `neighborhood`: Moore)
+def _kernel_of(params):
+    return get_kernel(getattr(params, "neighborhood", "moore"))
+
+
+# limiar uint32 de S -> E por célula a partir da pressão de infecção:
+# 1 - (1 - p)^pressão, tabelado por contagem quando os pesos são todos 1.
+# Pesos reais são arredondados antes: a FFT, a soma direta e a soma esparsa
+# diferem nos últimos bits e o limiar tem que ser o mesmo em todos os motores.
+def _infection_thresholds(p_infection, kernel, pressure):
+    if kernel.unweighted:
+        p_get = _threshold(1 - (1 - p_infection) ** np.arange(kernel.taps + 1))
+        return np.take(p_get, pressure)
+    return _threshold(1 - np.power(1 - p_infection, np.round(pressure, 9)))
+
+
+# ============================================
+# Mobilidade: emparelhamento aleatório sem conflitos
+# ============================================
+# A cada geração sorteia-se uma direção (horizontal, vertical ou uma das duas
+# diagonais) e uma paridade (de linha; de coluna na horizontal). Isso divide a grade em pares disjuntos de
+# vizinhos: cada âncora (linha, ou coluna na horizontal, com a paridade
+# sorteada) forma par com o vizinho âncora + direção. Cada par troca de lugar
+# com probabilidade mobility_rate e quem troca pula a atualização
+# epidemiológica da geração. Nenhuma célula participa de duas trocas; no
+# interior da grade cada célula se move com probabilidade mobility_rate para
+# um vizinho de Moore uniforme. As trocas são feitas com fatias de passo 2
+# sobre a grade inteira, sem laço por célula.
+MOBILITY_AXES = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+
+# sorteia (direção, paridade) da geração; na vizinhança de von Neumann só
+# as direções horizontal e vertical
+def mobility_pairing(rng, generation, axes=MOBILITY_AXES):
+    k = rng.integer(generation, DRAW_PAIRING, 2 * len(axes))
+    return axes[k // 2], k % 2
+
+
+# emparelhamento visto de uma sub-grade que começa na linha `row0`
+def _local_pairing(pairing, row0):
+    axis, parity = pairing
+    return (axis, (parity - row0) % 2) if axis[0] else pairing
+
+
+def mobility_axes(kernel):
+    return MOBILITY_AXES if kernel.diagonal_moves else MOBILITY_AXES[:2]
+
+
+# fatias (âncoras, vizinhos) de uma grade `shape` para o emparelhamento dado;
+# as duas fatias têm o mesmo formato e o i-ésimo elemento de uma forma par
+# com o i-ésimo da outra
+def _pair_slices(shape, axis, parity):
+    rows, cols = shape
+    dr, dc = axis
+    if dr == 0:
+        anchor_rows = partner_rows = slice(0, rows)
+        anchor_cols = slice(parity, cols - 1, 2)
+        partner_cols = slice(parity + 1, cols, 2)
+    else:
+        anchor_rows = slice(parity, rows - 1, 2)
+        partner_rows = slice(parity + 1, rows, 2)
+        if dc == 0:
+            anchor_cols = partner_cols = slice(0, cols)
+        elif dc == 1:
+            anchor_cols, partner_cols = slice(0, cols - 1), slice(1, cols)
+        else:
+            anchor_cols, partner_cols = slice(1, cols), slice(0, cols - 1)
+    return (anchor_rows, anchor_cols), (partner_rows, partner_cols)
+
+
+# decide quais pares trocam: grade booleana, True nas âncoras que trocam
+# (sorteios só nas âncoras; `row0` como em CellRNG.masked)
+def mobility_swaps(shape, pairing, rng, generation, mobility_rate, row0=0):
+    anchors, _ = _pair_slices(shape, *pairing)
+    is_anchor = np.zeros(shape, dtype=bool)
+    is_anchor[anchors] = True
+    return rng.masked(generation, DRAW_SWAP, is_anchor, row0) < _threshold(mobility_rate)
+
+
+# células que se movem (as duas pontas de cada par que troca)
+def _moving_cells(swap, pairing):
+    anchors, partners = _pair_slices(swap.shape, *pairing)
+    moving = swap.copy()
+    moving[partners] |= swap[anchors]
+    return moving
+
+
+# aplica as trocas no lugar: para cada par, b - a somado numa ponta e
+# subtraído da outra (aritmética uint8, sem cópias por máscara)
+def _apply_swaps(states, timers, moves):
+    pairing, swap = moves
+    anchors, partners = _pair_slices(states.shape, *pairing)
+    s = swap[anchors].view(np.uint8)
+    for grid in (states, timers):
+        a = grid[anchors]
+        b = grid[partners]
+        d = (b - a) * s
+        a += d
+        b -= d
+
+
+# converte uma probabilidade em limiar inteiro para sorteios uint32
+# (u < limiar ocorre com probabilidade p)
+def _threshold(p):
+    return np.minimum(np.floor(np.asarray(p, dtype=np.float64) * 2.0 ** 32), 2 ** 32 - 1).astype(np.uint32)
+
+
+# Contagens de transições de um passo: novas infecções (S->E), E->I,
+# recuperações (I->R) e mortes (I->D). A mobilidade só troca células de
+# lugar, então não muda as contagens por estado.
+def _record_transitions(stats, exposed, infectious, recovered, dead):
+    stats["new_exposed"] = int(exposed)
+    stats["new_infectious"] = int(infectious)
+    stats["new_recovered"] = int(recovered)
+    stats["new_dead"] = int(dead)
+
+
+# aplica as transições de `stats` a um vetor de contagens S/E/I/R/D
+def apply_transitions(counts, stats):
+    counts[SUSCEPTIBLE] -= stats["new_exposed"]
+    counts[EXPOSED] += stats["new_exposed"] - stats["new_infectious"]
+    counts[INFECTED] += stats["new_infectious"] - stats["new_recovered"] - stats["new_dead"]
+    counts[RECOVERED] += stats["new_recovered"]
+    counts[DEAD] += stats["new_dead"]
+
+
+# contagens S/E/I/R/D de uma grade
+def state_counts(states):
+    return np.bincount(states.reshape(-1), minlength=len(STATE_RGB))[:len(STATE_RGB)].astype(np.int64)
+
+
+# Um passo SEIRD sobre a grade inteira.
+# `states` e `timers` são arrays uint8 (rows x cols); `params` é qualquer objeto
+# com os atributos p_infection, p_recovery, p_mortality, incubation_period,
+# infectious_period, mobility_rate e neighborhood. Os sorteios vêm de `rng`
+# (cellrng.CellRNG) com a chave (geração `generation`, propósito, célula):
+# a trajetória não depende do motor nem da divisão da grade.
+# Se `stats` (dict) for passado, recebe as contagens de transições do passo
+# (ver `_record_transitions`).
+def seird_step(states, timers, params, rng, generation, stats=None):
+    new_states, new_timers, moves = seird_step_local(states, timers, params, rng, generation, stats)
+    if moves is not None:
+        _apply_swaps(new_states, new_timers, moves)
+    return new_states, new_timers
+
+
+# Atualização epidemiológica de `seird_step` sem aplicar as trocas da
+# mobilidade: devolve também `moves` = (emparelhamento, grade de trocas), ou
+# None sem mobilidade (as células que trocam não são atualizadas). `row0` é a
+# linha da grade inteira em que `states` começa (faixas de um motor
+# multiprocesso, que sorteiam pelos índices globais das células).
+def seird_step_local(states, timers, params, rng, generation, stats=None, row0=0):
+    kernel = _kernel_of(params)
+    mobile = params.mobility_rate > 0
+    moves = None
+    if mobile:
+        pairing = _local_pairing(mobility_pairing(rng, generation, mobility_axes(kernel)), row0)
+        moves = (pairing, mobility_swaps(states.shape, pairing, rng, generation, params.mobility_rate, row0))
+
+    # células que se movem nesta geração pulam a atualização epidemiológica
+    if mobile:
+        still = ~_moving_cells(moves[1], moves[0])
+        susceptible = still & (states == SUSCEPTIBLE)
+        exposed = still & (states == EXPOSED)
+        infected = still & (states == INFECTED)
+        settled = still & (states >= RECOVERED)
+    else:
+        susceptible = states == SUSCEPTIBLE
+        exposed = states == EXPOSED
+        infected = states == INFECTED
+        settled = states >= RECOVERED
+    due = timers <= 1
+
+    # S -> E: probabilidade combinada 1 - (1 - p)^n, n = pressão de infecção
+    # (vizinhos infectados, ou soma dos pesos deles no núcleo). Só há sorteio
+    # onde ele é consultado: suscetíveis sob pressão e infectados.
+    pressure = kernel.pressure(states == INFECTED)
+    u_contact = rng.masked(generation, DRAW_CONTACT, (susceptible & (pressure > 0)) | infected, row0)
+    newly_exposed = susceptible & (u_contact < _infection_thresholds(params.p_infection, kernel, pressure))
+
+    # E -> I ao fim da incubação
+    incubated = exposed & due
+
+    # I -> D (mortalidade), I -> R (ao fim do período, com probabilidade);
+    # se não recuperar, mantém infectado com novo período
+    dies = infected & (u_contact < _threshold(params.p_mortality))
+    renewed = infected & due & ~dies
+    u_recovery = rng.masked(generation, DRAW_RECOVERY, renewed, row0)
+    recovers = renewed & (u_recovery < _threshold(params.p_recovery))
+    renewed &= ~recovers
+
+    if stats is not None:
+        _record_transitions(
+            stats, np.count_nonzero(newly_exposed), np.count_nonzero(incubated),
+            np.count_nonzero(recovers), np.count_nonzero(dies),
+        )
+
+    # cada transição avança o código do estado: S+1=E, E+1=I, I+1=R, I+2=D
+    new_states = states + newly_exposed.view(np.uint8) + incubated.view(np.uint8) \
+        + recovers.view(np.uint8) + (dies.view(np.uint8) << 1)
+
+    # E e I em andamento decrementam o timer; R e D ficam zerados;
+    # transições para E/I recebem o período correspondente
+    ongoing = (exposed | infected) & ~due & ~dies
+    reassigned = settled | dies | recovers | incubated | renewed | newly_exposed
+    new_timers = (timers - ongoing.view(np.uint8)) * (~reassigned).view(np.uint8)
+    new_timers += newly_exposed.view(np.uint8) * np.uint8(params.incubation_period)
+    new_timers += (incubated | renewed).view(np.uint8) * np.uint8(params.infectious_period)
+
+    return new_states, new_timers, moves if mobile else None
+
+
+# células E/I de uma grade (índices lineares): o conjunto ativo inicial
+def active_cells(states):
+    flat = states.reshape(-1)
+    return np.flatnonzero((flat == EXPOSED) | (flat == INFECTED))
+
+
+# Um passo SEIRD avaliando só a frente ativa: as células E/I em `active`
+# (índices lineares ordenados), os suscetíveis vizinhos de infectados e as
+# células sorteadas pela mobilidade. Mesmas regras e probabilidades de
+# `seird_step`, mas o custo é proporcional à região ativa e não à grade
+# (com mobilidade, as âncoras do emparelhamento são sorteadas todas). Os
+# sorteios de cada célula são os mesmos do passo denso, então a trajetória
+# é idêntica. Atualiza `states`/`timers` no lugar e devolve
+# (changed, new_active): as células que podem ter mudado e o novo conjunto E/I.
+def seird_step_sparse(states, timers, params, rng, generation, active, stats=None):
+    rows, cols = states.shape
+    flat_states = states.reshape(-1)
+    flat_timers = timers.reshape(-1)
+    kernel = _kernel_of(params)
+
+    # mobilidade: mesmo emparelhamento e mesmas trocas do passo denso
+    movers = np.empty(0, dtype=np.int64)
+    if params.mobility_rate > 0:
+        pairing = mobility_pairing(rng, generation, mobility_axes(kernel))
+        (dr, dc), _ = pairing
+        swap_a = np.flatnonzero(mobility_swaps(states.shape, pairing, rng, generation, params.mobility_rate))
+        swap_b = swap_a + (dr * cols + dc)
+        movers = np.sort(np.concatenate([swap_a, swap_b]))
+
+    current = flat_states[active]
+    infected = active[current == INFECTED]
+    exposed = active[current == EXPOSED]
+
+    # suscetíveis ao alcance do núcleo de infectados; cada ocorrência é um
+    # vizinho infectado (com o peso do deslocamento)
+    r, c = np.divmod(infected, cols)
+    neighbors = []
+    weights = []
+    for (dr, dc), w in zip(kernel.offsets, kernel.tap_weights):
+        rr = r + dr
+        cc = c + dc
+        ok = (rr >= 0) & (rr < rows) & (cc >= 0) & (cc < cols)
+        neighbors.append(rr[ok] * cols + cc[ok])
+        if not kernel.unweighted:
+            weights.append(np.full(neighbors[-1].size, w))
+    neighbors = np.concatenate(neighbors) if neighbors else np.empty(0, dtype=np.int64)
+    susceptible = flat_states[neighbors] == SUSCEPTIBLE
+    neighbors = neighbors[susceptible]
+    if kernel.unweighted:
+        candidates, infected_neighbors = np.unique(neighbors, return_counts=True)
+    else:
+        candidates, inverse = np.unique(neighbors, return_inverse=True)
+        infected_neighbors = np.bincount(inverse, weights=np.concatenate(weights)[susceptible],
+                                         minlength=candidates.size)
+
+    # células que se movem nesta geração pulam a atualização epidemiológica
+    if movers.size:
+        keep = ~np.isin(candidates, movers, assume_unique=True)
+        candidates = candidates[keep]
+        infected_neighbors = infected_neighbors[keep]
+        exposed = exposed[~np.isin(exposed, movers, assume_unique=True)]
+        infected = infected[~np.isin(infected, movers, assume_unique=True)]
+
+    u_susceptible = rng.cells(generation, DRAW_CONTACT, candidates)
+    u_death = rng.cells(generation, DRAW_CONTACT, infected)
+    u_recovery = rng.cells(generation, DRAW_RECOVERY, infected)
+
+    # S -> E
+    newly_exposed = candidates[u_susceptible < _infection_thresholds(params.p_infection, kernel, infected_neighbors)]
+
+    # E -> I ao fim da incubação; senão decrementa
+    exposed_timers = flat_timers[exposed]
+    exposed_due = exposed_timers <= 1
+    incubated = exposed[exposed_due]
+    waiting = exposed[~exposed_due]
+
+    # I -> D, I -> R ao fim do período (com probabilidade), senão renova
+    infected_timers = flat_timers[infected]
+    dies = u_death < _threshold(params.p_mortality)
+    due = ~dies & (infected_timers <= 1)
+    recovers = due & (u_recovery < _threshold(params.p_recovery))
+    renewed = due & ~recovers
+    ongoing = ~dies & ~due
+
+    flat_states[newly_exposed] = EXPOSED
+    flat_timers[newly_exposed] = params.incubation_period
+    flat_states[incubated] = INFECTED
+    flat_timers[incubated] = params.infectious_period
+    flat_timers[waiting] -= 1
+    flat_states[infected[dies]] = DEAD
+    flat_timers[infected[dies]] = 0
+    flat_states[infected[recovers]] = RECOVERED
+    flat_timers[infected[recovers]] = 0
+    flat_timers[infected[renewed]] = params.infectious_period
+    flat_timers[infected[ongoing]] -= 1
+
+    if stats is not None:
+        _record_transitions(
+            stats, newly_exposed.size, incubated.size,
+            np.count_nonzero(recovers), np.count_nonzero(dies),
+        )
+
+    changed = [newly_exposed, exposed, infected]
+    if movers.size:
+        # pares disjuntos: a troca vetorizada não tem conflitos; quem se moveu
+        # pode ter trazido E/I para a frente
+        flat_states[swap_a], flat_states[swap_b] = flat_states[swap_b], flat_states[swap_a]
+        flat_timers[swap_a], flat_timers[swap_b] = flat_timers[swap_b], flat_timers[swap_a]
+        changed.append(movers)
+    changed = np.unique(np.concatenate(changed))
+    changed_states = flat_states[changed]
+    new_active = changed[(changed_states == EXPOSED) | (changed_states == INFECTED)]
+    return changed, new_active
+
+
+# Avança da geração `generation` para a seguinte escolhendo o motor pelo
+# `mode` ("dense", "sparse" ou "auto"); os dois dão o mesmo resultado.
+# `active` é o conjunto E/I conhecido (ou None); no modo "auto" o
+# limite da frente ativa cai com o tamanho do núcleo (o passo esparso visita
+# cada vizinho de cada infectado, o denso não depende do raio), e com
+# mobilidade o passo é sempre denso: as trocas são sorteadas em todas as
+# âncoras da grade e os ~mobility_rate·N que se movem entram na frente, então
+# o esparso deixa de ser proporcional à região ativa. Devolve
+# (states, timers, active, changed); no passo denso active/changed voltam None
+# e os arrays são novos, no esparso os mesmos arrays são alterados no lugar.
+# Com `stats`, também informa quantas células o motor visitou ("cells").
+def advance(states, timers, params, rng, generation, active=None, mode="auto", stats=None):
+    if mode == "sparse" or (mode == "auto" and params.mobility_rate <= 0):
+        if active is None:
+            active = active_cells(states)
+        taps = _kernel_of(params).taps
+        if mode == "sparse" or active.size * taps <= SPARSE_MAX_FRACTION * len(MOORE_OFFSETS) * states.size:
+            if stats is not None:
+                stats["cells"] = int(active.size)
+            changed, active = seird_step_sparse(states, timers, params, rng, generation, active, stats)
+            return states, timers, active, changed
+    if stats is not None:
+        stats["cells"] = int(states.size)
+    states, timers = seird_step(states, timers, params, rng, generation, stats)
+    return states, timers, None, None
+
+
+# ============================================
+# Simulação SEIRD (sem dependência de Qt)
+# ============================================
+# Guarda a grade, os parâmetros e o histórico. A interface gráfica estende
+# esta classe e sobrescreve `_changed` para avisar a view.
+class SEIRDSimulation:
+    def __init__(self, rows=20, cols=20, history_bytes=64 * 1024 * 1024, seed=None):
+        self.rows = rows
+        self.cols = cols
+
+        # grid de estados
+        self.data_matrix = np.full((rows, cols), SUSCEPTIBLE, dtype=np.uint8)
+        # grid de timers (por exemplo: dias restantes de incubação/infectividade)
+        self.timers = np.zeros((rows, cols), dtype=np.uint8)
+
+        # sorteios do passo: por contador, chaveados por (geração, célula),
+        # então desfazer e refazer uma geração repete o mesmo resultado
+        self.cell_rng = CellRNG(seed)
+        # gerador para montar cenários (infectados e sopas aleatórias)
+        self.rng = np.random.default_rng(seed)
+
+        # histórico (para desfazer), limitado a `history_bytes` comprimidos
+        self.history = GenerationHistory(max_bytes=history_bytes)
+
+        # Parâmetros epidemiológicos padrão (pode ajustar)
+        for name, value in DEFAULT_PARAMS.items():
+            setattr(self, name, value)
+
+        # modo de atualização: "dense" (grade inteira), "sparse" (só a frente
+        # ativa) ou "auto" (escolhe a cada passo pela fração ativa da grade)
+        self.update_mode = "auto"
+        # células E/I conhecidas (None = desconhecido, recalcula se precisar)
+        self._active = None
+        # células alteradas desde o último push no histórico (None = desconhecido)
+        self._pending_changes = None
+
+        # gravação em disco em andamento (recording.RecordingWriter) ou None
+        self.recorder = None
+
+        # modo Jogo da Vida: regra B/S (None = modo SEIRD), motor de life.py
+        # e gerações avançadas por passo (o HashLife salta 2^k de uma vez)
+        self.life_rule = None
+        self.life_engine = "bitpacked"
+        self.life_jump = 1
+        # motor em uso, criado a partir da grade (None = recriar)
+        self._life = None
+
+        # contagens S/E/I/R/D mantidas a cada mudança e série por geração:
+        # (geração, S, E, I, R, D, novas infecções, novas mortes)
+        self.generation = 0
+        self.counts = state_counts(self.data_matrix)
+        self.series = SeriesBuffer()
+        self._start_series()
+
+    def _start_series(self):
+        self.series = SeriesBuffer([(self.generation, *self.counts.tolist(), 0, 0)])
+
+    # atualiza as contagens da linha da geração atual (após edições manuais)
+    def _update_series_tail(self):
+        generation, *_, new_exposed, new_dead = self.series[-1]
+        self.series[-1] = (generation, *self.counts.tolist(), new_exposed, new_dead)
+
+    # chamado sempre que a grade muda (sobrescrito pela interface)
+    def _changed(self):
+        pass
+
+    # a grade foi alterada fora do passo esparso: descarta o rastreamento
+    def _grid_edited(self):
+        self._active = None
+        self._pending_changes = None
+        self._life = None
+
+    # cores e rótulos dos estados do modo atual
+    @property
+    def palette(self):
+        return LIFE_RGB if self.life_rule is not None else STATE_RGB
+
+    @property
+    def state_names(self):
+        return LIFE_NAMES if self.life_rule is not None else STATE_NAMES
+
+    # Troca entre SEIRD (`rule` None) e Jogo da Vida com a regra dada
+    # ("B3/S23", "highlife", ...). Na troca, toda célula não suscetível vira
+    # viva (e toda viva vira infectada na volta); o histórico é descartado.
+    def set_life_mode(self, rule, engine="bitpacked", jump=1):
+        rule = LifeRule(rule) if isinstance(rule, str) else rule
+        if rule is not None:
+            # valida motor e regra antes de mudar qualquer coisa (ex.: HashLife com B0)
+            make_life_engine(np.zeros((4, 4), dtype=np.uint8), rule, engine)
+        was_life = self.life_rule is not None
+        self.life_rule = rule
+        self.life_engine = engine
+        self.life_jump = max(1, int(jump))
+        if (rule is not None) != was_life:
+            alive = self.data_matrix != SUSCEPTIBLE
+            if rule is not None:
+                self.data_matrix = alive.astype(np.uint8)
+                self.timers = np.zeros_like(self.data_matrix)
+            else:
+                self.data_matrix = np.where(alive, INFECTED, SUSCEPTIBLE).astype(np.uint8)
+                self.timers = np.where(alive, self.infectious_period, 0).astype(np.uint8)
+            self.history.clear()
+            self.counts = state_counts(self.data_matrix)
+            self.generation = 0
+            self._start_series()
+        self._grid_edited()
+        self._changed()
+
+    # uma "geração" do modo Vida: avança `life_jump` gerações no motor
+    def _life_generation(self):
+        if self._life is None:
+            self._life = make_life_engine(self.data_matrix, self.life_rule, self.life_engine)
+        before = self.data_matrix
+        start = time.perf_counter()
+        self._life.step(self.life_jump)
+        self.data_matrix = self._life.cells
+        metrics.record("life_step", time.perf_counter() - start, cells=before.size * self.life_jump)
+        self.timers = np.zeros_like(self.data_matrix)
+        # o motor Vida não informa as células alteradas: o próximo push no
+        # histórico compara a grade inteira
+        self._pending_changes = None
+        born = int(np.count_nonzero(self.data_matrix > before))
+        died = int(np.count_nonzero(self.data_matrix < before))
+        self.counts = state_counts(self.data_matrix)
+        self.generation += self.life_jump
+        self.series.append((self.generation, *self.counts.tolist(), born, died))
+
+    # parâmetros atuais como dicionário
+    def params(self):
+        return {name: getattr(self, name) for name in DEFAULT_PARAMS}
+
+    # contabiliza vizinhos do tipo `state_type` na vizinhança atual
+    # (soma dos pesos, para núcleos com pesos)
+    def count_neighbors(self, r, c, state_type):
+        return get_kernel(self.neighborhood).pressure_at(self.data_matrix, state_type, r, c)
+
+    # Próxima geração — lógica SEIRD + probabilidade e timers (motor vetorizado)
+    # Com notify=False a view não é avisada (reprodução contínua e avanço
+    # rápido: quem chama decide quando redesenhar).
+    def next_generation(self, notify=True):
+        # salva histórico (comprimido)
+        with metrics.phase("history"):
+            self.history.push(self.data_matrix, self.timers, changed=self._pending_changes)
+
+        if self.life_rule is not None:
+            self._life_generation()
+            if self.recorder is not None:
+                self.recorder.append(self.data_matrix, self.timers, self.counts)
+            if notify:
+                self._changed()
+            return
+
+        stats = {}
+        start = time.perf_counter()
+        self.data_matrix, self.timers, self._active, self._pending_changes = advance(
+            self.data_matrix, self.timers, self, self.cell_rng, self.generation, self._active, self.update_mode, stats
+        )
+        metrics.record("step", time.perf_counter() - start, cells=stats["cells"])
+        apply_transitions(self.counts, stats)
+        self.generation += 1
+        self.series.append((self.generation, *self.counts.tolist(), stats["new_exposed"], stats["new_dead"]))
+        if self.recorder is not None:
+            with metrics.phase("record"):
+                self.recorder.append(self.data_matrix, self.timers, self.counts)
+        if notify:
+            self._changed()
+
+    # Voltar geração (undo); se a última entrada for uma edição (um traço de
+    # pincel), desfaz só a edição e a geração continua a mesma
+    def previous_generation(self):
+        if self.history:
+            edit = self.history.last_is_edit()
+            mat, tim = self.history.pop()
+            self.data_matrix = mat
+            self.timers = tim
+            self.counts = state_counts(mat)
+            if not edit and len(self.series) > 1:
+                self.series.pop()
+                self.generation = self.series[-1][0]
+            elif not edit and self.generation > 0:
+                self.generation -= 1
+            self._update_series_tail()
+            self._grid_edited()
+            self._changed()
+
+    # substitui a grade inteira (ex.: um quadro de uma gravação)
+    def set_grid(self, states, timers):
+        self.data_matrix = np.array(states, dtype=np.uint8)
+        self.timers = np.array(timers, dtype=np.uint8)
+        self.counts = state_counts(self.data_matrix)
+        self._update_series_tail()
+        self._grid_edited()
+        self._changed()
+
+    # Aplica um traço de pincel de uma vez: as células marcadas em `mask`
+    # (bool, sobre a janela que começa em (r0, c0)) passam a `state`, com o
+    # timer zerado como em set_cell. A grade de antes vira uma única entrada
+    # de desfazer e a view é avisada uma vez, só com a janela. Devolve
+    # quantas células mudaram.
+    def paint_mask(self, r0, c0, mask, state):
+        h, w = mask.shape
+        window = self.data_matrix[r0:r0 + h, c0:c0 + w]
+        mask = mask & (window != state)
+        painted = int(np.count_nonzero(mask))
+        if not painted:
+            return 0
+        with metrics.phase("paint", cells=mask.size):
+            self.history.push(self.data_matrix, self.timers, changed=self._pending_changes, edit=True)
+            self.counts -= np.bincount(window[mask], minlength=len(self.counts))[:len(self.counts)]
+            self.counts[state] += painted
+            window[mask] = state
+            self.timers[r0:r0 + h, c0:c0 + w][mask] = 0
+            rows, cols = np.nonzero(mask)
+            changed = (rows + r0) * self.cols + (cols + c0)
+        self._update_series_tail()
+        self._grid_edited()
+        # o histórico guardou a grade de antes: até o próximo push, só as
+        # células pintadas diferem dela
+        self._pending_changes = changed
+        self._region_changed(r0, c0, r0 + h, c0 + w)
+        return painted
+
+    # chamado quando só a janela [r0, r1) x [c0, c1) mudou (sobrescrito pela
+    # interface para redesenhar só ela)
+    def _region_changed(self, r0, c0, r1, c1):
+        self._changed()
+
+    # muda o estado de uma célula (edição manual; o timer é zerado)
+    def set_cell(self, r, c, state):
+        self.counts[self.data_matrix[r, c]] -= 1
+        self.counts[state] += 1
+        self.data_matrix[r, c] = state
+        self.timers[r, c] = 0
+        self._update_series_tail()
+        self._grid_edited()
+
+    # começa a gravar cada geração em `path` (a atual é a geração 0)
+    def start_recording(self, path):
+        from recording import RecordingWriter
+
+        self.stop_recording()
+        metadata = {"params": self.params()}
+        if self.life_rule is not None:
+            metadata["life_rule"] = self.life_rule.notation
+        self.recorder = RecordingWriter(path, self.rows, self.cols, metadata=metadata)
+        self.recorder.append(self.data_matrix, self.timers, self.counts)
+
+    def stop_recording(self):
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+
+    # Reseta matriz
+    def reset(self):
+        self.data_matrix = np.full((self.rows, self.cols), SUSCEPTIBLE, dtype=np.uint8)
+        self.timers = np.zeros((self.rows, self.cols), dtype=np.uint8)
+        self.history.clear()
+        self.generation = 0
+        self.counts = state_counts(self.data_matrix)
+        self._start_series()
+        self._grid_edited()
+        self._changed()
+
+    # modo Vida: preenche a grade com uma "sopa" aleatória de células vivas
+    def randomize_life(self, density=0.3):
+        self.data_matrix = (self.rng.random((self.rows, self.cols)) < density).astype(np.uint8)
+        self.timers = np.zeros_like(self.data_matrix)
+        self.counts = state_counts(self.data_matrix)
+        self._update_series_tail()
+        self._grid_edited()
+        self._changed()
+
+    # randomiza N infectados em posições aleatórias
+    def randomize_infected(self, n=5):
+        placed = 0
+        attempts = 0
+        while placed < n and attempts < n * 20:
+            r = int(self.rng.integers(0, self.rows))
+            c = int(self.rng.integers(0, self.cols))
+            if self.data_matrix[r, c] == SUSCEPTIBLE:
+                self.data_matrix[r, c] = INFECTED
+                self.timers[r, c] = self.infectious_period
+                placed += 1
+            attempts += 1
+        self.counts[SUSCEPTIBLE] -= placed
+        self.counts[INFECTED] += placed
+        self._update_series_tail()
+        self._grid_edited()
+        self._changed()
+
+    # definir parâmetros em lote (facilita testes)
+    def set_default_params(self):
+        for name, value in DEFAULT_PARAMS.items():
+            setattr(self, name, value)
+        self._changed()
@@ -0,0 +1,87 @@
+import csv
+import numpy as np
+
+
+# ============================================
+# Séries temporais por geração (exportação)
+# ============================================
+# Cada linha de `SEIRDSimulation.series` tem as colunas abaixo.
+
+SERIES_COLUMNS = (
+    "generation", "susceptible", "exposed", "infected", "recovered", "dead",
+    "new_infections", "new_deaths",
+)
+
+
+# Série de uma simulação: linhas int64 (gerações x colunas) num array que
+# dobra de capacidade ao encher, sem uma tupla Python por geração. Linhas
+# lidas por índice voltam como tuplas de int; `array` é a parte preenchida
+# (sem cópia). A linha é escrita antes de o tamanho crescer, então quem lê
+# `array` de outra thread nunca vê uma linha pela metade.
+class SeriesBuffer:
+    def __init__(self, rows=(), columns=len(SERIES_COLUMNS)):
+        rows = np.asarray(rows, dtype=np.int64).reshape(-1, columns)
+        self._data = np.empty((max(len(rows), 64), columns), dtype=np.int64)
+        self._data[:len(rows)] = rows
+        self._size = len(rows)
+
+    @property
+    def array(self):
+        return self._data[:self._size]
+
+    def __array__(self, dtype=None, copy=None):
+        return self.array if dtype is None else self.array.astype(dtype)
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, i):
+        return tuple(self.array[i].tolist())
+
+    def __setitem__(self, i, row):
+        self.array[i] = row
+
+    def __iter__(self):
+        return iter(map(tuple, self.array.tolist()))
+
+    def append(self, row):
+        if self._size == len(self._data):
+            data = np.empty((2 * len(self._data), self._data.shape[1]), dtype=np.int64)
+            data[:self._size] = self._data[:self._size]
+            self._data = data
+        self._data[self._size] = row
+        self._size += 1
+
+    def pop(self):
+        row = self[-1]
+        self._size -= 1
+        return row
+
+
+def save_series_csv(path, series):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(SERIES_COLUMNS)
+        writer.writerows(np.asarray(series).tolist())
+
+
+# Parquet depende do pyarrow (opcional); sem ele, use CSV
+def save_series_parquet(path, series):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("exportar Parquet requer o pacote pyarrow (pip install pyarrow); use CSV") from None
+    columns = np.asarray(series, dtype=np.int64).reshape(-1, len(SERIES_COLUMNS)).T
+    table = pa.table({
+        name: pa.array(values, type=pa.int64()) for name, values in zip(SERIES_COLUMNS, columns)
+    })
+    pq.write_table(table, path)
+
+
+# escolhe o formato pela extensão do arquivo
+def save_series(path, series):
+    if path.lower().endswith(".parquet"):
+        save_series_parquet(path, series)
+    else:
+        save_series_csv(path, series)
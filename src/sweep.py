@@ -0,0 +1,183 @@
+from concurrent.futures import ProcessPoolExecutor
+from ensemble import attack_rates, simulate_counts
+from seird import DEFAULT_PARAMS, DEAD, ENGINE_VERSION, INFECTED, check_param
+from types import SimpleNamespace
+import csv
+import hashlib
+import itertools
+import json
+import numpy as np
+import os
+
+
+# ============================================
+# Varredura de parâmetros com cache em disco
+# ============================================
+# Cada execução (ponto do espaço de parâmetros + semente) é guardada em
+# `cache_dir` com nome derivado de um hash dos parâmetros, da semente, do
+# número de gerações e da grade inicial. Repetir uma varredura com pontos
+# extras só calcula os pontos novos.
+
+DEFAULT_CACHE_DIR = ".sweep_cache"
+
+# estado do processo trabalhador: a grade inicial vai uma vez por processo
+_worker_grid = None
+
+
+def _init_worker(states, timers):
+    global _worker_grid
+    _worker_grid = (states, timers)
+
+
+def _run_point(task):
+    params, generations, seed = task
+    states, timers = _worker_grid
+    return simulate_counts(states, timers, SimpleNamespace(**params), generations, np.random.SeedSequence(seed))
+
+
+# completa um ponto com os parâmetros de `base` (padrão: DEFAULT_PARAMS) e
+# normaliza os tipos
+def normalize_params(point, base=None):
+    params = dict(DEFAULT_PARAMS)
+    params.update(base or {})
+    for name, value in point.items():
+        if name not in DEFAULT_PARAMS:
+            raise ValueError(f"parâmetro desconhecido: {name}")
+        params[name] = check_param(name, type(DEFAULT_PARAMS[name])(value))
+    return params
+
+
+# produto cartesiano: {"p_infection": [0.1, 0.2], "mobility_rate": [0, 0.1]}
+# (os parâmetros fora de `space` vêm de `base`, como em normalize_params)
+def grid_points(space, base=None):
+    names = list(space)
+    return [normalize_params(dict(zip(names, values)), base)
+            for values in itertools.product(*(space[n] for n in names))]
+
+
+# amostra uniforme: {"p_infection": (0.1, 0.4), "incubation_period": (1, 5)}
+# (períodos inteiros são sorteados entre os limites, inclusive)
+def random_points(space, n, seed=None, base=None):
+    rng = np.random.default_rng(seed)
+    points = []
+    for _ in range(n):
+        point = {}
+        for name, (low, high) in space.items():
+            if not isinstance(DEFAULT_PARAMS.get(name), (int, float)):
+                raise ValueError(f"parâmetro sem intervalo numérico: {name}")
+            if isinstance(DEFAULT_PARAMS[name], int):
+                point[name] = int(rng.integers(low, high + 1))
+            else:
+                point[name] = float(rng.uniform(low, high))
+        points.append(normalize_params(point, base))
+    return points
+
+
+# hash da grade inicial (calculado uma vez por varredura)
+def grid_digest(states, timers):
+    h = hashlib.sha256()
+    h.update(np.asarray(states.shape, dtype=np.int64).tobytes())
+    h.update(np.ascontiguousarray(states, dtype=np.uint8).tobytes())
+    h.update(np.ascontiguousarray(timers, dtype=np.uint8).tobytes())
+    return h.hexdigest()
+
+
+def cache_key(params, seed, generations, digest):
+    payload = json.dumps(
+        {"engine": ENGINE_VERSION, "params": params, "seed": seed, "generations": generations, "grid": digest},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _cache_path(cache_dir, key):
+    return os.path.join(cache_dir, key[:2], key + ".npy")
+
+
+def _load_cached(cache_dir, key):
+    path = _cache_path(cache_dir, key)
+    if os.path.exists(path):
+        try:
+            return np.load(path)
+        except (OSError, ValueError):
+            # arquivo corrompido: recalcula
+            return None
+    return None
+
+
+def _store_cached(cache_dir, key, counts):
+    path = _cache_path(cache_dir, key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # grava num temporário e renomeia, para nunca deixar meio arquivo no cache
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as fp:
+        np.save(fp, counts)
+    os.replace(tmp, path)
+
+
+# Roda cada ponto de `points` com `replicates` sementes (0..replicates-1,
+# deslocadas por `seed`) e devolve uma lista de registros
+# {"params", "seed", "counts", "cached"}. Só os pares ainda ausentes do
+# cache são calculados, em paralelo com `workers` processos.
+def run_sweep(states, timers, points, generations, replicates=1, seed=0,
+              cache_dir=DEFAULT_CACHE_DIR, workers=None):
+    digest = grid_digest(states, timers)
+    records = []
+    missing = []
+    for point in points:
+        params = normalize_params(point)
+        for rep in range(replicates):
+            run_seed = seed + rep
+            key = cache_key(params, run_seed, generations, digest)
+            counts = _load_cached(cache_dir, key)
+            record = {"params": params, "seed": run_seed, "counts": counts, "cached": counts is not None}
+            records.append(record)
+            if counts is None:
+                missing.append((record, key))
+
+    if missing:
+        tasks = [(r["params"], generations, r["seed"]) for r, _ in missing]
+        workers = workers or os.cpu_count() or 1
+        if workers == 1:
+            _init_worker(states, timers)
+            results = map(_run_point, tasks)
+        else:
+            pool = ProcessPoolExecutor(
+                max_workers=min(workers, len(tasks)),
+                initializer=_init_worker,
+                initargs=(states, timers),
+            )
+            results = pool.map(_run_point, tasks)
+        try:
+            # cada resultado vai para o cache assim que chega
+            for (record, key), counts in zip(missing, results):
+                _store_cached(cache_dir, key, counts)
+                record["counts"] = counts
+        finally:
+            if workers != 1:
+                pool.shutdown()
+    return records
+
+
+# métricas escalares de cada execução
+def summarize_run(counts):
+    infected = counts[:, INFECTED]
+    return {
+        "attack_rate": float(attack_rates(counts[None])[0]),
+        "peak_infected": int(infected.max()),
+        "peak_generation": int(infected.argmax()),
+        "final_dead": int(counts[-1, DEAD]),
+    }
+
+
+# tabela CSV: uma linha por execução, parâmetros + métricas
+def save_sweep_csv(path, records):
+    names = list(DEFAULT_PARAMS)
+    metrics = ["attack_rate", "peak_infected", "peak_generation", "final_dead"]
+    with open(path, "w", newline="") as fp:
+        writer = csv.writer(fp)
+        writer.writerow(names + ["seed"] + metrics)
+        for record in records:
+            summary = summarize_run(record["counts"])
+            writer.writerow([record["params"][n] for n in names] + [record["seed"]] + [summary[m] for m in metrics])
+    return path
@@ -0,0 +1,83 @@
+from PIL import Image
+import hashlib
+import os
+
+
+# ============================================
+# Cache de miniaturas da filmoteca
+# ============================================
+# Cada GIF é decodificado uma única vez: a primeira frame reduzida é salva
+# como PNG em `cache_dir`, com nome derivado de (caminho, mtime, tamanho).
+# Se o GIF for regravado, a chave muda e a miniatura é refeita.
+
+THUMB_SIZE = (200, 110)
+DEFAULT_CACHE_DIR = ".thumb_cache"
+
+
+# lista os GIFs de `folder` como (caminho absoluto, mtime_ns, tamanho),
+# do mais recente para o mais antigo
+def scan_gifs(folder):
+    entries = []
+    try:
+        with os.scandir(folder) as it:
+            for entry in it:
+                if entry.name.lower().endswith(".gif") and entry.is_file():
+                    st = entry.stat()
+                    entries.append((os.path.abspath(entry.path), st.st_mtime_ns, st.st_size))
+    except FileNotFoundError:
+        return []
+    entries.sort(key=lambda e: e[1], reverse=True)
+    return entries
+
+
+# (caminho absoluto, mtime_ns, tamanho) de um único GIF
+def stat_gif(path):
+    st = os.stat(path)
+    return os.path.abspath(path), st.st_mtime_ns, st.st_size
+
+
+class ThumbnailCache:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, size=THUMB_SIZE):
+        self.cache_dir = cache_dir
+        self.size = tuple(size)
+
+    def key(self, path, mtime_ns, file_size):
+        raw = f"{os.path.abspath(path)}\0{mtime_ns}\0{file_size}\0{self.size[0]}x{self.size[1]}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def path_for(self, path, mtime_ns, file_size):
+        return os.path.join(self.cache_dir, self.key(path, mtime_ns, file_size) + ".png")
+
+    # devolve o PNG da miniatura, gerando-o se ainda não existir
+    # (OSError se o GIF não puder ser lido)
+    def get(self, path, mtime_ns, file_size):
+        thumb = self.path_for(path, mtime_ns, file_size)
+        if os.path.exists(thumb):
+            return thumb
+        with Image.open(path) as im:
+            im.seek(0)
+            frame = im.convert("RGB")
+        frame.thumbnail(self.size, Image.BOX)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # escrita atômica: nunca deixa um PNG pela metade no cache
+        tmp = f"{thumb}.{os.getpid()}.tmp"
+        frame.save(tmp, format="PNG")
+        os.replace(tmp, thumb)
+        return thumb
+
+    # apaga miniaturas de GIFs que não existem mais (ou foram regravados)
+    def prune(self, entries):
+        keep = {self.key(*entry) + ".png" for entry in entries}
+        try:
+            names = os.listdir(self.cache_dir)
+        except FileNotFoundError:
+            return 0
+        removed = 0
+        for name in names:
+            if name not in keep:
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                    removed += 1
+                except OSError:
+                    pass
+        return removed
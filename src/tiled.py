@@ -0,0 +1,150 @@
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+from cellrng import CellRNG
+from seird import _apply_swaps, _kernel_of, seird_step_local
+from types import SimpleNamespace
+import numpy as np
+import os
+
+
+# ============================================
+# Simulação em faixas, multiprocesso, com memória compartilhada
+# ============================================
+# A grade é dividida em faixas horizontais de linhas, uma por processo.
+# Estados e timers ficam em dois buffers de memória compartilhada (atual e
+# próximo). A cada geração cada processo lê a sua faixa mais um halo de
+# linhas de cada lado direto do buffer atual (o raio do núcleo de contágio,
+# no mínimo uma linha: a contagem de vizinhos da borda usa as linhas das
+# faixas vizinhas), calcula o passo e escreve só a sua faixa no próximo
+# buffer. Nada da grade passa pelos pipes, só comandos.
+#
+# Os sorteios são por contador (cellrng.CellRNG), chaveados pelo índice
+# global da célula: cada processo calcula sozinho, e igual aos vizinhos, os
+# sorteios do halo, inclusive o emparelhamento da mobilidade e as trocas dos
+# pares que cruzam a divisa. Como quem troca não é atualizado, o valor que
+# chega pela divisa é o da geração anterior, que o halo já tem. O resultado é
+# idêntico ao de SEIRDSimulation com a mesma semente, para qualquer número
+# de processos.
+
+
+# divide `rows` linhas em `parts` faixas contíguas [r0, r1)
+def split_rows(rows, parts):
+    bounds = np.linspace(0, rows, parts + 1).astype(int)
+    return [(int(a), int(b)) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+
+def _attach(names, shape):
+    blocks = [SharedMemory(name=name) for name in names]
+    arrays = [np.ndarray(shape, dtype=np.uint8, buffer=block.buf) for block in blocks]
+    return blocks, arrays
+
+
+def _tile_worker(names, shape, band, key, conn):
+    blocks, (states_a, timers_a, states_b, timers_b) = _attach(names, shape)
+    buffers = ((states_a, timers_a), (states_b, timers_b))
+    rng = CellRNG.from_key(key)
+    rows = shape[0]
+    r0, r1 = band
+    try:
+        while True:
+            message = conn.recv()
+            if message is None:
+                break
+            current, params, generation = message
+            params = SimpleNamespace(**params)
+            states, timers = buffers[current]
+            next_states, next_timers = buffers[1 - current]
+            # faixa + halo: o raio do núcleo de contágio, no mínimo uma linha
+            # (pares da mobilidade que cruzam a divisa)
+            halo = max(_kernel_of(params).radius, 1)
+            h0 = max(r0 - halo, 0)
+            h1 = min(r1 + halo, rows)
+            new_states, new_timers, moves = seird_step_local(
+                states[h0:h1], timers[h0:h1], params, rng, generation, row0=h0
+            )
+            if moves is not None:
+                _apply_swaps(new_states, new_timers, moves)
+            next_states[r0:r1] = new_states[r0 - h0:r1 - h0]
+            next_timers[r0:r1] = new_timers[r0 - h0:r1 - h0]
+            conn.send(None)
+    finally:
+        del states_a, timers_a, states_b, timers_b, buffers
+        for block in blocks:
+            block.close()
+
+
+# `seed` aceita o mesmo que CellRNG (inclusive o `cell_rng` de uma
+# SEIRDSimulation); `generation` é a geração de partida, que entra nos sorteios
+class TiledSimulation:
+    def __init__(self, states, timers, params, workers=None, seed=None, generation=0):
+        self.shape = states.shape
+        self.params = dict(params)
+        self.workers = max(1, min(workers or os.cpu_count() or 1, self.shape[0]))
+        self.generation = generation
+        self.rng = CellRNG(seed)
+
+        size = max(states.size, 1)
+        # estados/timers atuais e estados/timers próximos
+        self._blocks = [SharedMemory(create=True, size=size) for _ in range(4)]
+        arrays = [np.ndarray(self.shape, dtype=np.uint8, buffer=block.buf) for block in self._blocks]
+        self._buffers = ((arrays[0], arrays[1]), (arrays[2], arrays[3]))
+        self._current = 0
+        arrays[0][:] = states
+        arrays[1][:] = timers
+
+        context = get_context()
+        names = [block.name for block in self._blocks]
+        self._conns = []
+        self._procs = []
+        for band in split_rows(self.shape[0], self.workers):
+            parent, child = context.Pipe()
+            proc = context.Process(
+                target=_tile_worker, args=(names, self.shape, band, self.rng.key, child), daemon=True
+            )
+            proc.start()
+            self._conns.append(parent)
+            self._procs.append(proc)
+
+    # grade atual (visões da memória compartilhada; copie para guardar)
+    @property
+    def states(self):
+        return self._buffers[self._current][0]
+
+    @property
+    def timers(self):
+        return self._buffers[self._current][1]
+
+    # envia o mesmo comando a todas as faixas e espera todas terminarem
+    def _broadcast(self, message):
+        for conn in self._conns:
+            conn.send(message)
+        for conn in self._conns:
+            conn.recv()
+
+    def step(self, generations=1):
+        for _ in range(generations):
+            self._broadcast((self._current, self.params, self.generation))
+            self._current = 1 - self._current
+            self.generation += 1
+
+    def close(self):
+        for conn in self._conns:
+            try:
+                conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        for proc in self._procs:
+            proc.join()
+        self._conns = []
+        self._procs = []
+        self._buffers = None
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# os módulos ficam em src/ e se importam pelo nome (como ao rodar app.py/cli.py)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
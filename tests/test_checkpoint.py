@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from checkpoint import load_checkpoint, save_checkpoint
+from seird import SEIRDSimulation
+
+
+def _assert_same(a, b):
+    assert a.generation == b.generation
+    assert np.array_equal(a.data_matrix, b.data_matrix)
+    assert np.array_equal(a.timers, b.timers)
+    assert np.array_equal(a.counts, b.counts)
+    assert np.array_equal(a.series.array, b.series.array)
+
+
+# retomar de um checkpoint segue a mesma trajetória da execução sem pausa
+def test_seird_checkpoint_resumes_same_trajectory(tmp_path):
+    sim = SEIRDSimulation(30, 40, seed=5)
+    sim.mobility_rate = 0.1
+    sim.randomize_infected(20)
+    for _ in range(6):
+        sim.next_generation()
+    path = str(tmp_path / "run.seirdckpt")
+    save_checkpoint(sim, path)
+    resumed = load_checkpoint(path)
+    _assert_same(sim, resumed)
+    for _ in range(10):
+        sim.next_generation()
+        resumed.next_generation()
+        _assert_same(sim, resumed)
+
+    # o desfazer salvo também volta às mesmas grades
+    for _ in range(8):
+        sim.previous_generation()
+        resumed.previous_generation()
+        _assert_same(sim, resumed)
+
+
+# com HashLife as células que saíram da janela também são salvas
+@pytest.mark.parametrize("engine", ["array", "bitpacked", "hashlife"])
+def test_life_checkpoint_resumes_same_trajectory(tmp_path, engine):
+    sim = SEIRDSimulation(24, 24, seed=7)
+    sim.set_life_mode("B3/S23", engine=engine, jump=8)
+    sim.randomize_life(0.35)
+    for _ in range(6):
+        sim.next_generation()
+    path = str(tmp_path / "life.seirdckpt")
+    save_checkpoint(sim, path)
+    resumed = load_checkpoint(path)
+    _assert_same(sim, resumed)
+    for _ in range(6):
+        sim.next_generation()
+        resumed.next_generation()
+        _assert_same(sim, resumed)
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from seird import SEIRDSimulation
+from tiled import TiledSimulation
+
+
+def _simulation(mobility, neighborhood, mode="auto"):
+    sim = SEIRDSimulation(48, 36, seed=3)
+    sim.update_mode = mode
+    sim.mobility_rate = mobility
+    sim.neighborhood = neighborhood
+    sim.p_infection = 0.15
+    sim.randomize_infected(25)
+    return sim
+
+
+# o gerador por contador torna o passo independente do motor: denso,
+# esparso, automático e em faixas (com qualquer número de processos) dão a
+# mesma trajetória bit a bit
+@pytest.mark.parametrize("mobility", [0.0, 0.2])
+@pytest.mark.parametrize("neighborhood", ["moore", "von-neumann:2", "exp:4:2"])
+def test_engines_are_bit_identical(mobility, neighborhood):
+    generations = 15
+    results = {}
+    for mode in ("dense", "sparse", "auto"):
+        sim = _simulation(mobility, neighborhood, mode)
+        for _ in range(generations):
+            sim.next_generation()
+        results[mode] = (sim.data_matrix, sim.timers)
+
+    sim = _simulation(mobility, neighborhood)
+    for workers in (1, 3):
+        with TiledSimulation(sim.data_matrix, sim.timers, sim.params(), workers=workers, seed=sim.cell_rng) as tiled:
+            tiled.step(generations)
+            results[f"tiled{workers}"] = (tiled.states.copy(), tiled.timers.copy())
+
+    states, timers = results["dense"]
+    for name, (other_states, other_timers) in results.items():
+        assert np.array_equal(other_states, states), name
+        assert np.array_equal(other_timers, timers), name
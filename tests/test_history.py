@@ -0,0 +1,48 @@
+import numpy as np
+
+from history import GenerationHistory
+from seird import SEIRDSimulation
+
+
+# com o limite de memória estourado as gerações antigas saem, e cada desfazer
+# restante ainda volta à grade exata (a mais antiga vira quadro-chave)
+def test_undo_is_exact_after_keyframe_eviction():
+    sim = SEIRDSimulation(60, 60, history_bytes=4000, seed=9)
+    sim.history.keyframe_interval = 8
+    sim.p_infection = 0.05
+    sim.randomize_infected(5)
+    grids = []
+    for _ in range(40):
+        grids.append((sim.data_matrix.copy(), sim.timers.copy()))
+        sim.next_generation()
+
+    kept = len(sim.history)
+    assert 0 < kept < len(grids)
+    assert sim.history.nbytes <= sim.history.max_bytes
+    kinds = [entry[0] for entry in sim.history.entries()]
+    assert kinds[0] == GenerationHistory.KEYFRAME and GenerationHistory.DELTA in kinds
+    for states, timers in reversed(grids[-kept:]):
+        sim.previous_generation()
+        assert np.array_equal(sim.data_matrix, states)
+        assert np.array_equal(sim.timers, timers)
+    assert not sim.history
+
+
+def test_history_round_trip_with_deltas_and_eviction():
+    rng = np.random.default_rng(0)
+    history = GenerationHistory(max_bytes=3000, keyframe_interval=5)
+    states = rng.integers(0, 5, (30, 30), dtype=np.uint8)
+    timers = rng.integers(0, 8, (30, 30), dtype=np.uint8)
+    pushed = []
+    for _ in range(40):
+        history.push(states, timers)
+        pushed.append((states.copy(), timers.copy()))
+        flip = rng.random(states.shape) < 0.05
+        states = np.where(flip, rng.integers(0, 5, states.shape, dtype=np.uint8), states)
+        timers = np.where(flip, 0, timers).astype(np.uint8)
+
+    assert len(history) < len(pushed)
+    for expected_states, expected_timers in reversed(pushed[-len(history):]):
+        got_states, got_timers = history.pop()
+        assert np.array_equal(got_states, expected_states)
+        assert np.array_equal(got_timers, expected_timers)
@@ -0,0 +1,15 @@
+import numpy as np
+import pytest
+
+from seird import INFECTED, SEIRDSimulation, count_neighbors_array
+
+
+# a consulta de uma célula soma os mesmos pesos que a grade inteira
+@pytest.mark.parametrize("neighborhood", ["moore", "von-neumann:2", "gauss:3"])
+def test_count_neighbors_matches_array(neighborhood):
+    sim = SEIRDSimulation(30, 25, seed=4)
+    sim.neighborhood = neighborhood
+    sim.randomize_infected(200)
+    pressure = count_neighbors_array(sim.data_matrix, INFECTED, neighborhood)
+    for r, c in [(0, 0), (29, 24), (15, 12), (0, 20)]:
+        assert sim.count_neighbors(r, c, INFECTED) == pytest.approx(pressure[r, c])
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from life import LifeRule, make_life_engine, parse_rle
+
+
+def _soup(rows, cols, seed):
+    return (np.random.default_rng(seed).random((rows, cols)) < 0.35).astype(np.uint8)
+
+
+# o plano do HashLife é infinito: comparado com os motores de janela só
+# enquanto nada chega à borda (a sopa fica no meio de uma janela folgada)
+def _padded_soup(seed, size=20, pad=40):
+    cells = np.zeros((size + 2 * pad, size + 2 * pad), dtype=np.uint8)
+    cells[pad:pad + size, pad:pad + size] = _soup(size, size, seed)
+    return cells
+
+
+@pytest.mark.parametrize("rule", ["B3/S23", "B36/S23", "B3678/S34678"])
+def test_array_and_bitpacked_agree(rule):
+    cells = _soup(37, 70, seed=1)
+    array = make_life_engine(cells, LifeRule(rule), "array")
+    bits = make_life_engine(cells, LifeRule(rule), "bitpacked")
+    for generations in (1, 1, 5, 17):
+        array.step(generations)
+        bits.step(generations)
+        assert np.array_equal(array.cells, bits.cells)
+        assert array.population == bits.population
+
+
+@pytest.mark.parametrize("rule", ["B3/S23", "B36/S23"])
+def test_hashlife_agrees_with_array_engine(rule):
+    cells = _padded_soup(seed=2)
+    array = make_life_engine(cells, LifeRule(rule), "array")
+    hashlife = make_life_engine(cells, LifeRule(rule), "hashlife")
+    for generations in (1, 3, 8, 13):
+        array.step(generations)
+        hashlife.step(generations)
+        assert np.array_equal(array.cells, hashlife.cells)
+
+
+# um planador anda 1 célula a cada 4 gerações na diagonal, mesmo em saltos enormes
+def test_hashlife_glider_jump():
+    glider, _ = parse_rle("x = 3, y = 3\nbob$2bo$3o!")
+    cells = np.zeros((8, 8), dtype=np.uint8)
+    cells[:3, :3] = glider
+    hashlife = make_life_engine(cells, LifeRule("B3/S23"), "hashlife")
+    jump = 1 << 20
+    hashlife.step(jump)
+    assert hashlife.population == 5
+    offset = np.array([jump // 4, jump // 4])
+    before = np.argwhere(cells)
+    after = hashlife.live_cells()
+    assert np.array_equal(np.sort(after - offset, axis=0), np.sort(before, axis=0))
@@ -0,0 +1,22 @@
+import numpy as np
+from seird import SEIRDSimulation
+
+
+# um traço seguido de gerações do modo Vida: cada desfazer volta à grade exata
+def test_undo_after_stroke_and_life_steps():
+    sim = SEIRDSimulation(32, 32, seed=1)
+    sim.set_life_mode("B3/S23")
+    sim.randomize_life(0.3)
+    grids = [sim.data_matrix.copy()]
+
+    mask = np.zeros((6, 6), dtype=bool)
+    mask[1:5, 1:5] = True
+    assert sim.paint_mask(10, 10, mask, 1)
+    grids.append(sim.data_matrix.copy())
+    for _ in range(2):
+        sim.next_generation()
+        grids.append(sim.data_matrix.copy())
+
+    for expected in reversed(grids[:-1]):
+        sim.previous_generation()
+        assert np.array_equal(sim.data_matrix, expected)
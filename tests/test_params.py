@@ -0,0 +1,29 @@
+import pytest
+
+import cli
+from checkpoint import load_checkpoint, save_checkpoint
+from seird import SEIRDSimulation
+from sweep import normalize_params
+
+
+# os períodos vão para timers uint8: 255 roda, 256 é recusado na entrada
+def test_period_limits_at_the_boundary(tmp_path):
+    sim = SEIRDSimulation(16, 16, seed=2)
+    sim.incubation_period = sim.infectious_period = 255
+    sim.randomize_infected(10)
+    for _ in range(3):
+        sim.next_generation()
+
+    assert normalize_params({"incubation_period": 255})["incubation_period"] == 255
+    with pytest.raises(ValueError):
+        normalize_params({"infectious_period": 256})
+    with pytest.raises(SystemExit):
+        cli.build_parser().parse_args(["gif", "--incubation-period", "300", "-o", "x.gif"])
+
+    sim.incubation_period = 300
+    path = str(tmp_path / "bad.seirdckpt")
+    save_checkpoint(sim, path)
+    target = SEIRDSimulation(8, 8)
+    with pytest.raises(ValueError):
+        load_checkpoint(path, target)
+    assert target.incubation_period == 2 and target.rows == 8
@@ -0,0 +1,60 @@
+import os
+
+import numpy as np
+import pytest
+
+import cli
+from export import export_recording_gif
+from recording import Recording, RecordingWriter
+from seird import SEIRDSimulation
+
+
+def _record(path, generations=5):
+    sim = SEIRDSimulation(24, 20, seed=3)
+    sim.randomize_infected(15)
+    frames = []
+    with RecordingWriter(path, sim.rows, sim.cols) as writer:
+        for _ in range(generations):
+            sim.next_generation()
+            writer.append(sim.data_matrix, sim.timers)
+            frames.append((sim.data_matrix.copy(), sim.timers.copy()))
+    return frames
+
+
+# cada quadro volta exatamente como foi gravado, com as contagens no índice
+def test_recording_round_trip(tmp_path):
+    path = str(tmp_path / "run.seirdrec")
+    frames = _record(path)
+    rec = Recording(path)
+    assert len(rec) == len(frames)
+    for i, (states, timers) in enumerate(frames):
+        got_states, got_timers = rec.frame(i)
+        assert np.array_equal(got_states, states)
+        assert np.array_equal(got_timers, timers)
+        assert np.array_equal(rec.counts[i], np.bincount(states.reshape(-1), minlength=5)[:5])
+
+
+# intervalo vazio ou fora da gravação: erro antes de criar o GIF
+@pytest.mark.parametrize("start, stop", [(5, None), (3, 3), (4, 2), (-1, 2), (0, 6)])
+def test_recording_gif_rejects_bad_range(tmp_path, start, stop):
+    path = str(tmp_path / "run.seirdrec")
+    _record(path)
+    gif = str(tmp_path / "out.gif")
+    with pytest.raises(ValueError):
+        export_recording_gif(Recording(path), gif, start=start, stop=stop)
+    assert not os.path.exists(gif)
+
+    with pytest.raises(SystemExit) as exc:
+        cli.main(["replay", path, "--gif", gif, "--start", str(start)]
+                 + ([] if stop is None else ["--stop", str(stop)]))
+    assert exc.value.code != 0
+    assert not os.path.exists(gif)
+
+
+def test_recording_gif_range(tmp_path):
+    path = str(tmp_path / "run.seirdrec")
+    _record(path)
+    gif = str(tmp_path / "out.gif")
+    assert cli.main(["replay", path, "--gif", gif, "--start", "1", "--stop", "4"]) in (0, None)
+    with open(gif, "rb") as fp:
+        assert fp.read(6) == b"GIF89a"